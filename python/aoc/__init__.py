@@ -0,0 +1,4 @@
+"""
+Tooling to run the daily solutions from a single process, as an alternative to calling
+each `first.py` / `second.py` script from its own directory.
+"""
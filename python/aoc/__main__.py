@@ -0,0 +1,475 @@
+"""
+Command line entry point, to be called from the 'python' directory of the repository:
+
+    python -m aoc run                   # run all days and parts, print a timings table
+    python -m aoc run --days 9 15 -p 2  # only part 2 of days 9 and 15
+    python -m aoc run --cache           # reuse answers if neither the input nor the solver changed
+    python -m aoc run --sidecars        # load parsed inputs from binary sidecars, written on first run
+    python -m aoc run -j 0              # run on a pool of worker processes, one per core
+    python -m aoc run --trace t.json    # record spans of the traced functions, open in ui.perfetto.dev
+    python -m aoc run --time-limit 60   # cancel solutions running over a minute, report how far they got
+    python -m aoc imports --budget 100  # time imports of each solution, fail if one takes over 100 ms
+    python -m aoc memory --budget 200   # peak memory of each solution, fail if one allocates over 200 MiB
+    python -m aoc profile 12 2          # sample the stacks of day 12 part 2, write them to profile.txt
+    python -m aoc both -d 11 14         # solve both parts in a single pass, report the time saved
+    python -m aoc batch 11 inputs/      # solve day 11 on all the .txt inputs of a directory
+    python -m aoc stream 1 2 < big.txt  # solve day 1 part 2 reading its input by chunks from stdin
+    python -m aoc serve                 # keep warm workers answering solve requests on localhost:8021
+    python -m aoc ask 9 2 big.txt       # ask the running service for day 9 part 2 on an input
+    python -m aoc generate 9 4000       # write a generated 4000 x 4000 heightmap for day 9
+    python -m aoc bench -o new.json     # run the scaling benchmarks, save the results
+    python -m aoc bench --compare old.json new.json
+    python -m aoc --backend numba run -d 11  # compile the loop-bound kernels with numba, see aoc.backends
+    python -m aoc bench --compare-backends   # benchmark the kernels with each backend, check their outputs
+    python -m aoc bench --compare-dtypes     # benchmark the grids on compact arrays and widened to int64
+    python -m aoc --backend taichi run -d 9  # run the kernels which have a Taichi version with Taichi
+    python -m aoc --memory-budget 50 run     # days 5, 7, 13 and 15 switch to variants within 50 MiB if needed
+    python -m aoc check -c numba budget -d 5 # check fast paths against the reference solutions, report speedups
+    python -m aoc --workers 4 run -d 4 5 15  # split days 4, 5 and 15 between workers sharing their inputs
+    python -m aoc zygote start          # keep a process with everything imported, later commands fork from it
+    python -m aoc stress -d 10 16       # solve worst-case inputs at growing sizes, report time, memory and crashes
+    python -m aoc generate 12 --pathology big_cave_hubs  # write a worst-case input, see aoc.adversarial
+
+Modules needed by a command are only imported when running that command, as some of them import
+numpy and friends, which would defeat the purpose of commands such as 'run --cache'.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from aoc.solutions import DAYS, PARTS, STREAMING_DAYS
+
+
+def _add_selection_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the options to select which days and parts to consider."""
+    parser.add_argument("-d", "--days", type=int, nargs="+", choices=DAYS, default=DAYS, metavar="DAY")
+    parser.add_argument("-p", "--parts", type=int, nargs="+", choices=PARTS, default=PARTS, metavar="PART")
+
+
+def _run(args: argparse.Namespace) -> None:
+    from aoc.cache import AnswerCache
+    from aoc.limits import Limits
+    from aoc.runner import format_table, run_all
+
+    cache = AnswerCache(args.cache_dir, args.cache_size) if args.cache else None
+    limits = Limits(args.time_limit, args.memory_limit, args.heartbeat)
+    if args.jobs is not None:
+        from aoc.parallel import format_report, run_parallel
+
+        report = run_parallel(args.days, args.parts, args.jobs, cache, sidecars=args.sidecars, limits=limits)
+        print(format_report(report))
+        return
+    if args.trace is not None:
+        from aoc.tracing import format_stats, tracing
+
+        with tracing(args.trace) as tracer:
+            timings = run_all(args.days, args.parts, cache, args.sidecars, limits)
+        print(format_table(timings))
+        print()
+        print(format_stats(tracer.stats()))
+        return
+    print(format_table(run_all(args.days, args.parts, cache, args.sidecars, limits)))
+
+
+def _imports(args: argparse.Namespace) -> None:
+    from aoc.importtime import format_reports, measure_all
+
+    reports = measure_all(args.days, args.parts)
+    budget = args.budget / 1e3 if args.budget is not None else None
+    print(format_reports(reports, budget))
+    if budget is not None and any(report.over_budget(budget) for report in reports):
+        raise SystemExit(1)
+
+
+def _memory(args: argparse.Namespace) -> None:
+    from aoc.memory import format_reports, measure_all
+
+    reports = measure_all(args.days, args.parts, args.top)
+    budget = int(args.budget * 2 ** 20) if args.budget is not None else None
+    print(format_reports(reports, budget))
+    if budget is not None and any(report.over_budget(budget) for report in reports):
+        raise SystemExit(1)
+
+
+def _profile(args: argparse.Namespace) -> None:
+    from aoc import profiling
+
+    output_format = args.format or ("speedscope" if args.output.suffix == ".json" else "collapsed")
+    if args.native:
+        try:
+            profiling.record_with_py_spy(
+                args.day, args.part, args.output, output_format, args.input, args.interval / 1e3, args.min_time
+            )
+        except RuntimeError as error:
+            raise SystemExit(str(error))
+        return
+    profile = profiling.profile_in_process(
+        args.day, args.part, args.input, args.interval / 1e3, args.min_time, args.warmup
+    )
+    profiling.write_profile(profile, args.output, output_format, lines=not args.no_lines)
+    print(profiling.format_summary(profile, args.top))
+    print(f"\n{output_format} profile written to {args.output}")
+
+
+def _both(args: argparse.Namespace) -> None:
+    from aoc.combined import format_combined, measure_all
+
+    timings = measure_all(args.days, args.repeats)
+    print(format_combined(timings))
+    if not all(timing.matches for timing in timings):
+        raise SystemExit(1)
+
+
+def _batch(args: argparse.Namespace) -> None:
+    from aoc.batch import format_batch, solve_batch
+
+    print(format_batch(solve_batch(args.day, args.inputs, args.parts)))
+
+
+def _stream(args: argparse.Namespace) -> None:
+    from aoc.solutions import get_stream_solver
+
+    solver = get_stream_solver(args.day, args.part)
+    if args.input is None:
+        print(solver(sys.stdin.buffer))
+        return
+    with args.input.open("rb") as stream:
+        print(solver(stream))
+
+
+def _serve(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from aoc.service import serve
+
+    asyncio.run(serve(args.host, args.port, args.unix, args.jobs or None, args.cache_entries))
+
+
+def _ask(args: argparse.Namespace) -> None:
+    import json
+
+    from aoc.service import request_answer
+    from aoc.solutions import default_input
+
+    address = {"host": args.host, "port": args.port, "unix_socket": args.unix}
+    if args.by_path:
+        inputfile = (args.input or default_input(args.day)).resolve()
+        response = request_answer(args.day, args.part, inputfile=inputfile, **address)
+    else:
+        text = sys.stdin.read() if args.input == Path("-") else (args.input or default_input(args.day)).read_text()
+        response = request_answer(args.day, args.part, text=text, **address)
+    print(json.dumps(response) if args.json else response.get("answer", response.get("error")))
+    if response.get("error") is not None:
+        raise SystemExit(1)
+
+
+def _generate(args: argparse.Namespace) -> None:
+    from aoc.generators import DEFAULT_SEED, DEFAULT_SIZES, generate
+
+    seed = args.seed if args.seed is not None else DEFAULT_SEED
+    if args.pathology is not None:
+        from aoc.adversarial import PATHOLOGIES_BY_NAME, generate_adversarial
+
+        name = f"day_{args.day:02d}.{args.pathology}"
+        if name not in PATHOLOGIES_BY_NAME:
+            names = [known.split(".")[1] for known in PATHOLOGIES_BY_NAME if known.startswith(f"day_{args.day:02d}.")]
+            raise SystemExit(f"no pathology {args.pathology!r} for day {args.day}, expected one of {', '.join(names)}")
+        size = args.size if args.size is not None else PATHOLOGIES_BY_NAME[name].sizes[0]
+        print(generate_adversarial(name, size, args.output, seed))
+        return
+    size = args.size if args.size is not None else DEFAULT_SIZES[args.day]
+    print(generate(args.day, size, args.output, seed))
+
+
+def _bench(args: argparse.Namespace) -> None:
+    from aoc import benchmarks
+
+    if args.compare:
+        baseline, candidate = map(benchmarks.load_results, args.compare)
+        print(benchmarks.compare_results(baseline, candidate))
+        return
+    if args.compare_backends:
+        results = benchmarks.compare_backends(
+            args.benchmarks or benchmarks.KERNEL_BENCHMARKS, args.repeats or 3, sizes=args.sizes
+        )
+        for backend_results in results.values():
+            print(benchmarks.format_results(backend_results))
+        mismatches = []
+        for backend, backend_results in list(results.items())[1:]:
+            print(benchmarks.compare_results(results["python"], backend_results))
+            mismatches.extend(f"{backend}: {mismatch}" for mismatch in backend_results["mismatches"])
+        if mismatches:
+            raise SystemExit("outputs differ from the python backend's:\n" + "\n".join(mismatches))
+        return
+    if args.compare_dtypes:
+        results = benchmarks.compare_dtypes(
+            args.benchmarks or benchmarks.DTYPE_BENCHMARKS, args.repeats or 3, sizes=args.sizes
+        )
+        print(benchmarks.format_dtypes_comparison(results))
+        if results["int64"]["mismatches"]:
+            raise SystemExit("outputs differ on int64 arrays:\n" + "\n".join(results["int64"]["mismatches"]))
+        return
+    results = benchmarks.run_benchmarks(args.benchmarks, args.repeats or benchmarks.DEFAULT_REPEATS, sizes=args.sizes)
+    print(benchmarks.format_results(results))
+    if args.output is not None:
+        benchmarks.save_results(results, args.output)
+
+
+def _check(args: argparse.Namespace) -> None:
+    from aoc.differential import CANDIDATES, check_candidates, format_report, get_candidate
+
+    candidates = [get_candidate(name) for name in args.candidates] if args.candidates else CANDIDATES
+    results = check_candidates(candidates, args.days, args.parts, args.sizes, args.seeds, args.repeats)
+    print(format_report(results))
+    if not all(result.matches for result in results):
+        raise SystemExit(1)
+
+
+def _stress(args: argparse.Namespace) -> None:
+    from aoc import stress
+
+    if args.compare:
+        baseline, candidate = map(stress.load_stress, args.compare)
+        print(stress.compare_stress(baseline, candidate))
+        return
+    results = stress.run_stress(
+        args.pathologies, args.parts, args.sizes, args.time_limit, args.memory_limit, args.days, verbose=True
+    )
+    print(stress.format_stress(results))
+    if args.output is not None:
+        stress.save_stress(results, args.output)
+
+
+def _zygote(args: argparse.Namespace) -> None:
+    from aoc import zygote
+
+    if args.action == "serve":
+        zygote.serve_zygote(args.socket)
+        return
+    if args.action == "start":
+        status = zygote.start_zygote(args.socket)
+        print(f"zygote {status['pid']} ready on {args.socket or zygote.socket_path()}")
+        return
+    if args.action == "stop":
+        pid = zygote.stop_zygote(args.socket)
+        print(f"zygote {pid} stopped" if pid is not None else "no zygote running")
+        return
+    status = zygote.zygote_status(args.socket)
+    if status is None:
+        raise SystemExit("no zygote running")
+    uptime = time.time() - status["started"]
+    print(f"zygote {status['pid']} up for {uptime:.0f} s, {status['forks']} commands forked")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from aoc.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+
+    parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2021 solutions runner.")
+    parser.add_argument("--backend", choices=("python", "numba", "taichi"), help="backend of the loop-bound kernels")
+    parser.add_argument(
+        "--memory-budget", type=float, metavar="MIB", help="dense structures over it switch to tiled or sparse variants"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="processes days 4, 5 and 15 split their inputs between, 0 for one per core",
+    )
+    parser.add_argument(
+        "--no-zygote", action="store_true", help="run in this process even if a zygote is running, see aoc.zygote"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run solutions in-process and report per-stage timings")
+    _add_selection_arguments(run_parser)
+    run_parser.add_argument("--cache", action="store_true", help="look up / store answers in the answers cache")
+    run_parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    run_parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES, help="in bytes")
+    run_parser.add_argument(
+        "--sidecars", action="store_true", help="load parsed inputs from binary sidecars next to the inputs"
+    )
+    run_parser.add_argument(
+        "-j", "--jobs", type=int, help="run on a pool of this many worker processes, 0 for one per core"
+    )
+    run_parser.add_argument(
+        "--trace", type=Path, metavar="FILE", help="record the spans of traced functions to a Chrome trace file"
+    )
+    run_parser.add_argument(
+        "--time-limit", type=float, metavar="SECONDS", help="cancel a day / part running longer, with its progress"
+    )
+    run_parser.add_argument(
+        "--memory-limit", type=float, metavar="MIB", help="cancel a day / part growing the resident memory by more"
+    )
+    run_parser.add_argument(
+        "--heartbeat", type=float, metavar="SECONDS", help="print the progress of the running day / part this often"
+    )
+    run_parser.set_defaults(handler=_run)
+
+    imports_parser = subparsers.add_parser("imports", help="report the time each solution spends importing")
+    _add_selection_arguments(imports_parser)
+    imports_parser.add_argument("--budget", type=float, help="in milliseconds, exit with an error if exceeded")
+    imports_parser.set_defaults(handler=_imports)
+
+    memory_parser = subparsers.add_parser(
+        "memory", help="report the peak memory and top allocation sites of each solution"
+    )
+    _add_selection_arguments(memory_parser)
+    memory_parser.add_argument("--budget", type=float, help="in MiB of traced peak, exit with an error if exceeded")
+    memory_parser.add_argument("--top", type=int, default=5, help="number of allocation sites to report")
+    memory_parser.set_defaults(handler=_memory)
+
+    profile_parser = subparsers.add_parser("profile", help="sample the stacks of a solution, write a flamegraph")
+    profile_parser.add_argument("day", type=int, choices=DAYS, metavar="DAY")
+    profile_parser.add_argument("part", type=int, choices=PARTS, metavar="PART")
+    profile_parser.add_argument("input", type=Path, nargs="?", help="defaults to the day's inputs.txt")
+    profile_parser.add_argument(
+        "-o", "--output", type=Path, default=Path("profile.txt"), help="a .json output defaults to speedscope format"
+    )
+    profile_parser.add_argument("-f", "--format", choices=("collapsed", "speedscope"))
+    profile_parser.add_argument("-i", "--interval", type=float, default=1.0, help="between samples, in milliseconds")
+    profile_parser.add_argument(
+        "--min-time", type=float, default=1.0, help="solve again until profiled for this many seconds"
+    )
+    profile_parser.add_argument(
+        "--warmup", action="store_true", help="solve once before sampling, leaving out lazy imports and compilation"
+    )
+    profile_parser.add_argument("--no-lines", action="store_true", help="merge the frames of a function across lines")
+    profile_parser.add_argument("--native", action="store_true", help="record with py-spy, native frames included")
+    profile_parser.add_argument("--top", type=int, default=10, help="number of functions in the summary")
+    profile_parser.set_defaults(handler=_profile)
+
+    both_parser = subparsers.add_parser("both", help="solve both parts of each day in a single pass")
+    both_parser.add_argument("-d", "--days", type=int, nargs="+", choices=DAYS, default=DAYS, metavar="DAY")
+    both_parser.add_argument("-r", "--repeats", type=int, default=3, help="keep the best timings of this many runs")
+    both_parser.set_defaults(handler=_both)
+
+    batch_parser = subparsers.add_parser("batch", help="solve a day on many inputs in one call")
+    batch_parser.add_argument("day", type=int, choices=DAYS, metavar="DAY")
+    batch_parser.add_argument("inputs", type=Path, nargs="+", help="input files, or directories of .txt input files")
+    batch_parser.add_argument("-p", "--parts", type=int, nargs="+", choices=PARTS, default=PARTS, metavar="PART")
+    batch_parser.set_defaults(handler=_batch)
+
+    stream_parser = subparsers.add_parser("stream", help="solve a day / part reading its input from a stream")
+    stream_parser.add_argument("day", type=int, choices=STREAMING_DAYS, metavar="DAY")
+    stream_parser.add_argument("part", type=int, choices=PARTS, metavar="PART")
+    stream_parser.add_argument("input", type=Path, nargs="?", help="defaults to stdin")
+    stream_parser.set_defaults(handler=_stream)
+
+    serve_parser = subparsers.add_parser("serve", help="answer solve requests with a pool of warm worker processes")
+    serve_parser.add_argument("--unix", type=Path, metavar="SOCKET", help="listen on a Unix socket instead of TCP")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8021)
+    serve_parser.add_argument("-j", "--jobs", type=int, help="number of worker processes, defaults to one per core")
+    serve_parser.add_argument("--cache-entries", type=int, default=1024, help="answers kept in memory")
+    serve_parser.set_defaults(handler=_serve)
+
+    ask_parser = subparsers.add_parser("ask", help="ask a running solve service for an answer")
+    ask_parser.add_argument("day", type=int, choices=DAYS, metavar="DAY")
+    ask_parser.add_argument("part", type=int, choices=PARTS, metavar="PART")
+    ask_parser.add_argument("input", type=Path, nargs="?", help="defaults to the day's inputs.txt, - for stdin")
+    ask_parser.add_argument("--unix", type=Path, metavar="SOCKET")
+    ask_parser.add_argument("--host", default="127.0.0.1")
+    ask_parser.add_argument("--port", type=int, default=8021)
+    ask_parser.add_argument("--by-path", action="store_true", help="send the path of the input instead of its content")
+    ask_parser.add_argument("--json", action="store_true", help="print the whole response")
+    ask_parser.set_defaults(handler=_ask)
+
+    generate_parser = subparsers.add_parser("generate", help="write a synthetic input for a day")
+    generate_parser.add_argument("day", type=int, choices=DAYS, metavar="DAY")
+    generate_parser.add_argument("size", type=int, nargs="?", help="meaning depends on the day, see aoc.generators")
+    generate_parser.add_argument("-o", "--output", type=Path, help="defaults to python/generated/day_XX/...")
+    generate_parser.add_argument("-s", "--seed", type=int)
+    generate_parser.add_argument(
+        "--pathology", metavar="NAME", help="write a worst-case input instead, for instance deep_nesting for day 10"
+    )
+    generate_parser.set_defaults(handler=_generate)
+
+    check_parser = subparsers.add_parser(
+        "check", help="check the fast paths against the reference solutions on edge cases and generated inputs"
+    )
+    _add_selection_arguments(check_parser)
+    check_parser.add_argument(
+        "-c",
+        "--candidates",
+        nargs="+",
+        choices=("numba", "taichi", "budget", "both", "batch", "stream", "sidecars", "shared"),
+        metavar="NAME",
+        help="numba, taichi, budget, both, batch, stream, sidecars or shared, all of them by default",
+    )
+    check_parser.add_argument("-s", "--sizes", type=int, nargs="+", help="instead of the sizes of each day")
+    check_parser.add_argument("--seeds", type=int, default=3, help="generated inputs per size")
+    check_parser.add_argument("-r", "--repeats", type=int, default=3, help="keep the best timings of this many runs")
+    check_parser.set_defaults(handler=_check)
+
+    bench_parser = subparsers.add_parser("bench", help="run the scaling benchmarks and fit complexity exponents")
+    bench_parser.add_argument("-b", "--benchmarks", nargs="+", metavar="NAME", help="for instance day_16.parse_message")
+    bench_parser.add_argument("-r", "--repeats", type=int)
+    bench_parser.add_argument("-s", "--sizes", type=int, nargs="+", help="instead of the sizes of each benchmark")
+    bench_parser.add_argument("-o", "--output", type=Path, help="JSON file to write the results to")
+    bench_parser.add_argument(
+        "--compare", type=Path, nargs=2, metavar=("BASELINE", "CANDIDATE"), help="compare two saved runs"
+    )
+    bench_parser.add_argument(
+        "--compare-backends", action="store_true", help="run the benchmarks of the kernels with each backend"
+    )
+    bench_parser.add_argument(
+        "--compare-dtypes", action="store_true", help="run the benchmarks of the grids on compact and on int64 arrays"
+    )
+    bench_parser.set_defaults(handler=_bench)
+
+    stress_parser = subparsers.add_parser(
+        "stress", help="solve pathological inputs at growing sizes, report the time, memory and crash of each"
+    )
+    _add_selection_arguments(stress_parser)
+    stress_parser.add_argument(
+        "-n", "--pathologies", nargs="+", metavar="NAME", help="for instance day_16.nested_operators"
+    )
+    stress_parser.add_argument("-s", "--sizes", type=int, nargs="+", help="instead of the sizes of each pathology")
+    stress_parser.add_argument("--time-limit", type=float, default=10.0, metavar="SECONDS", help="per run")
+    stress_parser.add_argument("--memory-limit", type=float, default=1000.0, metavar="MIB", help="per run")
+    stress_parser.add_argument("-o", "--output", type=Path, help="JSON file to write the results to")
+    stress_parser.add_argument(
+        "--compare", type=Path, nargs=2, metavar=("BASELINE", "CANDIDATE"), help="compare two saved runs"
+    )
+    stress_parser.set_defaults(handler=_stress)
+
+    zygote_parser = subparsers.add_parser(
+        "zygote", help="manage a background process with everything imported, from which commands fork"
+    )
+    zygote_parser.add_argument(
+        "action", choices=("start", "stop", "status", "serve"), help="serve runs it in the foreground"
+    )
+    zygote_parser.add_argument(
+        "--socket", type=Path, help="defaults to python/.cache/zygote.sock, or $AOC_ZYGOTE_SOCKET"
+    )
+    zygote_parser.set_defaults(handler=_zygote)
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.jobs is not None and args.trace is not None:
+        parser.error("--trace records the spans of in-process runs, it can't be combined with --jobs")
+    if not args.no_zygote:
+        from aoc.zygote import FORKED_COMMANDS, run_in_zygote
+
+        if args.command in FORKED_COMMANDS:
+            code = run_in_zygote(argv if argv is not None else sys.argv[1:])
+            if code is not None:
+                raise SystemExit(code)
+    if args.backend is not None:
+        from aoc.backends import set_backend
+
+        set_backend(args.backend)
+    if args.memory_budget is not None:
+        from aoc.budget import set_memory_budget
+
+        set_memory_budget(args.memory_budget)
+    if args.workers is not None:
+        from aoc.shared import set_workers
+
+        set_workers(args.workers)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
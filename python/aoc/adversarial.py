@@ -0,0 +1,294 @@
+"""
+Pathological puzzle inputs, built to hit what each solution does worst rather than its average case.
+
+The inputs of aoc.generators are random, and random inputs rarely are the worst ones: day 12 only
+explodes with many big caves next to the small ones, day 16 only recurses deeply when operators
+are nested in each other, and a random octopus grid of day 11 eventually synchronizes. Each day has
+a pathology here, a generator writing an input of a chosen `size` to a text stream, with the sizes
+at which the stress suite (aoc.stress) solves it, growing up to past the cliff when there is one.
+What `size` stands for depends on the pathology, see the docstring of each generator.
+
+Inputs are valid as far as the puzzle statements go, although some go past the bounds the puzzles
+happen to keep to (output values of day 8 longer than 4 digits, units of day 2 of many digits...),
+where nothing in the statements says the solutions may fail. Pathologies are named after their day,
+as the benchmarks are, for instance "day_10.deep_nesting".
+
+Day 9 basins used to be found recursively, and a basin snaking through the whole map would have
+gone past the recursion limit. A point only belongs to the basin of a lower neighbour though, and
+heights go from 0 to 8 in a basin, so basins are at most 9 points deep and never were that large:
+the pathology of day 9 is a map made of as many basins as possible instead.
+"""
+import string
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+import numpy as np
+
+from aoc.generators import (
+    CHUNK_SIZE,
+    DEFAULT_SEED,
+    GENERATED_DIR,
+    PAIRS,
+    SEVEN_SEGMENT_DIGITS,
+    _chunks,
+    _HexWriter,
+    _literal_packet,
+    _operator_header,
+)
+
+DRAWS = 1000  # numbers drawn in the day 4 bingo, the boards only holding the last 25 of them
+LINES = 1000  # lines of the pathologies whose size is the length of each line rather than their number
+
+
+class Pathology(NamedTuple):
+    """A generator of pathological inputs for a day, and the growing sizes to stress the solutions at."""
+
+    name: str
+    day: int
+    write: Callable[[TextIO, int, np.random.Generator], None]
+    sizes: Tuple[int, ...]
+
+
+def wide_depths(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` sonar depths of 18 digits each, the widest ones whose sums of three fit in 64 bits."""
+    for chunk in _chunks(size):
+        depths = rng.integers(10 ** 17, 10 ** 18, size=chunk)
+        stream.write("\n".join(map(str, depths.tolist())) + "\n")
+
+
+def huge_units(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes LINES submarine commands, moving by units of `size` digits."""
+    commands = ["forward", "down", "up"]
+    for index in range(LINES):
+        digits = "".join(map(str, rng.integers(0, 10, size=size - 1).tolist()))
+        stream.write(f"{commands[index % 3]} {rng.integers(1, 10)}{digits}\n")
+
+
+def wide_numbers(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes LINES binary numbers of `size` bits each, every bit becoming a column of strings in the
+    dataframe of the solution. Past a few dozen bits, random numbers are distinct for all purposes.
+    """
+    for lines in _chunks(LINES, max(1, CHUNK_SIZE * 16 // size)):
+        bits = rng.integers(0, 2, size=(lines, size), dtype=np.uint8) + ord("0")
+        rows = np.hstack((bits, np.full((lines, 1), ord("\n"), dtype=np.uint8)))
+        stream.write(rows.tobytes().decode("ascii"))
+
+
+def late_winners(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a draw order of the numbers 0 to DRAWS - 1 and `size` bingo boards made of the last 25
+    drawn numbers, so that every board is checked at every draw and no board wins until the end.
+    """
+    order = rng.permutation(DRAWS)
+    stream.write(",".join(map(str, order.tolist())) + "\n")
+    last_drawn = order[-25:]
+    board_format = "\n" + "%3d %3d %3d %3d %3d\n" * 5
+    for chunk in _chunks(size, CHUNK_SIZE // 25):
+        boards = last_drawn[rng.random((chunk, 25)).argsort(axis=1)]
+        stream.write("".join(board_format % tuple(board) for board in boards.tolist()))
+
+
+def huge_coordinates(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a hundred vent lines (horizontal, vertical and diagonal) with coordinates up to `size`, a
+    grid of `size` x `size` for the solution to draw them on.
+    """
+    for _ in range(100):
+        kind = rng.integers(0, 3)
+        x1, y1, x2, y2 = rng.integers(0, size + 1, size=4).tolist()
+        if kind == 0:
+            y2 = y1
+        elif kind == 1:
+            x2 = x1
+        else:  # at 45 degrees, as long as the shortest of both sides allows
+            length = min(abs(x2 - x1), abs(y2 - y1))
+            x2 = x1 + length * (1 if x2 >= x1 else -1)
+            y2 = y1 + length * (1 if y2 >= y1 else -1)
+        stream.write(f"{x1},{y1} -> {x2},{y2}\n")
+    stream.write(f"0,0 -> {size},0\n")  # the grid spans the whole size
+
+
+def all_spawning(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` lanternfish all about to spawn, growing the fastest possible."""
+    stream.write(",".join(["0"] * size) + "\n")
+
+
+def far_outlier(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes `size` crab positions close to 0, and a single one a hundred times `size` away: the
+    solution computes the distances of every crab to every position up to the farthest one.
+    """
+    positions = rng.integers(0, 10, size=size)
+    positions[rng.integers(0, size)] = 100 * size
+    stream.write(",".join(map(str, positions.tolist())) + "\n")
+
+
+def long_outputs(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes LINES notes whose output values are `size` digits long rather than 4."""
+    letters = np.array(list("abcdefg"))
+    for _ in range(LINES):
+        wiring = dict(zip("abcdefg", letters[rng.permutation(7)]))
+        patterns = ["".join(wiring[segment] for segment in digit) for digit in SEVEN_SEGMENT_DIGITS]
+        digits = rng.integers(1, 10, size=size).tolist()  # no leading zero, for int() to keep every digit
+        outputs = " ".join(patterns[digit] for digit in digits)
+        stream.write(f"{' '.join(rng.permutation(patterns).tolist())} | {outputs}\n")
+
+
+def checkerboard(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a `size` x `size` height map of 0s and 1s alternating like the squares of a chessboard:
+    every 0 is a low point, so half of the points are basins of their own, each holding its
+    neighbours.
+    """
+    rows_per_chunk = max(1, CHUNK_SIZE * 16 // size)
+    for start, rows in zip(range(0, size, rows_per_chunk), _chunks(size, rows_per_chunk)):
+        i, j = np.indices((rows, size))
+        digits = ((start + i + j) % 2).astype(np.uint8) + ord("0")
+        lines = np.hstack((digits, np.full((rows, 1), ord("\n"), dtype=np.uint8)))
+        stream.write(lines.tobytes().decode("ascii"))
+
+
+def deep_nesting(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes two lines opening `size` chunks each: the first one is incomplete, the score of its
+    completion having about 2.3 bits per chunk, and the second one is corrupted at the very end.
+    """
+    openings = list(PAIRS)
+    for corrupted in (False, True):
+        picks = rng.integers(0, 4, size=size)
+        for chunk_start, chunk in zip(range(0, size, CHUNK_SIZE), _chunks(size)):
+            stream.write("".join(openings[pick] for pick in picks[chunk_start : chunk_start + chunk].tolist()))
+        if corrupted:
+            last_expected = PAIRS[openings[picks[-1]]]
+            stream.write(next(closing for closing in PAIRS.values() if closing != last_expected))
+        stream.write("\n")
+
+
+def never_synchronizing(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a `size` x `size` grid of octopi whose energy levels are their row number modulo 10. After
+    some 60 steps it goes round a cycle of 7 steps in which they never all flash at once, so part 2
+    never ends: it's a measure of the time limits rather than of the solution.
+    """
+    row = np.arange(size) % 10
+    stream.write("".join(str(level) * size + "\n" for level in row.tolist()))
+
+
+def big_cave_hubs(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a cave system of `size` small caves and as many big caves, every big cave being connected
+    to every small cave, the start and the end: the number of paths grows with the factorial of `size`.
+    """
+    small = [f"{a}{b}" for a in string.ascii_lowercase for b in string.ascii_lowercase][:size]
+    big = [f"{a}{b}" for a in string.ascii_uppercase for b in string.ascii_uppercase][:size]
+    connections = [f"{cave}-{hub}" for hub in big for cave in ["start", *small, "end"]]
+    stream.write("\n".join(connections) + "\n")
+
+
+def huge_page(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a hundred dots on a page folded `size` times along each axis, down to 40 x 6: the page is
+    some 41 * 2^size wide and 7 * 2^size high, however few dots there are on it.
+    """
+    widths, heights = [40], [6]
+    for _ in range(size):
+        widths.append(2 * widths[-1] + 1)
+        heights.append(2 * heights[-1] + 1)
+    x_lines = np.zeros(widths[-1], dtype=bool)  # the columns / rows on which a fold will happen, as in generate_day_13
+    y_lines = np.zeros(heights[-1], dtype=bool)
+    for width, height in zip(widths[:-1], heights[:-1]):
+        x_lines[width :: 2 * width + 2] = True
+        y_lines[height :: 2 * height + 2] = True
+    xs = rng.choice(np.flatnonzero(~x_lines), size=99)
+    ys = rng.choice(np.flatnonzero(~y_lines), size=99)
+    stream.write(f"{widths[-1] - 1},{heights[-1] - 1}\n")  # the page spans the whole size
+    stream.write("".join(f"{x},{y}\n" for x, y in zip(xs.tolist(), ys.tolist())) + "\n")
+    for width, height in zip(reversed(widths[:-1]), reversed(heights[:-1])):
+        stream.write(f"fold along x={width}\nfold along y={height}\n")
+
+
+def many_elements(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a template of a thousand elements out of `size` distinct ones, and a rule for each of the
+    `size`^2 pairs, so that every pair is counted at every step. There are not enough ASCII letters
+    for that many elements, they are the characters from U+0100 on (latin letters, IPA, greek...).
+    """
+    elements = np.array([chr(0x100 + index) for index in range(size)])  # no line breaks nor spaces up there
+    stream.write("".join(elements[rng.integers(0, size, size=1000)]) + "\n\n")
+    insertions = elements[rng.integers(0, size, size=size * size)].tolist()
+    pairs = (f"{a}{b}" for a in elements.tolist() for b in elements.tolist())
+    stream.write("".join(f"{pair} -> {insertion}\n" for pair, insertion in zip(pairs, insertions)))
+
+
+def serpentine(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a `size` x `size` map of walls of 9s with a corridor of 1s winding from the top left to the
+    bottom right, row after row: the path of lowest risk goes through half of the map.
+    """
+    for row in range(size):
+        if row % 2 == 0:
+            line = "1" * size
+        elif row % 4 == 1:  # go down on the right
+            line = "9" * (size - 1) + "1"
+        else:  # and on the left
+            line = "1" + "9" * (size - 1)
+        stream.write(line + "\n")
+
+
+def nested_operators(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a transmission of `size` operators (sums, products, minimums and maximums) nested in each
+    other around a single literal, each parsed in a recursive call within the one parsing its parent.
+    """
+    writer = _HexWriter(stream)
+    for level in range(size):
+        writer.write(_operator_header(level % 4, 1, level % 8))
+    writer.write(_literal_packet(7, size % 8))
+    writer.flush()
+
+
+def whole_quadrant(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a target area filling the whole quadrant below the launcher up to `size` away, so that
+    every initial velocity swept lands in it, most of them after long trajectories.
+    """
+    stream.write(f"target area: x=1..{size}, y=-{size}..-1\n")
+
+
+PATHOLOGIES: List[Pathology] = [
+    Pathology("day_01.wide_depths", 1, wide_depths, (10 ** 5, 10 ** 6, 3 * 10 ** 6)),
+    Pathology("day_02.huge_units", 2, huge_units, (100, 1000, 10000)),
+    Pathology("day_03.wide_numbers", 3, wide_numbers, (100, 1000, 10000)),
+    Pathology("day_04.late_winners", 4, late_winners, (10, 30, 100, 300)),
+    Pathology("day_05.huge_coordinates", 5, huge_coordinates, (1000, 10000, 100000)),
+    Pathology("day_06.all_spawning", 6, all_spawning, (10 ** 5, 10 ** 6, 10 ** 7)),
+    Pathology("day_07.far_outlier", 7, far_outlier, (100, 300, 1000)),
+    Pathology("day_08.long_outputs", 8, long_outputs, (100, 1000, 10000)),
+    Pathology("day_09.checkerboard", 9, checkerboard, (100, 300, 1000, 3000)),
+    Pathology("day_10.deep_nesting", 10, deep_nesting, (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)),
+    Pathology("day_11.never_synchronizing", 11, never_synchronizing, (10, 100, 1000)),
+    Pathology("day_12.big_cave_hubs", 12, big_cave_hubs, (2, 3, 4, 5)),
+    Pathology("day_13.huge_page", 13, huge_page, (6, 8, 10, 12)),
+    Pathology("day_14.many_elements", 14, many_elements, (10, 100, 1000)),
+    Pathology("day_15.serpentine", 15, serpentine, (100, 300, 1000)),
+    Pathology("day_16.nested_operators", 16, nested_operators, (100, 300, 1000, 10000)),
+    Pathology("day_17.whole_quadrant", 17, whole_quadrant, (50, 100, 200, 400, 800)),
+]
+PATHOLOGIES_BY_NAME: Dict[str, Pathology] = {pathology.name: pathology for pathology in PATHOLOGIES}
+
+
+def adversarial_input_path(name: str, size: int, seed: int = DEFAULT_SEED) -> Path:
+    day, pathology = name.split(".")
+    return GENERATED_DIR / day / f"{pathology}_size_{size}_seed_{seed}.txt"
+
+
+def generate_adversarial(name: str, size: int, outputfile: Optional[Path] = None, seed: int = DEFAULT_SEED) -> Path:
+    """Writes the input of the named pathology at the given size to `outputfile` and returns its path."""
+    pathology = PATHOLOGIES_BY_NAME[name]
+    outputfile = Path(outputfile) if outputfile is not None else adversarial_input_path(name, size, seed)
+    outputfile.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng([seed, pathology.day])
+    with outputfile.open("w", encoding="utf-8") as stream:
+        pathology.write(stream, size, rng)
+    return outputfile
@@ -0,0 +1,133 @@
+"""
+Pluggable backends for the loop-bound kernels of the solutions.
+
+A kernel is a function doing scalar work over NumPy arrays, decorated with `kernel`. With the
+default "python" backend it runs as it is written. With the "numba" backend it is compiled with
+Numba's `njit` on its first call (compiled code is cached on disk in `__pycache__`, next to the
+solution), which requires Numba to be installed and the kernel to be written in the subset of
+Python that Numba compiles: loops, scalars and arrays. Kernels whose Python version is vectorized
+with NumPy give a loop version to compile instead, with the same signature and results.
+
+With the "taichi" backend, kernels given a Taichi version run it instead, on Taichi's CPU backend
+(others run as plain Python). A Taichi version is a function taking the `taichi` module and
+returning a function with the same signature and results as the kernel, usually allocating the
+outputs and calling `ti.kernel` functions on the arrays: it is only built on the first call, once
+Taichi is initialized. Taichi kernels are compiled on their first call too, cached on disk by Taichi.
+
+The backend is selected per run, with `set_backend` (or `use_backend` for a block), or with the
+AOC_BACKEND environment variable, which is also how worker processes and the day scripts learn
+about it: `AOC_BACKEND=numba python first.py`. If the library of a backend can't be imported, it
+falls back to the Python code with a warning.
+"""
+import functools
+import importlib.util
+import os
+import sys
+import warnings
+from contextlib import contextmanager, redirect_stdout
+from types import ModuleType
+from typing import Callable, Iterator, Optional
+
+BACKENDS = ("python", "numba", "taichi")
+DEFAULT_BACKEND = "python"
+ENVIRONMENT_VARIABLE = "AOC_BACKEND"
+
+_backend = os.environ.get(ENVIRONMENT_VARIABLE, DEFAULT_BACKEND)
+_taichi: Optional[ModuleType] = None  # the taichi module, once initialized
+
+
+def backend_available(name: str) -> bool:
+    """Returns whether the library of the backend is installed, without importing it."""
+    return name == "python" or importlib.util.find_spec(name) is not None
+
+
+def numba_available() -> bool:
+    """Returns whether Numba can be imported."""
+    return backend_available("numba")
+
+
+def _init_taichi() -> ModuleType:
+    """Imports and initializes Taichi on the CPU the first time, without its banner and info logs."""
+    global _taichi
+    if _taichi is None:
+        os.environ.setdefault("ENABLE_TAICHI_HEADER_PRINT", "0")
+        os.environ.setdefault("TI_LOG_LEVEL", "warn")
+        import taichi as ti
+
+        with redirect_stdout(sys.stderr):  # it prints the architecture it starts on, answers are printed on stdout
+            ti.init(arch=ti.cpu)
+        _taichi = ti
+    return _taichi
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """
+    Selects the backend of the kernels, exported to the environment for worker processes, and
+    returns the previous one. Selecting a backend whose library is not installed selects "python" instead.
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    if not backend_available(name):
+        warnings.warn(f"{name} is not installed, kernels run as plain Python")
+        name = "python"
+    previous, _backend = _backend, name
+    os.environ[ENVIRONMENT_VARIABLE] = name
+    return previous
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[str]:
+    """Selects a backend for the duration of the block, yields the one actually selected."""
+    previous = set_backend(name)
+    try:
+        yield _backend
+    finally:
+        set_backend(previous)
+
+
+def kernel(
+    function: Optional[Callable] = None,
+    *,
+    loops: Optional[Callable] = None,
+    taichi: Optional[Callable[[ModuleType], Callable]] = None,
+) -> Callable:
+    """
+    Decorates a kernel, which is compiled with Numba when the numba backend is selected. `loops` is
+    the version to compile instead of the function itself, for kernels vectorized with NumPy.
+    `taichi` builds the version run by the taichi backend, given the taichi module.
+    """
+    if function is None:
+        return functools.partial(kernel, loops=loops, taichi=taichi)
+
+    compiled = None
+    taichi_version = None
+
+    @functools.wraps(function)
+    def dispatch(*args):
+        nonlocal compiled, taichi_version
+        if _backend == "taichi" and taichi is not None:
+            if taichi_version is None:
+                try:
+                    taichi_version = taichi(_init_taichi())
+                except ImportError:  # the environment variable asked for it, warn once and stop asking
+                    set_backend("taichi")
+                    return function(*args)
+            return taichi_version(*args)
+        if _backend != "numba":
+            return function(*args)
+        if compiled is None:
+            try:
+                import numba
+            except ImportError:  # the environment variable asked for it, warn once and stop asking
+                set_backend("numba")
+                return function(*args)
+            compiled = numba.njit(cache=True)(loops if loops is not None else function)
+        return compiled(*args)
+
+    dispatch.python = function
+    return dispatch
@@ -0,0 +1,117 @@
+"""
+Solving many inputs of the same day in a single call, for instance one input per user.
+
+The solution modules are imported once for the whole batch, and each input is parsed once for
+both parts when they share their parse function. Days whose work can be vectorized across inputs
+expose `partN_batch` functions, taking the list of parsed inputs and returning the list of answers:
+day 6 reproduces all schools of lanternfishes as a single matrix of counts, day 11 stacks the grids
+of octopi and steps them all at once. Other days solve the inputs one after the other.
+
+An input which can't be parsed or solved doesn't prevent the others from being solved: its
+traceback is kept in place of its answer. If a batch function fails, the inputs are solved one by
+one to find out which of them is at fault.
+"""
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc.solutions import PARTS, load_solution
+
+
+class BatchAnswer(NamedTuple):
+    """Answer of a day / part on one input of a batch, or the formatted traceback if it failed."""
+
+    inputfile: Path
+    part: int
+    answer: Any
+    error: Optional[str] = None
+
+
+class BatchReport(NamedTuple):
+    """All answers of a batch, with the wall time (in seconds) of parsing and of solving each part."""
+
+    day: int
+    answers: List[BatchAnswer]
+    parse_time: float
+    compute_times: List[float]
+
+
+def collect_inputs(paths: Iterable[Path]) -> List[Path]:
+    """Returns the given input files, replacing directories with the .txt files they hold (sorted)."""
+    inputfiles = []
+    for path in map(Path, paths):
+        inputfiles.extend(sorted(path.glob("*.txt")) if path.is_dir() else [path])
+    return inputfiles
+
+
+def _solve_each(solver, inputfiles: List[Path], parsed_inputs: List[Any], part: int) -> List[BatchAnswer]:
+    answers = []
+    for inputfile, parsed_input in zip(inputfiles, parsed_inputs):
+        try:
+            answers.append(BatchAnswer(inputfile, part, solver(parsed_input)))
+        except Exception:
+            answers.append(BatchAnswer(inputfile, part, None, traceback.format_exc()))
+    return answers
+
+
+def solve_part(day: int, part: int, inputfiles: List[Path], parsed_inputs: List[Any]) -> List[BatchAnswer]:
+    """Solves a part on already parsed inputs, vectorized across inputs if the day has a batch function."""
+    module = load_solution(day, part)
+    batch_solver = getattr(module, f"part{part}_batch", None)
+    if batch_solver is not None and parsed_inputs:
+        try:
+            answers = batch_solver(parsed_inputs)
+            return [BatchAnswer(inputfile, part, answer) for inputfile, answer in zip(inputfiles, answers)]
+        except Exception:  # find out which inputs fail
+            pass
+    return _solve_each(getattr(module, f"part{part}"), inputfiles, parsed_inputs, part)
+
+
+def _parse_each(parser, inputfiles: List[Path]) -> Tuple[List[Path], List[Any], List[Tuple[Path, str]]]:
+    """Returns the inputs which could be parsed, their parsed versions, and the tracebacks of the others."""
+    parsed_files, parsed_inputs, errors = [], [], []
+    for inputfile in inputfiles:
+        try:
+            parsed_inputs.append(parser(inputfile))
+            parsed_files.append(inputfile)
+        except Exception:
+            errors.append((inputfile, traceback.format_exc()))
+    return parsed_files, parsed_inputs, errors
+
+
+def solve_batch(day: int, inputfiles: Iterable[Path], parts: Iterable[int] = PARTS) -> BatchReport:
+    """Parses all inputs once and solves the requested parts of the given day on each of them."""
+    inputfiles = collect_inputs(inputfiles)
+    answers, parse_time, compute_times = [], 0.0, []
+    parsed = {}  # parse function -> its results, often shared by both parts (second.py importing it from first.py)
+
+    for part in parts:
+        parser = load_solution(day, part).parse
+        if parser not in parsed:
+            start = time.perf_counter()
+            parsed[parser] = _parse_each(parser, inputfiles)
+            parse_time += time.perf_counter() - start
+        parsed_files, parsed_inputs, errors = parsed[parser]
+        answers.extend(BatchAnswer(inputfile, part, None, error) for inputfile, error in errors)
+
+        start = time.perf_counter()
+        answers.extend(solve_part(day, part, parsed_files, parsed_inputs))
+        compute_times.append(time.perf_counter() - start)
+
+    order = {inputfile: index for index, inputfile in enumerate(inputfiles)}
+    answers.sort(key=lambda answer: (order[answer.inputfile], answer.part))
+    return BatchReport(day, answers, parse_time, compute_times)
+
+
+def format_batch(report: BatchReport) -> str:
+    """Formats the answers of a batch as text, one line per input and part, followed by the timings."""
+    lines = []
+    for answer in report.answers:
+        result = answer.answer if answer.error is None else "ERROR: " + answer.error.strip().splitlines()[-1]
+        lines.append(f"{str(answer.inputfile)}\t{answer.part}\t{result}")
+
+    n_inputs = len({answer.inputfile for answer in report.answers})
+    compute = ", ".join(f"{1e3 * compute_time:.2f}" for compute_time in report.compute_times)
+    lines.append(f"# day {report.day}, {n_inputs} inputs: parse {1e3 * report.parse_time:.2f} ms, compute {compute} ms")
+    return "\n".join(lines)
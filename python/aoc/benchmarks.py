@@ -0,0 +1,471 @@
+"""
+Benchmarks of the core functions of the solutions at growing input sizes.
+
+Each benchmark runs a function on generated inputs of increasing sizes (see `aoc.generators`),
+a few times per size for stable numbers, and fits the empirical complexity exponent `k` of
+time ~ input_bytes^k from the best time of each size (or time ~ size^k, for inputs whose length
+barely depends on their size, such as day 17's). Anything growing clearly faster than the input
+is flagged as super-linear. Results are written as JSON, so that runs from two commits can be
+compared with `compare_results`.
+
+Benchmarks run with the kernels backend of the run, see `aoc.backends`. `compare_backends` runs
+the benchmarks of the kernels with each installed backend, to compare them with `compare_results`
+too, and checks that their outputs are the same as with the python backend. Their default sizes
+are small for the Python loops to run in seconds: give larger ones (multi-megapixel grids) to see
+whether compiling pays off.
+
+`compare_dtypes` runs the benchmarks of the grid functions, which work in the dtype of the arrays
+they are given, once on the compact arrays of the solutions (uint8 grids, boolean pages...) and
+once on the same arrays widened to int64, on large grids. It reports the size of the arrays of
+each run next to the sizes of the CPU caches: once the int64 arrays no longer fit in a cache level
+while the compact ones still do, the gap between their timings grows.
+"""
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aoc.backends import BACKENDS, backend_available, get_backend, use_backend
+from aoc.generators import DEFAULT_SEED, generate, generated_input_path
+from aoc.solutions import PYTHON_DIR, load_solution
+
+DEFAULT_REPEATS = 5
+SUPERLINEAR_THRESHOLD = 1.2  # exponents above this are flagged, leaving some room for noise
+
+
+class Benchmark(NamedTuple):
+    """
+    A function to time at several input sizes. The `prepare` callable is given the solution module
+    and the parsed input and returns the arguments of `run`. It is called before each repeat and is
+    not timed, which allows to give a fresh copy of the input to functions modifying it inplace.
+    """
+
+    name: str
+    day: int
+    part: int
+    sizes: Tuple[int, ...]
+    run: Callable[..., Any]
+    prepare: Callable[[ModuleType, Any], tuple] = lambda module, parsed: (parsed,)
+
+
+class BenchmarkResult(NamedTuple):
+    """Timings of a benchmark, in seconds, with one list of repeats per input size."""
+
+    name: str
+    day: int
+    part: int
+    sizes: List[int]
+    input_bytes: List[int]
+    timings: List[List[float]]
+    exponent: float
+    superlinear: bool
+
+
+def _ten_steps(module: ModuleType, energy_levels: np.ndarray) -> int:
+    return sum(module.count_step_flashes(energy_levels) for _ in range(10))
+
+
+def _draw_straight_segments(module: ModuleType, grid: np.ndarray, segments: np.ndarray) -> int:
+    module.draw_saturating(grid, segments, module.draw_straight_segments)
+    return int(np.count_nonzero(grid >= module.OVERLAP))
+
+
+def _fold_all(module: ModuleType, manual_page: np.ndarray, folds: List[Tuple[str, str]]) -> np.ndarray:
+    for axis, index in folds:
+        manual_page = module.fold_array(manual_page, axis, int(index))
+    return manual_page
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("day_04.play_bingo", 4, 1, (25, 50, 100, 200), lambda module, parsed: module.part1(parsed)),
+    Benchmark("day_05.draw_all_lines", 5, 2, (250, 500, 1000, 2000), lambda module, lines: module.part2(lines)),
+    Benchmark(
+        "day_05.draw_straight_segments",
+        5,
+        2,
+        (250, 500, 1000, 2000),
+        _draw_straight_segments,
+        prepare=lambda module, lines: (
+            module.create_grid_from_loaded_lines(lines),
+            module.get_straight_segments(lines),
+        ),
+    ),
+    Benchmark(
+        "day_07.get_distances_arrays",
+        7,
+        1,
+        (250, 500, 1000, 2000),
+        lambda module, positions: module.get_distances_arrays(positions),
+    ),
+    Benchmark(
+        "day_09.find_low_points_indices",
+        9,
+        2,
+        (50, 100, 200, 400),
+        lambda module, heights_map: module.find_low_points_indices(heights_map),
+    ),
+    Benchmark(
+        "day_09.find_basins", 9, 2, (50, 100, 200, 400), lambda module, heights_map: module.find_basins(heights_map)
+    ),
+    Benchmark(
+        "day_09.find_basin_sizes",
+        9,
+        2,
+        (50, 100, 200, 400),
+        lambda module, heights_map: module.find_basin_sizes(heights_map),
+    ),
+    Benchmark(
+        "day_11.count_step_flashes",
+        11,
+        1,
+        (25, 50, 100, 200),
+        _ten_steps,
+        prepare=lambda module, energy_levels: (energy_levels.copy(),),  # steps modify the grid inplace
+    ),
+    Benchmark(
+        "day_12.find_paths",
+        12,
+        2,
+        (6, 8, 10, 12),
+        lambda module, cave_map: module.find_paths(*cave_map),
+    ),
+    Benchmark(
+        "day_13.fold_manual_page",
+        13,
+        2,
+        (25_000, 100_000, 400_000, 1_600_000),
+        _fold_all,
+        prepare=lambda module, inputs: (module.construct_manual_page(inputs[0]), inputs[1]),  # only time the folds
+    ),
+    Benchmark(
+        "day_14.grow_polymer",
+        14,
+        2,
+        (1000, 10_000, 100_000, 1_000_000),
+        lambda module, inputs: module.grow_polymer(inputs[0], inputs[1], 40),
+    ),
+    Benchmark(
+        "day_15.get_shortest_path_cost",
+        15,
+        2,
+        (25, 50, 100, 200),
+        lambda module, costs_map: module.get_shortest_path_cost(module.create_new_map(costs_map)),
+    ),
+    Benchmark(
+        "day_16.parse_message",
+        16,
+        2,
+        (1000, 2000, 4000, 8000),
+        lambda module, binary_string: module.parse_message(binary_string),
+    ),
+    Benchmark(
+        "day_17.sweep_trajectories",
+        17,
+        1,
+        (100, 200, 300, 400),
+        lambda module, target_area: module.find_valid_trajectories(target_area),
+    ),
+]
+BENCHMARKS_BY_NAME: Dict[str, Benchmark] = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+KERNEL_BENCHMARKS = (  # benchmarks of the functions running kernels, which depend on the backend
+    "day_04.play_bingo",
+    "day_05.draw_all_lines",
+    "day_09.find_low_points_indices",
+    "day_09.find_basin_sizes",
+    "day_11.count_step_flashes",
+    "day_13.fold_manual_page",
+    "day_17.sweep_trajectories",
+)
+DTYPE_BENCHMARKS = (  # benchmarks of the functions working in the dtype of the arrays they are given
+    "day_05.draw_straight_segments",
+    "day_09.find_low_points_indices",
+    "day_11.count_step_flashes",
+    "day_13.fold_manual_page",
+)
+DTYPE_SIZES = {  # large grids, from a few hundred kilobytes to 16 MiB in uint8 (128 MiB in int64)
+    "day_05.draw_straight_segments": (500, 1000, 2000, 4000),
+    "day_09.find_low_points_indices": (500, 1000, 2000, 4000),
+    "day_11.count_step_flashes": (250, 500, 1000),
+    "day_13.fold_manual_page": (100_000, 400_000, 1_600_000),
+}
+WIDE_DTYPE = np.int64
+
+
+def fit_exponent(input_bytes: Sequence[int], times: Sequence[float]) -> float:
+    """Fits time = c * input_bytes^k in log-log space and returns k, or NaN below two sizes."""
+    if len(input_bytes) < 2:
+        return float("nan")
+    slope, _ = np.polyfit(np.log(input_bytes), np.log(times), deg=1)
+    return float(slope)
+
+
+def run_benchmark(
+    benchmark: Benchmark, repeats: int = DEFAULT_REPEATS, seed: int = DEFAULT_SEED, outputs: Optional[List[Any]] = None
+) -> BenchmarkResult:
+    """
+    Times the benchmark at each of its sizes, generating the inputs if they don't exist yet. The
+    output of the last repeat of each size is appended to `outputs` if given.
+    """
+    module = load_solution(benchmark.day, benchmark.part)
+    input_bytes, timings = [], []
+
+    for size in benchmark.sizes:
+        inputfile = generated_input_path(benchmark.day, size, seed)
+        if not inputfile.exists():
+            generate(benchmark.day, size, inputfile, seed)
+        parsed = module.parse(inputfile)
+
+        size_timings = []
+        for _ in range(repeats):
+            arguments = benchmark.prepare(module, parsed)
+            start = time.perf_counter()
+            output = benchmark.run(module, *arguments)
+            size_timings.append(time.perf_counter() - start)
+        input_bytes.append(inputfile.stat().st_size)
+        timings.append(size_timings)
+        if outputs is not None:
+            outputs.append(output)
+
+    scale = input_bytes if len(set(input_bytes)) == len(input_bytes) else benchmark.sizes
+    exponent = fit_exponent(scale, [min(size_timings) for size_timings in timings])
+    return BenchmarkResult(
+        benchmark.name,
+        benchmark.day,
+        benchmark.part,
+        list(benchmark.sizes),
+        input_bytes,
+        timings,
+        exponent,
+        exponent > SUPERLINEAR_THRESHOLD,
+    )
+
+
+def _git_revision() -> Optional[str]:
+    """Returns the current commit hash, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PYTHON_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    names: Optional[Sequence[str]] = None,
+    repeats: int = DEFAULT_REPEATS,
+    seed: int = DEFAULT_SEED,
+    sizes: Optional[Sequence[int]] = None,
+    outputs: Optional[Dict[str, List[Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the requested benchmarks (all by default), at the given sizes instead of their own if any,
+    and returns the results with some run metadata. Outputs are collected by benchmark in `outputs`.
+    """
+    benchmarks = [BENCHMARKS_BY_NAME[name] for name in names] if names else BENCHMARKS
+    if sizes:
+        benchmarks = [benchmark._replace(sizes=tuple(sizes)) for benchmark in benchmarks]
+    results = []
+    for benchmark in benchmarks:
+        benchmark_outputs = outputs.setdefault(benchmark.name, []) if outputs is not None else None
+        results.append(run_benchmark(benchmark, repeats, seed, benchmark_outputs)._asdict())
+    return {
+        "commit": _git_revision(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "backend": get_backend(),
+        "repeats": repeats,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def _same_output(output: Any, reference: Any) -> bool:
+    return np.array_equal(np.asarray(output), np.asarray(reference))
+
+
+def compare_backends(
+    names: Sequence[str] = KERNEL_BENCHMARKS,
+    repeats: int = DEFAULT_REPEATS,
+    seed: int = DEFAULT_SEED,
+    sizes: Optional[Sequence[int]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs the benchmarks with each installed backend, returns their results by backend. The results
+    of the compiled backends list the benchmarks and sizes whose outputs differ from the python
+    backend's in "mismatches".
+    """
+    backends = [backend for backend in BACKENDS if backend_available(backend)]
+    results, outputs = {}, {}
+    for backend in backends:
+        outputs[backend] = {}
+        with use_backend(backend):
+            if backend != "python":  # compile (or load from the disk cache) outside of the timings
+                run_benchmarks(names, repeats=1, seed=seed, sizes=sizes and sizes[:1])
+            results[backend] = run_benchmarks(names, repeats, seed, sizes, outputs[backend])
+
+    for backend in backends[1:]:
+        mismatches = []
+        for result in results[backend]["results"]:
+            name = result["name"]
+            for size, output, reference in zip(result["sizes"], outputs[backend][name], outputs["python"][name]):
+                if not _same_output(output, reference):
+                    mismatches.append(f"{name} size {size}")
+        results[backend]["mismatches"] = mismatches
+    return results
+
+
+def _widen(value: Any) -> Any:
+    """Returns the value with its integer and boolean arrays (in tuples and lists too) converted to WIDE_DTYPE."""
+    if isinstance(value, np.ndarray) and value.dtype.kind in "biu" and value.dtype != WIDE_DTYPE:
+        return value.astype(WIDE_DTYPE)
+    if isinstance(value, (tuple, list)):
+        return type(value)(_widen(item) for item in value)
+    return value
+
+
+def _array_bytes(value: Any) -> int:
+    """Returns the total size of the arrays in the value (in tuples and lists too), in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_array_bytes(item) for item in value)
+    return 0
+
+
+def cache_sizes() -> Dict[str, int]:
+    """Returns the sizes in bytes of the data caches of the CPU by level ("L1", "L2"...), empty if unknown."""
+    sizes = {}
+    for index in sorted(Path("/sys/devices/system/cpu/cpu0/cache").glob("index*")):
+        try:
+            if (index / "type").read_text().strip() == "Instruction":
+                continue
+            level, size = (index / "level").read_text().strip(), (index / "size").read_text().strip()
+        except OSError:
+            continue
+        units = {"K": 2 ** 10, "M": 2 ** 20, "G": 2 ** 30}
+        sizes[f"L{level}"] = int(size[:-1]) * units[size[-1]] if size[-1] in units else int(size)
+    return sizes
+
+
+def _format_bytes(nbytes: int) -> str:
+    for unit, scale in (("GiB", 2 ** 30), ("MiB", 2 ** 20), ("KiB", 2 ** 10)):
+        if nbytes >= scale:
+            return f"{nbytes / scale:.4g} {unit}"
+    return f"{nbytes} B"
+
+
+def compare_dtypes(
+    names: Sequence[str] = DTYPE_BENCHMARKS,
+    repeats: int = DEFAULT_REPEATS,
+    seed: int = DEFAULT_SEED,
+    sizes: Optional[Sequence[int]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs the benchmarks on the arrays of the solutions ("compact"), then on the same arrays widened to
+    int64 ("int64"), at the given sizes or at their sizes in DTYPE_SIZES. Returns the results of both
+    runs, with the bytes of the arrays given to each benchmark per size in "array_bytes". The results
+    of the int64 run list the benchmarks and sizes whose outputs differ in "mismatches".
+    """
+    results, outputs = {}, {}
+    for label, widen in (("compact", False), ("int64", True)):
+        outputs[label] = {}
+        runs = []
+        for name in names:
+            benchmark = BENCHMARKS_BY_NAME[name]
+            benchmark = benchmark._replace(sizes=tuple(sizes or DTYPE_SIZES.get(name, benchmark.sizes)))
+            if widen:
+                benchmark = benchmark._replace(
+                    prepare=lambda module, parsed, prepare=benchmark.prepare: _widen(prepare(module, parsed))
+                )
+            result = run_benchmark(benchmark, repeats, seed, outputs[label].setdefault(name, []))._asdict()
+            module = load_solution(benchmark.day, benchmark.part)
+            result["array_bytes"] = [
+                _array_bytes(benchmark.prepare(module, module.parse(generated_input_path(benchmark.day, size, seed))))
+                for size in benchmark.sizes
+            ]
+            runs.append(result)
+        results[label] = {"commit": _git_revision(), "backend": get_backend(), "repeats": repeats, "seed": seed}
+        results[label]["results"] = runs
+
+    mismatches = []
+    for result in results["int64"]["results"]:
+        name = result["name"]
+        for size, output, reference in zip(result["sizes"], outputs["int64"][name], outputs["compact"][name]):
+            if not _same_output(output, reference):
+                mismatches.append(f"{name} size {size}")
+    results["int64"]["mismatches"] = mismatches
+    return results
+
+
+def format_dtypes_comparison(results: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Formats the best times of the compact and int64 runs of each benchmark and size, with the size of
+    their arrays and the smallest cache level holding them.
+    """
+    caches = sorted(cache_sizes().items(), key=lambda item: item[1])
+    lines = ["caches: " + (", ".join(f"{level} {_format_bytes(size)}" for level, size in caches) or "unknown")]
+
+    def located(nbytes: int) -> str:
+        level = next((level for level, size in caches if nbytes <= size), "RAM" if caches else "")
+        return f"{_format_bytes(nbytes):>10} {level:<3}"
+
+    wide_results = {result["name"]: result for result in results["int64"]["results"]}
+    for compact in results["compact"]["results"]:
+        wide = wide_results[compact["name"]]
+        lines.append(f"{compact['name']}:")
+        lines.append(f"{'':20}{'compact':>28}{'int64':>28}{'int64 / compact':>18}")
+        for size, compact_bytes, compact_timings, wide_bytes, wide_timings in zip(
+            compact["sizes"], compact["array_bytes"], compact["timings"], wide["array_bytes"], wide["timings"]
+        ):
+            compact_time, wide_time = min(compact_timings), min(wide_timings)
+            lines.append(
+                f"    size {size:>9}: {located(compact_bytes)} {1e3 * compact_time:>9.2f} ms"
+                f" {located(wide_bytes)} {1e3 * wide_time:>9.2f} ms {wide_time / compact_time:>16.2f}x"
+            )
+    return "\n".join(lines)
+
+
+def save_results(results: Dict[str, Any], outputfile: Path) -> None:
+    outputfile.write_text(json.dumps(results, indent=2))
+
+
+def load_results(inputfile: Path) -> Dict[str, Any]:
+    return json.loads(Path(inputfile).read_text())
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Formats benchmark results as a text table, with the best time of each size in milliseconds."""
+    lines = []
+    for result in results["results"]:
+        flag = "  <- super-linear" if result["superlinear"] else ""
+        lines.append(f"{result['name']}: exponent {result['exponent']:.2f}{flag}")
+        for size, nbytes, size_timings in zip(result["sizes"], result["input_bytes"], result["timings"]):
+            lines.append(f"    size {size:>9} ({nbytes:>10} bytes): {1e3 * min(size_timings):>10.2f} ms")
+    return "\n".join(lines)
+
+
+def compare_results(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> str:
+    """Formats the ratio of best times (candidate / baseline) for the benchmarks and sizes found in both runs."""
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    lines = [
+        f"baseline: {baseline.get('commit')} ({baseline.get('backend', 'python')} backend)",
+        f"candidate: {candidate.get('commit')} ({candidate.get('backend', 'python')} backend)",
+    ]
+
+    for result in candidate["results"]:
+        if result["name"] not in baseline_results:
+            continue
+        reference = baseline_results[result["name"]]
+        reference_times = dict(zip(reference["sizes"], map(min, reference["timings"])))
+        lines.append(f"{result['name']}: exponent {reference['exponent']:.2f} -> {result['exponent']:.2f}")
+        for size, size_timings in zip(result["sizes"], result["timings"]):
+            if size in reference_times:
+                ratio = min(size_timings) / reference_times[size]
+                lines.append(f"    size {size:>9}: {ratio:>8.3g}x the baseline time")
+    return "\n".join(lines)
@@ -0,0 +1,89 @@
+"""
+Global memory budget for the dense structures of the solutions.
+
+Some solutions allocate structures sized by the values of their input rather than by its length:
+the grid of day 5 spans the largest coordinates, the distance matrix of day 7 the largest position,
+the manual page of day 13 the farthest dots, and the graph of day 15 the full map. With a budget
+set, they check the size of the dense structure first, and switch to a variant within the budget
+which gives the same answers (drawing tile by tile, computing distances by chunks of positions,
+folding the coordinates of the dots rather than the page, exploring the map without building it).
+
+There is no budget by default. It is set per run with `set_memory_budget` (or `use_memory_budget`
+for a block), or with the AOC_MEMORY_BUDGET environment variable, in MiB, which is also how worker
+processes and the day scripts learn about it: `AOC_MEMORY_BUDGET=100 python second.py`.
+"""
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+ENVIRONMENT_VARIABLE = "AOC_MEMORY_BUDGET"
+MIB = 2 ** 20
+
+
+def _from_environment() -> Optional[int]:
+    value = os.environ.get(ENVIRONMENT_VARIABLE)
+    return int(float(value) * MIB) if value else None
+
+
+_budget = _from_environment()
+
+
+def get_memory_budget() -> Optional[int]:
+    """Returns the memory budget in bytes, or None if there is none."""
+    return _budget
+
+
+def set_memory_budget(mebibytes: Optional[float]) -> Optional[float]:
+    """
+    Sets the memory budget in MiB (None for no budget), exported to the environment for worker
+    processes, and returns the previous one.
+    """
+    global _budget
+    if mebibytes is not None and mebibytes <= 0:
+        raise ValueError(f"the memory budget should be positive, got {mebibytes} MiB")
+    previous = _budget / MIB if _budget is not None else None
+    _budget = int(mebibytes * MIB) if mebibytes is not None else None
+    if mebibytes is None:
+        os.environ.pop(ENVIRONMENT_VARIABLE, None)
+    else:
+        os.environ[ENVIRONMENT_VARIABLE] = str(mebibytes)
+    return previous
+
+
+@contextmanager
+def use_memory_budget(mebibytes: Optional[float]) -> Iterator[None]:
+    """Sets the memory budget for the duration of the block."""
+    previous = set_memory_budget(mebibytes)
+    try:
+        yield
+    finally:
+        set_memory_budget(previous)
+
+
+def fits(nbytes: int) -> bool:
+    """Returns whether a structure of the given size in bytes fits in the budget."""
+    return _budget is None or nbytes <= _budget
+
+
+def chunk_length(length: int, bytes_per_item: int) -> int:
+    """Returns how many of the `length` items of a structure fit in the budget at once, at least one."""
+    if _budget is None:
+        return max(length, 1)
+    return max(1, min(length, _budget // bytes_per_item))
+
+
+def tiles(shape: Tuple[int, int], bytes_per_cell: int) -> Iterator[Tuple[slice, slice]]:
+    """
+    Splits a 2D structure of the given shape into tiles within the budget, yielding their rows and
+    columns: bands of whole rows, or pieces of single rows when not even one row fits.
+    """
+    rows, cols = shape
+    if fits(cols * bytes_per_cell):
+        step = chunk_length(rows, cols * bytes_per_cell)
+        for start in range(0, rows, step):
+            yield slice(start, min(start + step, rows)), slice(0, cols)
+        return
+    step = chunk_length(cols, bytes_per_cell)
+    for row in range(rows):
+        for start in range(0, cols, step):
+            yield slice(row, row + 1), slice(start, min(start + step, cols))
@@ -0,0 +1,129 @@
+"""
+Content-addressed on-disk cache of the answers.
+
+An answer is stored under a key made from the hash of the input file's bytes and the hash of
+the sources of the solver: its own module and the sibling modules it imports from (for instance
+day_09/second.py imports from day_09/first.py). Sources are found by reading the files, without
+importing anything, so that a cache hit never pays for the imports of numpy, pandas & co.
+
+Entries are small JSON files in a directory bounded in size: whenever it grows past its limit,
+the least recently used entries (by modification time, refreshed on every hit) are evicted.
+"""
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, List, Optional
+
+from aoc.solutions import PART_MODULES, PYTHON_DIR, day_directory
+
+DEFAULT_CACHE_DIR = PYTHON_DIR / ".cache" / "answers"
+DEFAULT_MAX_BYTES = 2 ** 20  # entries are about a hundred bytes, this holds thousands of them
+BLOCK_SIZE = 2 ** 20  # files are hashed by blocks of this many bytes
+
+
+def file_digest(path: Path) -> str:
+    """Returns the SHA-256 hexdigest of the file's contents, read by blocks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def solver_sources(day: int, part: int) -> List[Path]:
+    """
+    Returns the source files the solver of the given day and part depends on: its own module and,
+    recursively, the modules of the same directory and of the aoc package it imports from. Found by
+    parsing the imports.
+    """
+    directory = day_directory(day)
+    to_visit = [directory / f"{PART_MODULES[part]}.py"]
+    sources = []
+
+    while to_visit:
+        source = to_visit.pop()
+        if source in sources:
+            continue
+        sources.append(source)
+        for node in ast.walk(ast.parse(source.read_text())):
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                names = [node.module]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            candidates = [directory / f"{name}.py" for name in names]
+            candidates += [PYTHON_DIR / f"{name.replace('.', '/')}.py" for name in names if name.startswith("aoc.")]
+            to_visit.extend(candidate for candidate in candidates if candidate.is_file())
+    return sorted(sources)
+
+
+def solver_digest(day: int, part: int) -> str:
+    """Returns a hash of all the source files the solver of the given day and part depends on."""
+    digest = hashlib.sha256()
+    for source in solver_sources(day, part):
+        digest.update(source.name.encode())
+        digest.update(file_digest(source).encode())
+    return digest.hexdigest()
+
+
+def cache_key(day: int, part: int, inputfile: Path) -> str:
+    """Returns the cache key for the answer of the given day and part on the given input."""
+    digest = hashlib.sha256(f"day_{day:02d}.part{part}".encode())
+    digest.update(solver_digest(day, part).encode())
+    digest.update(file_digest(inputfile).encode())
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """Answers stored as JSON files in a directory, evicting the least recently used past `max_bytes`."""
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached answer for the key, or None if there is none (no answer is ever None)."""
+        entry = self._entry(key)
+        try:
+            answer = json.loads(entry.read_text())["answer"]
+        except (OSError, ValueError, KeyError):  # missing, or unreadable
+            return None
+        os.utime(entry)  # this entry was just used
+        return answer
+
+    def put(self, key: str, answer: Any) -> None:
+        """Stores the answer for the key, then evicts old entries if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(key)
+        temporary = entry.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps({"answer": answer}))
+        os.replace(temporary, entry)  # atomic, readers never see a partial entry
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the directory fits in `max_bytes`."""
+        entries = []
+        for entry in self.directory.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:  # removed in the meantime
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):  # oldest first
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        for entry in self.directory.glob("*.json"):
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,129 @@
+"""
+Solving both parts of a day in a single pass: the input is parsed once, and both answers are
+computed from shared state instead of starting over for part 2.
+
+Days where part 2 continues or extends the work of part 1 expose a `both_parts` function in their
+`second.py`, returning both answers: day 14 grows the polymer to 10 steps and then on to 40, day 11
+counts the flashes of the first 100 steps on its way to the first synchronized step, day 16 gets
+both answers from the same parse of the transmission, day 4 plays bingo once... Other days call
+both parts on the same parsed input, which solutions leave untouched, unless their parse functions
+differ (then nothing is shared).
+
+To report the time saved, both parts are also run separately, each parsing its own input as when
+the scripts are run one after the other (imports aside, modules are only loaded once). Timings are
+the best of a few repeats, so that the imports done lazily by some solutions are not counted.
+"""
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc.runner import run_solution
+from aoc.solutions import DAYS, PARTS, default_input, get_combined_solver, load_solution
+
+DEFAULT_REPEATS = 3
+
+
+class CombinedTiming(NamedTuple):
+    """
+    Answers of both parts of a day from a single pass, the wall times (in seconds) of its parse and
+    compute stages, and the time both parts take when run separately. Days without a `both_parts`
+    function are not `shared`: their single pass saves a parse at most.
+    """
+
+    day: int
+    answers: Tuple[Any, Any]
+    parse_time: float
+    compute_time: float
+    separate_time: float
+    shared: bool
+    matches: bool  # whether the answers are the same as those of the separate runs
+
+    @property
+    def combined_time(self) -> float:
+        return self.parse_time + self.compute_time
+
+    @property
+    def saved_time(self) -> float:
+        return self.separate_time - self.combined_time
+
+
+def solve_both(day: int, inputfile: Optional[Path] = None) -> Tuple[Tuple[Any, Any], float, float]:
+    """Parses the input once and solves both parts, returns the answers and the parse and compute times."""
+    inputfile = Path(inputfile) if inputfile is not None else default_input(day)
+    first, second = load_solution(day, 1), load_solution(day, 2)
+    both_parts = get_combined_solver(day)
+
+    if both_parts is None and first.parse is not second.parse:  # nothing to share, e.g. day 3
+        timings = [run_solution(day, part, inputfile) for part in PARTS]
+        answers = tuple(timing.answer for timing in timings)
+        return answers, sum(timing.parse_time for timing in timings), sum(timing.compute_time for timing in timings)
+
+    start = time.perf_counter()
+    parsed_input = second.parse(inputfile)
+    parsed = time.perf_counter()
+    if both_parts is not None:
+        answers = both_parts(parsed_input)
+    else:
+        answers = (first.part1(parsed_input), second.part2(parsed_input))
+    computed = time.perf_counter()
+    return tuple(answers), parsed - start, computed - parsed
+
+
+def measure_combined(day: int, inputfile: Optional[Path] = None, repeats: int = DEFAULT_REPEATS) -> CombinedTiming:
+    """Times the single pass and the separate runs of both parts of a day, keeping the best of the repeats."""
+    combined, separate = [], []
+    for repeat in range(repeats):
+        if repeat % 2:  # alternate which one runs first, for fairness
+            combined.append(solve_both(day, inputfile))
+        timings = [run_solution(day, part, inputfile) for part in PARTS]
+        separate.append(
+            (tuple(timing.answer for timing in timings), sum(t.parse_time + t.compute_time for t in timings))
+        )
+        if not repeat % 2:
+            combined.append(solve_both(day, inputfile))
+
+    answers, parse_time, compute_time = min(combined, key=lambda timing: timing[1] + timing[2])
+    separate_answers, separate_time = min(separate, key=lambda timing: timing[1])
+    shared = get_combined_solver(day) is not None
+    return CombinedTiming(day, answers, parse_time, compute_time, separate_time, shared, answers == separate_answers)
+
+
+def measure_all(days: Iterable[int] = DAYS, repeats: int = DEFAULT_REPEATS) -> List[CombinedTiming]:
+    """Times the single pass against separate runs for all the requested days, on their shipped inputs."""
+    return [measure_combined(day, repeats=repeats) for day in days]
+
+
+def format_combined(timings: List[CombinedTiming]) -> str:
+    """Formats the timings as a text table, with times in milliseconds."""
+    header = (
+        f"{'day':>3} {'parse':>10} {'compute':>10} {'combined':>10} {'separate':>10} {'saved':>10} {'saved %':>8}"
+        "  answers"
+    )
+    lines = [header, "-" * len(header)]
+    multiline_answers = []
+
+    for timing in timings:
+        answers = []
+        for part, answer in zip(PARTS, map(str, timing.answers)):
+            if "\n" in answer:  # answers drawn as text (day 13 part 2) are displayed below the table
+                multiline_answers.append((timing.day, part, answer))
+                answer = "(see below)"
+            answers.append(answer)
+        notes = ("" if timing.shared else " [parse shared only]") + ("" if timing.matches else " [MISMATCH]")
+        lines.append(
+            f"{timing.day:>3} {1e3 * timing.parse_time:>10.2f} {1e3 * timing.compute_time:>10.2f} "
+            f"{1e3 * timing.combined_time:>10.2f} {1e3 * timing.separate_time:>10.2f} {1e3 * timing.saved_time:>10.2f} "
+            f"{100 * timing.saved_time / timing.separate_time:>7.1f}%  {' / '.join(answers)}{notes}"
+        )
+
+    combined = sum(timing.combined_time for timing in timings)
+    separate = sum(timing.separate_time for timing in timings)
+    lines.append("-" * len(header))
+    lines.append(
+        f"{'all':>3} {'':>10} {'':>10} {1e3 * combined:>10.2f} {1e3 * separate:>10.2f} "
+        f"{1e3 * (separate - combined):>10.2f} {100 * (separate - combined) / separate:>7.1f}%"
+    )
+
+    for day, part, answer in multiline_answers:
+        lines.extend(["", f"Day {day} part {part}:", answer])
+    return "\n".join(lines)
@@ -0,0 +1,438 @@
+"""
+Differential checks of the fast paths of the solutions against the reference solutions.
+
+The reference is what the scripts do: each part's `parse` and `partN` functions, with the python
+backend, no memory budget and no workers. A candidate is another way of getting the same answer from
+the same input file: a compiled backend, the bounded variants of a memory budget, the single pass of
+`both_parts`, a batch function, a stream solver, a parse loaded from its sidecar, shards solved by
+workers on shared memory... Candidates are registered in `CANDIDATES` with the days they apply to,
+and new fast paths are expected to join them.
+
+Both are run on the same inputs: generated ones at a few sizes and seeds (see `aoc.generators`),
+and handwritten edge cases which generated inputs never produce, such as the puzzle examples,
+uneven folds of day 13's page, deeply nested operators of day 16, single points of day 5 or ties
+of day 3. Answers must be equal, and a failure must be the same exception on both sides (inputs
+outside of what the solutions handle). Each run keeps the best of a few repeats, so that kernels
+compiled or libraries imported on first use don't count, and the report gives the distribution of
+the speedups of each candidate per input size, along with any mismatch.
+"""
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from aoc.backends import backend_available, use_backend
+from aoc.budget import use_memory_budget
+from aoc.generators import DEFAULT_SEED, generate
+from aoc.shared import use_workers
+from aoc.solutions import DAYS, PARTS, STREAMING_DAYS, get_combined_solver, get_stream_solver, load_solution
+
+DEFAULT_REPEATS = 3
+DEFAULT_SEEDS = 3  # generated inputs per size
+TIGHT_BUDGET = 0.01  # MiB, small enough for the bounded variants to run on any generated input
+SHARED_WORKERS = 2  # more than one for the sharded paths to run, on a pool even with a single core
+
+# Sizes of the generated inputs, up to about those of the shipped inputs (see aoc.generators.DEFAULT_SIZES)
+SIZES: Dict[int, Tuple[int, ...]] = {
+    1: (100, 1000, 10_000),
+    2: (100, 1000, 10_000),
+    3: (100, 1000, 4000),
+    4: (10, 50, 100),
+    5: (100, 300, 1000),
+    6: (10, 100, 300),
+    7: (100, 300, 1000),
+    8: (20, 100, 200),
+    9: (20, 50, 100),
+    10: (20, 50, 100),
+    11: (5, 10, 20),
+    12: (4, 6, 8),
+    13: (100, 300, 900),
+    14: (10, 100, 1000),
+    15: (10, 25, 50),
+    16: (50, 200, 800),
+    17: (40, 100, 170),
+}
+
+
+def _nested_operators(depth: int) -> str:
+    """Returns a transmission of `depth` nested operators (sums, products, minimums, maximums) around a literal."""
+    bits = "".join(f"{level % 8:03b}{level % 4:03b}1{1:011b}" for level in range(depth))  # one sub-packet each
+    bits += f"{depth % 8:03b}1000111"  # the literal 7
+    bits += "0" * (-len(bits) % 4)
+    return f"{int(bits, 2):0{len(bits) // 4}X}"
+
+
+_BINGO_EXAMPLE = """7,4,9,5,11,17,23,2,0,14,21,24,10,16,13,6,15,25,12,22,18,20,8,19,3,26,1
+
+22 13 17 11  0
+ 8  2 23  4 24
+21  9 14 16  7
+ 6 10  3 18  5
+ 1 12 20 15 19
+
+ 3 15  0  2 22
+ 9 18 13 17  5
+19  8  7 25 23
+20 11 10 24  4
+14 21 16 12  6
+
+14 21 17 24  4
+10 16 15  9 19
+18  8 23 26 20
+22 11 13  6  5
+ 2  0 12  3  7
+"""
+
+_NAVIGATION_EXAMPLE = """[({(<(())[]>[[{[]{<()<>>
+[(()[<>])]({[<{<<[]>>(
+{([(<{}[<>[]}>{[]{[(<()>
+(((({<>}<{<{<>}{[]{[]{}
+[[<[([]))<([[{}[[()]]]
+[{[{({}]{}}([{[{{{}}([]
+{<[[]]>}<{[{[{[]{()[[[]
+[<(<(<(<{}))><([]([]()
+<{([([[(<>()){}]>(<<{{
+<{([{{}}[<[[[<>{}]]]>[]]
+"""
+
+_OCTOPI_EXAMPLE = """5483143223
+2745854711
+5264556173
+6141336146
+6357385478
+4167524645
+2176841721
+6882881134
+4846848554
+5283751526
+"""
+
+_MANUAL_EXAMPLE = """6,10
+0,14
+9,10
+0,3
+10,4
+4,11
+6,0
+6,12
+4,1
+0,13
+10,12
+3,4
+3,0
+8,4
+1,10
+2,14
+8,10
+9,0
+
+fold along y=7
+fold along x=5
+"""
+
+_POLYMER_EXAMPLE = """NNCB
+
+CH -> B
+HH -> N
+CB -> H
+NH -> C
+HB -> C
+HC -> B
+HN -> C
+NN -> C
+BH -> H
+NC -> B
+NB -> B
+BN -> B
+BB -> N
+BC -> B
+CC -> N
+CN -> C
+"""
+
+_CAVE_EXAMPLE = """1163751742
+1381373672
+2136511328
+3694931569
+7463417111
+1319128137
+1359912421
+3125421639
+1293138521
+2311944581
+"""
+
+# Inputs which generated ones never produce, by day and name
+EDGE_CASES: Dict[int, Dict[str, str]] = {
+    1: {
+        "example": "199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n",
+        "single window": "1\n2\n3\n",
+        "constant": "5\n5\n5\n5\n5\n",
+    },
+    2: {
+        "example": "forward 5\ndown 5\nforward 8\nup 3\ndown 8\nforward 2\n",
+        "above the surface": "up 3\nforward 2\nup 1\n",
+    },
+    3: {
+        "example": "00100\n11110\n10110\n10111\n10101\n01111\n00111\n11100\n10000\n11001\n00010\n01010\n",
+        "ties": "10\n01\n",
+    },
+    4: {
+        "example": _BINGO_EXAMPLE,
+        "winning column": "1,2,3,4,5\n\n1 6 7 8 9\n2 10 11 12 13\n3 14 15 16 17\n4 18 19 20 21\n5 22 23 24 25\n",
+    },
+    5: {
+        "example": (
+            "0,9 -> 5,9\n8,0 -> 0,8\n9,4 -> 3,4\n2,2 -> 2,1\n7,0 -> 7,4\n"
+            "6,4 -> 2,0\n0,9 -> 2,9\n3,4 -> 1,4\n0,0 -> 8,8\n5,5 -> 8,2\n"
+        ),
+        "single points": "3,3 -> 3,3\n3,3 -> 3,3\n0,0 -> 0,0\n1,1 -> 1,4\n",
+        "reversed lines": "5,1 -> 1,5\n1,5 -> 5,1\n4,4 -> 0,0\n0,0 -> 4,4\n3,0 -> 3,5\n3,5 -> 3,0\n",
+    },
+    6: {"example": "3,4,3,1,2\n", "all timers": "0,1,2,3,4,5,6,7,8\n", "zeros": "0,0,0\n"},
+    7: {"example": "16,1,2,0,4,2,7,1,2,14\n", "single crab": "5\n", "far apart": "0,1000\n"},
+    8: {"example": "acedgfb cdfbe gcdfa fbcad dab cefabd cdfgeb eafb cagedb ab | cdfeb fcadb cdfeb cdbaf\n"},
+    9: {
+        "example": "2199943210\n3987894921\n9856789892\n8767896789\n9899965678\n",
+        "single row": "2191929\n",
+    },
+    10: {"example": _NAVIGATION_EXAMPLE, "short lines": "(]\n(\n[<\n{\n", "complete lines": "()\n(\n[(\n"},
+    11: {"example": _OCTOPI_EXAMPLE, "single octopus": "9\n", "all zeros": "000\n000\n000\n"},
+    12: {
+        "example": "start-A\nstart-b\nA-c\nA-b\nb-d\nA-end\nb-end\n",
+        "larger example": "dc-end\nHN-start\nstart-kj\ndc-start\ndc-HN\nLN-dc\nHN-end\nkj-sa\nkj-HN\nkj-dc\n",
+        "direct path": "start-end\n",
+    },
+    13: {
+        "example": _MANUAL_EXAMPLE,
+        # the front half is longer along x and shorter along y, it is aligned on the fold line side
+        "uneven folds": "0,0\n6,0\n0,3\n1,4\n6,4\n5,1\n\nfold along x=2\nfold along y=3\n",
+        "fold at the edge": "0,0\n3,2\n\nfold along x=3\nfold along y=0\n",
+    },
+    14: {"example": _POLYMER_EXAMPLE, "single pair": "NN\n\nNN -> N\n"},
+    15: {
+        "example": _CAVE_EXAMPLE,
+        "winding path": "19111\n19191\n11191\n99991\n",
+        "single position": "5\n",
+    },
+    16: {
+        "literal": "D2FE28",
+        "nested operators": "8A004A801A8002F478",
+        "nested by length": "C0015000016115A2E0802F182340",
+        "five levels": "A0016C880162017C3686B18A3D4780",
+        "comparisons": "9C0141080250320F1802104A08",
+        "deeply nested": _nested_operators(200),
+    },
+    17: {"example": "target area: x=20..30, y=-10..-5\n", "narrow target": "target area: x=6..6, y=-3..-3\n"},
+}
+
+
+class Failure(NamedTuple):
+    """Outcome of a run which raised, in place of its answer: failures match if their exceptions have the same type."""
+
+    exception: str
+    message: str
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Failure) and self.exception == other.exception
+
+    def __hash__(self) -> int:
+        return hash(self.exception)
+
+
+class Candidate(NamedTuple):
+    """A fast path solving a day / part from its input file, to be checked against the reference on `days`."""
+
+    name: str
+    days: Tuple[int, ...]
+    solve: Callable[[int, int, Path], Any]
+    requires: Optional[str] = None  # library needed for the candidate to run, skipped if it's not installed
+
+    def available(self) -> bool:
+        return self.requires is None or backend_available(self.requires)
+
+
+class CaseResult(NamedTuple):
+    """Outcomes and best times (in seconds) of the reference and a candidate on one input."""
+
+    candidate: str
+    day: int
+    part: int
+    case: str  # name of the edge case, or "seed N" for generated inputs
+    size: Optional[int]  # None for edge cases
+    expected: Any
+    answer: Any
+    reference_time: float
+    candidate_time: float
+
+    @property
+    def matches(self) -> bool:
+        return self.expected == self.answer
+
+    @property
+    def speedup(self) -> float:
+        return self.reference_time / self.candidate_time if self.candidate_time else float("inf")
+
+
+def solve_reference(day: int, part: int, inputfile: Path) -> Any:
+    """Parses and solves as the scripts do, with the python backend, no memory budget and no workers."""
+    with use_backend("python"), use_memory_budget(None), use_workers(1):
+        module = load_solution(day, part)
+        return getattr(module, f"part{part}")(module.parse(inputfile))
+
+
+def _solve_with_backend(backend: str) -> Callable[[int, int, Path], Any]:
+    def solve(day: int, part: int, inputfile: Path) -> Any:
+        with use_backend(backend), use_memory_budget(None):
+            module = load_solution(day, part)
+            return getattr(module, f"part{part}")(module.parse(inputfile))
+
+    return solve
+
+
+def _solve_within_budget(day: int, part: int, inputfile: Path) -> Any:
+    with use_backend("python"), use_memory_budget(TIGHT_BUDGET):
+        module = load_solution(day, part)
+        return getattr(module, f"part{part}")(module.parse(inputfile))
+
+
+def _solve_both(day: int, part: int, inputfile: Path) -> Any:
+    with use_backend("python"), use_memory_budget(None):
+        return get_combined_solver(day)(load_solution(day, 2).parse(inputfile))[part - 1]
+
+
+def _solve_batch(day: int, part: int, inputfile: Path) -> Any:
+    with use_backend("python"), use_memory_budget(None):
+        module = load_solution(day, part)
+        return getattr(module, f"part{part}_batch")([module.parse(inputfile)])[0]
+
+
+def _solve_stream(day: int, part: int, inputfile: Path) -> Any:
+    with use_backend("python"), use_memory_budget(None), inputfile.open("rb") as stream:
+        return get_stream_solver(day, part)(stream)
+
+
+def _solve_with_sidecar(day: int, part: int, inputfile: Path) -> Any:
+    from aoc.sidecars import parse_with_sidecar
+
+    with use_backend("python"), use_memory_budget(None):
+        return getattr(load_solution(day, part), f"part{part}")(parse_with_sidecar(day, part, inputfile))
+
+
+def _solve_with_workers(day: int, part: int, inputfile: Path) -> Any:
+    with use_backend("python"), use_memory_budget(None), use_workers(SHARED_WORKERS):
+        module = load_solution(day, part)
+        return getattr(module, f"part{part}")(module.parse(inputfile))
+
+
+CANDIDATES: List[Candidate] = [
+    Candidate("numba", (4, 5, 9, 11, 13, 15, 17), _solve_with_backend("numba"), requires="numba"),
+    Candidate("taichi", (5, 9, 11, 13), _solve_with_backend("taichi"), requires="taichi"),
+    Candidate("budget", (5, 7, 13, 15), _solve_within_budget),
+    Candidate("both", (4, 5, 6, 9, 10, 11, 13, 14, 16, 17), _solve_both),
+    Candidate("batch", (6, 11), _solve_batch),
+    Candidate("stream", STREAMING_DAYS, _solve_stream),
+    Candidate("sidecars", DAYS, _solve_with_sidecar),
+    Candidate("shared", (4, 5, 15), _solve_with_workers),
+]
+
+
+def get_candidate(name: str) -> Candidate:
+    try:
+        return next(candidate for candidate in CANDIDATES if candidate.name == name)
+    except StopIteration:
+        raise ValueError(
+            f"unknown candidate {name!r}, expected one of {', '.join(c.name for c in CANDIDATES)}"
+        ) from None
+
+
+def _best_run(solve: Callable[[int, int, Path], Any], day: int, part: int, inputfile: Path, repeats: int):
+    """Returns the outcome of the last run and the best time of the repeats."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            outcome = solve(day, part, inputfile)
+        except Exception as error:
+            outcome = Failure(type(error).__name__, str(error))
+        best = min(best, time.perf_counter() - start)
+    return outcome, best
+
+
+def write_cases(day: int, directory: Path, sizes: Sequence[int], seeds: int) -> List[Tuple[str, Optional[int], Path]]:
+    """Writes the edge cases and generated inputs of a day to the directory, returns their names, sizes and paths."""
+    cases = []
+    for index, (name, text) in enumerate(EDGE_CASES.get(day, {}).items()):
+        inputfile = directory / f"day_{day:02d}_edge_{index}.txt"
+        inputfile.write_text(text)
+        cases.append((name, None, inputfile))
+    for size in sizes:
+        for seed in range(DEFAULT_SEED, DEFAULT_SEED + seeds):
+            inputfile = generate(day, size, directory / f"day_{day:02d}_size_{size}_seed_{seed}.txt", seed)
+            cases.append((f"seed {seed}", size, inputfile))
+    return cases
+
+
+def check_candidates(
+    candidates: Sequence[Candidate] = CANDIDATES,
+    days: Iterable[int] = DAYS,
+    parts: Iterable[int] = PARTS,
+    sizes: Optional[Sequence[int]] = None,
+    seeds: int = DEFAULT_SEEDS,
+    repeats: int = DEFAULT_REPEATS,
+) -> List[CaseResult]:
+    """
+    Runs the reference and the available candidates on the edge cases and generated inputs of the
+    requested days and parts (at `sizes`, or the default sizes of each day), and returns the outcomes.
+    """
+    results = []
+    candidates = [candidate for candidate in candidates if candidate.available()]
+    with tempfile.TemporaryDirectory(prefix="aoc-differential-") as directory:
+        for day in days:
+            day_candidates = [candidate for candidate in candidates if day in candidate.days]
+            if not day_candidates:
+                continue
+            for case, size, inputfile in write_cases(day, Path(directory), sizes or SIZES[day], seeds):
+                for part in parts:
+                    expected, reference_time = _best_run(solve_reference, day, part, inputfile, repeats)
+                    for candidate in day_candidates:
+                        answer, candidate_time = _best_run(candidate.solve, day, part, inputfile, repeats)
+                        results.append(
+                            CaseResult(
+                                candidate.name, day, part, case, size, expected, answer, reference_time, candidate_time
+                            )
+                        )
+    return results
+
+
+def format_report(results: List[CaseResult]) -> str:
+    """
+    Formats the number of inputs and mismatches, and the distribution of the speedups (min, median
+    and max) of each candidate per day, part and input size, followed by the mismatches.
+    """
+    groups: Dict[Tuple[str, int, int, Optional[int]], List[CaseResult]] = {}
+    for result in results:
+        groups.setdefault((result.candidate, result.day, result.part, result.size), []).append(result)
+
+    header = f"{'candidate':<10} {'day':>3} {'part':>4} {'size':>7} {'inputs':>6} {'wrong':>5} {'speedup min':>11} "
+    header += f"{'median':>7} {'max':>7}"
+    lines = [header, "-" * len(header)]
+    for (candidate, day, part, size), group in groups.items():
+        speedups = [result.speedup for result in group]
+        wrong = sum(not result.matches for result in group)
+        lines.append(
+            f"{candidate:<10} {day:>3} {part:>4} {size if size is not None else 'edge':>7} {len(group):>6} "
+            f"{wrong:>5} {min(speedups):>11.2f} {statistics.median(speedups):>7.2f} {max(speedups):>7.2f}"
+        )
+
+    mismatches = [result for result in results if not result.matches]
+    if mismatches:
+        lines.extend(["", f"{len(mismatches)} mismatches:"])
+    for result in mismatches:
+        size = f"size {result.size} " if result.size is not None else ""
+        lines.append(
+            f"{result.candidate}, day {result.day} part {result.part}, {size}{result.case}: "
+            f"expected {result.expected!r}, got {result.answer!r}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,446 @@
+"""
+Synthetic puzzle inputs generators, to benchmark solutions way past the size of the shipped inputs.
+
+Each day has a generator writing a valid input of a chosen `size` to a text stream. What `size`
+stands for depends on the day (number of lines, side of a grid, number of boards...), see the
+docstring of each generator. Everything is written chunk by chunk so that generating a file
+never holds it entirely in memory, and draws from a seeded random generator so that a given
+(day, size, seed) always produces the same file.
+"""
+import string
+from math import sqrt
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO
+
+import numpy as np
+
+from aoc.grids import pad
+from aoc.solutions import PYTHON_DIR, load_solution
+
+GENERATED_DIR = PYTHON_DIR / "generated"  # default location of generated inputs, not versioned
+CHUNK_SIZE = 2 ** 16  # number of elements (lines, numbers, rows...) generated and written at once
+DEFAULT_SEED = 2021
+SYNCHRONIZED_GRID_SIZE = 20  # day 11 grids up to this size are guaranteed to synchronize at some point
+
+# Segments lit for each digit of the seven-segment displays, as in the day 8 challenge
+SEVEN_SEGMENT_DIGITS = ["abcefg", "cf", "acdeg", "acdfg", "bcdf", "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+PAIRS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+def _chunks(total: int, chunk_size: int = CHUNK_SIZE):
+    """Yields the sizes of successive chunks adding up to total."""
+    for start in range(0, total, chunk_size):
+        yield min(chunk_size, total - start)
+
+
+def _write_int_lines(stream: TextIO, values: np.ndarray) -> None:
+    """Writes the values one per line."""
+    stream.write("\n".join(map(str, values.tolist())) + "\n")
+
+
+def _write_int_row(stream: TextIO, size: int, low: int, high: int, rng: np.random.Generator) -> None:
+    """Writes `size` random integers in [low, high] as a single comma-separated line."""
+    for index, chunk in enumerate(_chunks(size)):
+        values = rng.integers(low, high + 1, size=chunk)
+        stream.write(("," if index else "") + ",".join(map(str, values.tolist())))
+    stream.write("\n")
+
+
+def _write_digit_grid(stream: TextIO, size: int, low: int, high: int, rng: np.random.Generator) -> None:
+    """Writes a size x size grid of random digits in [low, high], one row per line."""
+    rows_per_chunk = max(1, CHUNK_SIZE * 16 // size)
+    for rows in _chunks(size, rows_per_chunk):
+        digits = rng.integers(low, high + 1, size=(rows, size), dtype=np.uint8) + ord("0")
+        lines = np.hstack((digits, np.full((rows, 1), ord("\n"), dtype=np.uint8)))  # add the newlines
+        stream.write(lines.tobytes().decode("ascii"))
+
+
+def generate_day_01(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` sonar depths, one per line, as a random walk going down on average."""
+    depth = 100
+    for chunk in _chunks(size):
+        depths = depth + np.cumsum(rng.integers(-10, 21, size=chunk))
+        depths = np.abs(depths)  # depths stay positive
+        depth = int(depths[-1])
+        _write_int_lines(stream, depths)
+
+
+def generate_day_02(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` submarine commands, one per line."""
+    commands = np.array(["forward", "down", "up"])
+    for chunk in _chunks(size):
+        directions = commands[rng.choice(3, size=chunk, p=[0.5, 0.3, 0.2])]
+        units = rng.integers(1, 10, size=chunk)
+        stream.write("".join(f"{direction} {unit}\n" for direction, unit in zip(directions, units.tolist())))
+
+
+def generate_day_03(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes `size` (at least 2) distinct binary numbers, one per line. For the ratings of part 2 to
+    single out one number, any group of numbers sharing the same first bits needs to be split by
+    the next bit. Taking all 2^k numbers of k bits (k being the largest possible) shifted left by
+    one, plus the remaining ones among them shifted left by one with a trailing 1, guarantees it.
+    Both sets are written in the order of random affine bijections, so no number is remembered.
+    """
+    bits = size.bit_length() - 1  # largest k such that 2^k <= size
+    modulo = 2 ** bits
+    for start in range(0, size, CHUNK_SIZE):
+        numbers = []
+        for i in range(start, min(size, start + CHUNK_SIZE)):
+            if i % modulo == 0:  # new bijection for each set of numbers
+                multiplier = int(rng.integers(0, max(1, modulo // 2))) * 2 + 1  # odd, so the map is a bijection
+                offset = int(rng.integers(0, modulo))
+            trailing_bit = 1 if i >= modulo else 0
+            numbers.append(f"{(multiplier * i + offset) % modulo:0{bits}b}{trailing_bit}\n")
+        stream.write("".join(numbers))
+
+
+def generate_day_04(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes the draw order of the numbers 0 to 99, followed by `size` bingo boards. Every number
+    is drawn and a board holds 25 distinct numbers, so every board eventually wins.
+    """
+    stream.write(",".join(map(str, rng.permutation(100).tolist())) + "\n")
+    for chunk in _chunks(size, CHUNK_SIZE // 25):
+        boards = rng.random((chunk, 100)).argsort(axis=1)[:, :25]  # 25 distinct numbers per board
+        board_format = "\n" + "%2d %2d %2d %2d %2d\n" * 5  # boards are preceded by a blank line
+        stream.write("".join(board_format % tuple(board) for board in boards.tolist()))
+
+
+def generate_day_05(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` horizontal, vertical or diagonal vent lines with coordinates in [0, size]."""
+    for chunk in _chunks(size):
+        x1, y1 = rng.integers(0, size + 1, size=(2, chunk))
+        kinds = rng.integers(0, 3, size=chunk)  # 0: horizontal, 1: vertical, 2: diagonal
+        x_dir = np.where(2 * x1 <= size, 1, -1)  # go towards the side with the most room
+        y_dir = np.where(2 * y1 <= size, 1, -1)
+        # Longest possible line in the chosen directions, so that the end stays in the grid
+        x_room = np.where(x_dir > 0, size - x1, x1)
+        y_room = np.where(y_dir > 0, size - y1, y1)
+        room = np.where(kinds == 0, x_room, np.where(kinds == 1, y_room, np.minimum(x_room, y_room)))
+        lengths = 1 + (rng.random(chunk) * np.minimum(room, max(1, size // 10))).astype(int)  # no single points
+        lengths = np.minimum(lengths, room)
+        x2 = x1 + np.where(kinds == 1, 0, x_dir * lengths)
+        y2 = y1 + np.where(kinds == 0, 0, y_dir * lengths)
+        stream.write("".join(f"{a},{b} -> {c},{d}\n" for a, b, c, d in zip(*map(np.ndarray.tolist, (x1, y1, x2, y2)))))
+
+
+def generate_day_06(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` lanternfish timers between 1 and 5, on a single comma-separated line."""
+    _write_int_row(stream, size, 1, 5, rng)
+
+
+def generate_day_07(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` crab positions between 0 and `size`, on a single comma-separated line."""
+    _write_int_row(stream, size, 0, size, rng)
+
+
+def generate_day_08(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes `size` notes: the ten scrambled patterns and four scrambled output digits of a display."""
+    letters = np.array(list("abcdefg"))
+    for chunk in _chunks(size, CHUNK_SIZE // 16):
+        wirings = letters[rng.random((chunk, 7)).argsort(axis=1)]  # the mixed up wires of each display
+        # Each digit is written twice per line at most (in the patterns and in the outputs), shuffle both
+        scrambled = [[], []]
+        for segments in SEVEN_SEGMENT_DIGITS:
+            wires = wirings[:, ["abcdefg".index(s) for s in segments]]
+            for shuffles in scrambled:
+                order = rng.random(wires.shape).argsort(axis=1)
+                shuffles.append(["".join(w) for w in np.take_along_axis(wires, order, axis=1).tolist()])
+        patterns_order = rng.random((chunk, 10)).argsort(axis=1).tolist()
+        outputs = rng.integers(0, 10, size=(chunk, 4)).tolist()
+        stream.write(
+            "".join(
+                " ".join(scrambled[0][digit][line] for digit in patterns_order[line])
+                + " | "
+                + " ".join(scrambled[1][digit][line] for digit in outputs[line])
+                + "\n"
+                for line in range(chunk)
+            )
+        )
+
+
+def generate_day_09(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes a `size` x `size` heightmap of digits."""
+    _write_digit_grid(stream, size, 0, 9, rng)
+
+
+def generate_day_10(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes `size` lines of about a hundred brackets, each either corrupted (a closing character
+    does not match) or incomplete (some chunks are never closed). There is always an odd number
+    of incomplete lines, so that the median score of part 2 is one of them.
+    """
+    openings = list(PAIRS)
+    lines = []
+    n_incomplete = 0
+    for index in range(size):
+        length = int(rng.integers(80, 120))
+        draws = rng.random(length).tolist()  # drawing all at once is much faster than one by one
+        picks = rng.integers(0, 4, size=length).tolist()
+        if index == size - 1:  # last line decides the parity of the number of incomplete lines
+            incomplete = n_incomplete % 2 == 0
+        else:
+            incomplete = rng.random() < 0.5
+        n_incomplete += incomplete
+        corrupted_at = -1 if incomplete else int(rng.integers(length // 2, length))
+        stack: List[str] = []
+        characters = []
+        for position in range(length):
+            if stack and position >= corrupted_at >= 0:  # close with the wrong character and stop there
+                characters.append(PAIRS[rng.choice([o for o in openings if PAIRS[o] != stack[-1]])])
+                break
+            if stack and draws[position] < 0.4:  # close the last opened chunk
+                characters.append(stack.pop())
+            else:
+                opening = openings[picks[position]]
+                stack.append(PAIRS[opening])
+                characters.append(opening)
+        else:
+            if not stack:  # corrupted or incomplete, lines always need an opened chunk at the end
+                opening = openings[rng.integers(0, 4)]
+                characters.append(opening)
+                stack.append(PAIRS[opening])
+            if not incomplete:
+                characters.append(PAIRS[rng.choice([o for o in openings if PAIRS[o] != stack[-1]])])
+        lines.append("".join(characters) + "\n")
+        if len(lines) == CHUNK_SIZE // 64 or index == size - 1:
+            stream.write("".join(lines))
+            lines = []
+
+
+def generate_day_11(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a `size` x `size` grid of octopi energy levels. Not every grid ever synchronizes, so up
+    to SYNCHRONIZED_GRID_SIZE the grid is drawn again until it does within a thousand steps. Larger
+    grids are written as drawn, and part 2 may never end for them.
+    """
+    if size > SYNCHRONIZED_GRID_SIZE:
+        _write_digit_grid(stream, size, 0, 9, rng)
+        return
+
+    count_step_flashes = load_solution(11, 1).count_step_flashes
+    while True:
+        energy_levels = rng.integers(0, 10, size=(size, size))
+        simulated = pad(energy_levels, dtype=np.uint8)  # the solution works on grids with a border, of uint8
+        if any(count_step_flashes(simulated) == size * size for _ in range(1000)):
+            break
+    stream.write("".join("".join(map(str, row)) + "\n" for row in energy_levels.tolist()))
+
+
+def generate_day_12(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes the connections of a cave system with `size` small caves and a third as many big caves.
+    Big caves are never connected to each other, otherwise there would be infinitely many paths.
+    """
+    small = [f"{a}{b}" for a in string.ascii_lowercase for b in string.ascii_lowercase][:size]
+    big = [f"{a}{b}" for a in string.ascii_uppercase for b in string.ascii_uppercase][: max(1, size // 3)]
+    connections = set()
+    for cave in small + big:  # every cave gets at least one connection to a small cave
+        connections.add((cave, small[rng.integers(0, len(small))]))
+    for _ in range(size):  # and some more random ones
+        connections.add(tuple(rng.choice(small + big, size=2, replace=False)))
+    connections = {(a, b) for a, b in connections if a != b and not (a in big and b in big)}
+    for cave in rng.choice(small, size=min(2, len(small)), replace=False):
+        connections.add(("start", cave))
+    for cave in rng.choice(small + big, size=2, replace=False):
+        connections.add((cave, "end"))
+    stream.write("".join(f"{a}-{b}\n" for a, b in sorted(connections)))
+
+
+def generate_day_13(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes `size` dots (duplicates are possible) and the fold instructions. The page is folded in
+    half along each axis alternately, down to 40 x 6, and no dot ever sits on a fold line.
+    """
+    n_folds = 1
+    while (40 * 2 ** n_folds) * (6 * 2 ** n_folds) < 4 * size:  # page large enough for the dots
+        n_folds += 1
+    widths, heights = [40], [6]
+    for _ in range(n_folds):  # folding along the middle line of a 2n+1 page leaves n on each side
+        widths.append(2 * widths[-1] + 1)
+        heights.append(2 * heights[-1] + 1)
+
+    x_lines = np.zeros(widths[-1], dtype=bool)  # the columns / rows on which a fold will happen
+    y_lines = np.zeros(heights[-1], dtype=bool)
+    for width, height in zip(widths[:-1], heights[:-1]):  # fold lines are positions on the folded page
+        x_lines[width :: 2 * width + 2] = True
+        y_lines[height :: 2 * height + 2] = True
+
+    # A dot in the far corner makes sure the page spans the whole size, so that folds are along the middle
+    stream.write(f"{widths[-1] - 1},{heights[-1] - 1}\n")
+    for chunk in _chunks(size - 1):
+        xs = rng.choice(np.flatnonzero(~x_lines), size=chunk)
+        ys = rng.choice(np.flatnonzero(~y_lines), size=chunk)
+        stream.write("".join(f"{x},{y}\n" for x, y in zip(xs.tolist(), ys.tolist())))
+
+    stream.write("\n")
+    for width, height in zip(reversed(widths[:-1]), reversed(heights[:-1])):
+        stream.write(f"fold along x={width}\nfold along y={height}\n")
+
+
+def generate_day_14(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes a polymer template of `size` elements and insertion rules for all pairs of ten elements."""
+    elements = np.array(list("BCFHKNOPSV"))
+    for chunk in _chunks(size):
+        stream.write("".join(elements[rng.integers(0, 10, size=chunk)]))
+    stream.write("\n\n")
+    stream.write("".join(f"{a}{b} -> {elements[rng.integers(0, 10)]}\n" for a in elements for b in elements))
+
+
+def generate_day_15(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """Writes a `size` x `size` map of risk levels between 1 and 9."""
+    _write_digit_grid(stream, size, 1, 9, rng)
+
+
+class _HexWriter:
+    """Accumulates bits and writes them as hexadecimal characters whenever enough are available."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.bits: List[str] = []
+        self.pending = 0
+
+    def write(self, bits: str) -> None:
+        self.bits.append(bits)
+        self.pending += len(bits)
+        if self.pending >= 4 * CHUNK_SIZE:
+            self.flush(final=False)
+
+    def flush(self, final: bool = True) -> None:
+        bits = "".join(self.bits)
+        usable = len(bits) if final else len(bits) - len(bits) % 4
+        if final and usable % 4:  # pad with zeros up to a full hexadecimal character, as transmissions do
+            bits += "0" * (4 - usable % 4)
+            usable = len(bits)
+        if usable:
+            self.stream.write(f"{int(bits[:usable], 2):0{usable // 4}X}")
+        self.bits = [bits[usable:]]
+        self.pending = len(self.bits[0])
+
+
+def _literal_packet(value: int, version: int) -> str:
+    """Returns the bits of a literal value packet."""
+    binary = f"{value:b}"
+    binary = "0" * (-len(binary) % 4) + binary
+    groups = [binary[i : i + 4] for i in range(0, len(binary), 4)]
+    return f"{version:03b}100" + "".join(("1" if i < len(groups) - 1 else "0") + g for i, g in enumerate(groups))
+
+
+def _operator_header(type_id: int, n_subpackets: int, version: int) -> str:
+    """Returns the bits of an operator packet header announcing its number of sub-packets."""
+    return f"{version:03b}{type_id:03b}1{n_subpackets:011b}"
+
+
+def _write_small_packet(writer: _HexWriter, rng: np.random.Generator) -> None:
+    """Writes a literal packet, or a comparison of two literals, or a sum / product / min / max of a few."""
+    kind = rng.integers(0, 3)
+    if kind == 0:
+        writer.write(_literal_packet(int(rng.integers(0, 2 ** 20)), int(rng.integers(0, 8))))
+    elif kind == 1:
+        writer.write(_operator_header(int(rng.integers(5, 8)), 2, int(rng.integers(0, 8))))
+        for _ in range(2):
+            writer.write(_literal_packet(int(rng.integers(0, 16)), int(rng.integers(0, 8))))
+    else:
+        n_subpackets = int(rng.integers(1, 5))
+        writer.write(_operator_header(int(rng.integers(0, 4)), n_subpackets, int(rng.integers(0, 8))))
+        for _ in range(n_subpackets):
+            writer.write(_literal_packet(int(rng.integers(1, 16)), int(rng.integers(0, 8))))
+
+
+def _write_packets_tree(writer: _HexWriter, n_packets: int, rng: np.random.Generator) -> None:
+    """Writes a sum packet holding `n_packets` small packets, nesting sums as an operator holds at most 2047."""
+    if n_packets <= 2047:
+        writer.write(_operator_header(0, n_packets, int(rng.integers(0, 8))))
+        for _ in range(n_packets):
+            _write_small_packet(writer, rng)
+        return
+    groups = -(-n_packets // 2047)  # ceiling division
+    children = [n_packets // groups + (1 if i < n_packets % groups else 0) for i in range(groups)]
+    if groups > 2047:
+        raise ValueError("Too many packets requested for a two levels deep transmission.")
+    writer.write(_operator_header(0, groups, int(rng.integers(0, 8))))
+    for n_children in children:
+        _write_packets_tree(writer, n_children, rng)
+
+
+def generate_day_16(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a hexadecimal transmission holding about `size` small packets (roughly 6 characters
+    each), without a trailing newline as it would be parsed as part of the transmission.
+    """
+    writer = _HexWriter(stream)
+    _write_packets_tree(writer, size, rng)
+    writer.flush()
+
+
+def generate_day_17(stream: TextIO, size: int, rng: np.random.Generator) -> None:
+    """
+    Writes a target area about `size` units away horizontally and half as deep. A probe whose x
+    velocity drops to 0 within the area is needed for the highest trajectories of part 1, so the
+    area always includes a triangular number.
+    """
+    x1 = size
+    k = int((sqrt(8 * size + 1) - 1) / 2)
+    triangular = k * (k + 1) // 2  # largest triangular number up to size
+    x0 = int(rng.integers(min(triangular, size * 3 // 4), triangular + 1))
+    y0 = -size // 2
+    y1 = int(rng.integers(y0 + 1, max(y0 + 2, -size // 4)))
+    stream.write(f"target area: x={x0}..{x1}, y={y0}..{y1}\n")
+
+
+GENERATORS: Dict[int, Callable[[TextIO, int, np.random.Generator], None]] = {
+    1: generate_day_01,
+    2: generate_day_02,
+    3: generate_day_03,
+    4: generate_day_04,
+    5: generate_day_05,
+    6: generate_day_06,
+    7: generate_day_07,
+    8: generate_day_08,
+    9: generate_day_09,
+    10: generate_day_10,
+    11: generate_day_11,
+    12: generate_day_12,
+    13: generate_day_13,
+    14: generate_day_14,
+    15: generate_day_15,
+    16: generate_day_16,
+    17: generate_day_17,
+}
+
+# Sizes giving inputs similar to the real ones
+DEFAULT_SIZES = {
+    1: 2000,
+    2: 1000,
+    3: 1000,
+    4: 100,
+    5: 1000,
+    6: 300,
+    7: 1000,
+    8: 200,
+    9: 100,
+    10: 100,
+    11: 10,
+    12: 8,
+    13: 900,
+    14: 20,
+    15: 100,
+    16: 200,
+    17: 170,
+}
+
+
+def generated_input_path(day: int, size: int, seed: int = DEFAULT_SEED) -> Path:
+    """Returns the default location of the generated input for the given day, size and seed."""
+    return GENERATED_DIR / f"day_{day:02d}" / f"size_{size}_seed_{seed}.txt"
+
+
+def generate(day: int, size: int, outputfile: Optional[Path] = None, seed: int = DEFAULT_SEED) -> Path:
+    """Writes a generated input of the given size for the given day to `outputfile` and returns its path."""
+    outputfile = Path(outputfile) if outputfile is not None else generated_input_path(day, size, seed)
+    outputfile.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng([seed, day])  # different days get different streams for the same seed
+    with outputfile.open("w") as stream:
+        GENERATORS[day](stream, size, rng)
+    return outputfile
@@ -0,0 +1,89 @@
+"""
+Compact grid toolkit for the digit-grid days (9, 11 and 15).
+
+Grids are stored as uint8 arrays with a border of one cell around them, filled with a value chosen
+by each solution so that the border never interferes (higher than any digit for low points, 0 for
+energy levels...). Thanks to the border, the neighbours of all cells in a given direction are a
+single shifted view of the padded array, the same shape as the grid: stencils are then a handful
+of vectorized operations on views, without any bounds check or copy.
+
+For graph searches, neighbours are given as flat indices: either as offsets to add to a flat index
+of the padded grid (the border stops the search), or as a table of the neighbours of each cell of
+the unpadded grid, with -1 where a neighbour would be outside.
+
+Except for the neighbour tables, grids may have leading axes, for instance to stack several grids
+of the same shape and run a stencil on all of them at once: the grid is always on the last two axes.
+
+Arrays are kept in the narrowest dtype their values allow: digits and counts in uint8, masks in
+bool, flat indices in int32 unless the grid has over 2^31 cells. Stencils over a large grid are
+bound by memory bandwidth, and an int64 grid moves eight times the bytes of a uint8 one (it also
+falls out of the caches eight times sooner). Counts which could grow past their dtype either have
+a bound known in advance, from which `smallest_uint` picks the dtype, or saturate at the highest
+value which matters to the solution.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+MAX_INT32 = int(np.iinfo(np.int32).max)  # flat indices of grids up to this many cells fit in 32 bits
+OFFSETS_4 = ((-1, 0), (1, 0), (0, -1), (0, 1))  # up, down, left, right
+OFFSETS_8 = OFFSETS_4 + ((-1, -1), (-1, 1), (1, -1), (1, 1))  # and diagonals
+_OFFSETS = {4: OFFSETS_4, 8: OFFSETS_8}
+
+
+def smallest_uint(max_value: int) -> np.dtype:
+    """Returns the narrowest unsigned integer dtype holding all values up to `max_value`."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise OverflowError(f"{max_value} does not fit in 64 bits")
+
+
+def index_dtype(size: int) -> np.dtype:
+    """Returns the dtype of the flat indices of an array of `size` elements: int32 when they fit, int64 otherwise."""
+    return np.dtype(np.int32 if size <= MAX_INT32 else np.int64)
+
+
+def pad(grid: np.ndarray, fill: int = 0, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """Returns a copy of the grid in the given dtype (its own by default), with a border of `fill` one cell wide."""
+    dtype = grid.dtype if dtype is None else dtype
+    padded = np.full(grid.shape[:-2] + (grid.shape[-2] + 2, grid.shape[-1] + 2), fill, dtype=dtype)
+    padded[..., 1:-1, 1:-1] = grid
+    return padded
+
+
+def interior(padded: np.ndarray) -> np.ndarray:
+    """Returns the view of the grid inside the border of a padded grid."""
+    return padded[..., 1:-1, 1:-1]
+
+
+def neighbour_views(padded: np.ndarray, connectivity: int = 4) -> List[np.ndarray]:
+    """
+    Returns, for each direction, the view of the padded grid holding the neighbour in that direction
+    of each cell of the interior: views[k][x, y] is the k-th neighbour of interior(padded)[x, y].
+    """
+    m, n = padded.shape[-2] - 2, padded.shape[-1] - 2
+    return [padded[..., 1 + dx : 1 + dx + m, 1 + dy : 1 + dy + n] for dx, dy in _OFFSETS[connectivity]]
+
+
+def count_neighbours(mask: np.ndarray, connectivity: int = 8) -> np.ndarray:
+    """Returns, for each cell of the interior of a padded boolean mask, how many of its neighbours are set."""
+    counts = np.zeros(interior(mask).shape, dtype=np.uint8)
+    for view in neighbour_views(mask, connectivity):
+        counts += view
+    return counts
+
+
+def flat_offsets(padded_shape: Tuple[int, int], connectivity: int = 4) -> List[int]:
+    """Returns the offsets to add to a flat index of the padded grid to get those of its neighbours."""
+    return [dx * padded_shape[1] + dy for dx, dy in _OFFSETS[connectivity]]
+
+
+def neighbour_table(shape: Tuple[int, int], connectivity: int = 4) -> np.ndarray:
+    """
+    Returns the flat indices of the neighbours of each cell of a grid of the given (unpadded) shape,
+    as an array of shape (cells, connectivity), with -1 for the neighbours outside of the grid.
+    """
+    size = shape[0] * shape[1]
+    indices = pad(np.arange(size, dtype=index_dtype(size)).reshape(shape), fill=-1)
+    return np.stack(neighbour_views(indices, connectivity), axis=-1).reshape(-1, connectivity)
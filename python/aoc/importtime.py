@@ -0,0 +1,105 @@
+"""
+Import-time report of the solutions, built from the interpreter's `-X importtime` output.
+
+Each day / part is solved in a fresh interpreter running with `-X importtime`, so that every
+import it triggers is logged, including those done lazily while parsing or computing. Only the
+imports happening after the runner itself is loaded are kept, and their times are attributed
+to the top-level package of the dependency that triggered them, to see what the startup cost
+of each solution is made of. Solutions whose imports take longer than a budget are flagged.
+"""
+import re
+import subprocess
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from aoc.solutions import DAYS, PARTS, PYTHON_DIR
+
+DEFAULT_BUDGET = 0.25  # seconds of imports allowed per solution
+_MARKER = "aoc-importtime-start"
+_PROBE = """
+import sys
+sys.path.insert(0, {python_dir!r})
+from aoc.runner import run_solution
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+run_solution({day}, {part})
+"""
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)\s*$")
+
+
+class ImportReport(NamedTuple):
+    """Time spent importing (in seconds) while solving a day / part, in total and per top-level package."""
+
+    day: int
+    part: int
+    total_time: float
+    per_package: Dict[str, float]
+
+    def over_budget(self, budget: float = DEFAULT_BUDGET) -> bool:
+        return self.total_time > budget
+
+
+def _is_solution_module(name: str) -> bool:
+    """Whether the module is one of the solutions, as opposed to a dependency."""
+    return name.startswith("day_") or name.split(".")[0] in ("aoc", "first", "second")
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    Attributes the import times logged after the start marker to packages, in seconds. Imports are
+    logged as a tree (children first, one more level of indentation), and the whole cumulative time
+    of a dependency goes to its top-level package, so that for instance the standard library modules
+    numpy imports are counted for numpy. Solution modules only count for their own time.
+    """
+    _, _, logged = stderr.partition(_MARKER)
+    pending: Dict[int, List[tuple]] = defaultdict(list)  # nodes waiting for their parent, per depth
+
+    for line in logged.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match is None:  # header or anything else the solution printed to stderr
+            continue
+        self_us, cumulative_us, indentation, name = match.groups()
+        depth = (len(indentation) - 1) // 2
+        children = pending.pop(depth + 1, [])
+        pending[depth].append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6, children))
+
+    per_package = Counter()
+    to_attribute = [node for nodes in pending.values() for node in nodes]
+    while to_attribute:
+        name, self_time, cumulative_time, children = to_attribute.pop()
+        if _is_solution_module(name):
+            per_package[name] += self_time
+            to_attribute.extend(children)
+        else:
+            per_package[name.split(".")[0]] += cumulative_time
+    return dict(per_package)
+
+
+def measure_imports(day: int, part: int) -> ImportReport:
+    """Solves the given day and part in a fresh interpreter and returns the time spent importing."""
+    probe = _PROBE.format(python_dir=str(PYTHON_DIR), marker=_MARKER, day=day, part=part)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    per_package = parse_importtime(process.stderr)
+    return ImportReport(day, part, sum(per_package.values()), per_package)
+
+
+def measure_all(days: Iterable[int] = DAYS, parts: Iterable[int] = PARTS) -> List[ImportReport]:
+    return [measure_imports(day, part) for day in days for part in parts]
+
+
+def format_reports(reports: List[ImportReport], budget: Optional[float] = DEFAULT_BUDGET, top: int = 3) -> str:
+    """Formats the reports as a text table, with the `top` most expensive packages of each solution."""
+    header = f"{'day':>3} {'part':>4} {'imports':>10}  most expensive packages"
+    lines = [header, "-" * len(header)]
+    for report in reports:
+        packages = sorted(report.per_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        breakdown = ", ".join(f"{name} {1e3 * seconds:.1f}" for name, seconds in packages)
+        flag = "  <- over budget" if budget is not None and report.over_budget(budget) else ""
+        lines.append(f"{report.day:>3} {report.part:>4} {1e3 * report.total_time:>10.2f}  {breakdown}{flag}")
+    return "\n".join(lines)
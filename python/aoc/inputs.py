@@ -0,0 +1,94 @@
+"""
+Memory-mapped input loading with vectorized parsers for the formats coming back across days.
+
+Files are memory-mapped and seen as arrays of bytes, which the parsers work on with numpy
+operations only: no Python string is ever built, not even per line. Integers are found as runs
+of ASCII digits (with an optional leading minus sign), which covers a number per line, numbers
+separated by commas, or the 'x1,y1 -> x2,y2' segments of day 5: numbers of the same length are
+rows of a sliding window view of the bytes, turned into values with a product by powers of ten.
+Digit grids are strided views of the bytes from which the code of '0' is subtracted.
+"""
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided, sliding_window_view
+
+CHUNK_SIZE = 2 ** 24  # bytes parsed at once, bounding the memory used by temporary arrays
+_ZERO, _NINE, _MINUS, _NEWLINE = b"0"[0], b"9"[0], b"-"[0], b"\n"[0]
+
+
+def map_file(inputfile: Path) -> np.ndarray:
+    """Returns a read-only array of the bytes of the file, memory-mapped rather than read."""
+    if Path(inputfile).stat().st_size == 0:  # empty files can't be memory-mapped
+        return np.empty(0, dtype=np.uint8)
+    return np.memmap(inputfile, dtype=np.uint8, mode="r")
+
+
+def _is_digit(data: np.ndarray) -> np.ndarray:
+    return (data >= _ZERO) & (data <= _NINE)
+
+
+def _parse_ints_chunk(data: np.ndarray) -> np.ndarray:
+    """Returns all integers in the bytes, which must not start or end in the middle of a number."""
+    # Numbers are runs of digits: their starts and ends (exclusive) alternate among the digit / non-digit edges
+    digits = np.zeros(len(data) + 2, dtype=bool)
+    digits[1:-1] = _is_digit(data)
+    edges = np.flatnonzero(digits[1:] != digits[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    if not len(starts):
+        return np.empty(0, dtype=np.int64)
+
+    # Numbers of the same length are rows of a sliding window view of the bytes, weighted by powers of ten
+    lengths = ends - starts
+    numbers = np.empty(len(starts), dtype=np.int64)
+    for length in np.flatnonzero(np.bincount(lengths)):
+        selected = np.flatnonzero(lengths == length)
+        rows = sliding_window_view(data, length)[starts[selected]]
+        numbers[selected] = (rows - _ZERO) @ 10 ** np.arange(length - 1, -1, -1, dtype=np.int64)
+
+    has_sign = starts > 0
+    has_sign[has_sign] = data[starts[has_sign] - 1] == _MINUS
+    numbers[has_sign] *= -1
+    return numbers
+
+
+def parse_ints(data: np.ndarray, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """Returns all integers found in the bytes, in order, parsing them by chunks of about `chunk_size` bytes."""
+    numbers = []
+    start = 0
+    while start < len(data):
+        stop = min(start + chunk_size, len(data))
+        while stop < len(data) and _ZERO <= data[stop] <= _NINE:  # don't cut a number in two
+            stop += 1
+        numbers.append(_parse_ints_chunk(data[start:stop]))
+        start = stop
+    return np.concatenate(numbers) if numbers else np.empty(0, dtype=np.int64)
+
+
+def read_int_column(inputfile: Path) -> np.ndarray:
+    """Returns the integers of a file holding one per line, as an int64 array."""
+    return parse_ints(map_file(inputfile))
+
+
+def read_int_row(inputfile: Path) -> np.ndarray:
+    """Returns the integers of a file holding a single line of comma-separated ones, as an int64 array."""
+    return parse_ints(map_file(inputfile))
+
+
+def read_segments(inputfile: Path) -> np.ndarray:
+    """Returns the segments of a file with one 'x1,y1 -> x2,y2' per line, as an (n, 4) int64 array."""
+    return parse_ints(map_file(inputfile)).reshape(-1, 4)
+
+
+def read_digit_grid(inputfile: Path, dtype: np.dtype = np.uint8) -> np.ndarray:
+    """
+    Returns the grid of a file with one row of digits per line (all of the same length) as a 2D array.
+    The rows are a strided view of the mapped bytes, skipping the newlines, so the only copy made is
+    the one subtracting the code of '0', done directly in the requested dtype.
+    """
+    data = map_file(inputfile)
+    newlines = np.flatnonzero(data[:CHUNK_SIZE] == _NEWLINE)
+    width = int(newlines[0]) if len(newlines) else len(data)  # no newline at all: a single row
+    n_rows = (len(data) + 1) // (width + 1)  # the last newline may be missing
+    rows = as_strided(data, shape=(n_rows, width), strides=(width + 1, 1), writeable=False)
+    return np.subtract(rows, _ZERO, dtype=dtype)
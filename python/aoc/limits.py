@@ -0,0 +1,175 @@
+"""
+Wall-clock and memory limits for the solutions, with cooperative cancellation and a progress heartbeat.
+
+Some solutions can run for a very long time on a bad input: day 12 enumerates every path through
+the caves, day 17 sweeps the whole rectangle of initial velocities, day 11 steps the octopi until
+they synchronize, which some grids never do. Their hot loops report how far they are with
+`progress`, giving counters (paths in the frontier, velocities tried, flash waves processed...).
+Outside of `enforce_limits` it does nothing but return, so the loops can call it as they go.
+
+Within `enforce_limits`, a watchdog thread checks the elapsed time and the growth of the resident
+memory of the process every `CHECK_INTERVAL`, and prints the latest counters to stderr at every
+heartbeat. Once a limit is exceeded, the next call to `progress` raises `LimitExceeded`, holding
+the counters reached so far, and the solution unwinds as with any other exception. Code which does
+not report its progress (NumPy calls, compiled kernels...) is interrupted by a KeyboardInterrupt
+sent to the main thread after a grace period instead, which is turned into `LimitExceeded` as well,
+as long as the solution runs in the main thread. Kernels compiled by the numba or taichi backends
+can't report their progress from inside, their callers do between calls.
+
+Memory is polled, so a solution allocating quickly may go past its limit by what it allocates
+in a check interval before being cancelled.
+"""
+import _thread
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional
+
+CHECK_INTERVAL = 0.05  # seconds between two checks of the limits
+GRACE_PERIOD = 1.0  # seconds given to the solution to call `progress` once over a limit, before interrupting it
+MIB = 2 ** 20
+
+
+class Limits(NamedTuple):
+    """Wall-clock time (in seconds) and memory growth (in MiB) allowed, and the seconds between two heartbeats."""
+
+    time: Optional[float] = None
+    memory: Optional[float] = None
+    heartbeat: Optional[float] = None
+
+
+class LimitExceeded(Exception):
+    """Raised from a solution gone over its limits, with the counters it reported so far."""
+
+    def __init__(self, reason: str, elapsed: float, memory: int, counters: Dict[str, int]):
+        self.reason = reason
+        self.elapsed = elapsed
+        self.memory = memory  # growth of the resident memory, in bytes
+        self.counters = counters
+        super().__init__(f"{reason} after {elapsed:.2f} s and {memory / MIB:.1f} MiB{_format_counters(counters, ', ')}")
+
+
+def _format_counters(counters: Dict[str, int], prefix: str = "") -> str:
+    return prefix + ", ".join(f"{name}={value}" for name, value in counters.items()) if counters else ""
+
+
+def _resident_memory() -> int:
+    """Returns the current resident set size of the process, in bytes (its peak if the current one is not available)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else 1024 * peak  # kilobytes on Linux
+
+
+class _Watchdog:
+    """Background thread checking the limits of the running solution and printing its heartbeat."""
+
+    def __init__(self, limits: Limits, label: str):
+        self.limits = limits
+        self.label = label
+        self.counters: Dict[str, int] = {}
+        self.exceeded: Optional[str] = None  # why the solution should stop
+        self.interrupted = False
+        self.finished = False  # the block is over, it must not be interrupted anymore
+        self._lock = threading.Lock()  # taken to interrupt the block, and to mark it as finished
+        self._main_thread = threading.get_ident()
+        self._start = time.perf_counter()
+        self._memory_start = _resident_memory()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def memory(self) -> int:
+        return max(0, _resident_memory() - self._memory_start)
+
+    def error(self) -> LimitExceeded:
+        return LimitExceeded(self.exceeded, self.elapsed(), self.memory(), dict(self.counters))
+
+    def _poll(self) -> None:
+        next_heartbeat = self.limits.heartbeat
+        exceeded_at = None
+        while not self._stop.wait(CHECK_INTERVAL):
+            elapsed, memory = self.elapsed(), self.memory()
+            if self.exceeded is None:
+                if self.limits.time is not None and elapsed > self.limits.time:
+                    self.exceeded = f"over the {self.limits.time:g} s time limit"
+                elif self.limits.memory is not None and memory > self.limits.memory * MIB:
+                    self.exceeded = f"over the {self.limits.memory:g} MiB memory limit"
+                exceeded_at = elapsed  # the grace period starts once a limit is exceeded
+            elif not self.interrupted and elapsed - exceeded_at > GRACE_PERIOD:
+                with self._lock:
+                    if not self.finished:
+                        self.interrupted = True  # it doesn't call progress, interrupt whatever it is doing
+                        if self._main_thread == threading.main_thread().ident:
+                            _thread.interrupt_main()
+            if next_heartbeat is not None and elapsed >= next_heartbeat:
+                print(
+                    f"[{self.label}] {elapsed:.1f} s, {memory / MIB:.1f} MiB{_format_counters(self.counters, ', ')}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+                next_heartbeat += self.limits.heartbeat
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def finish(self) -> None:
+        """Marks the block as over, after which it is never interrupted."""
+        with self._lock:
+            self.finished = True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+_watchdog: Optional[_Watchdog] = None
+
+
+def progress(**counters: int) -> None:
+    """
+    Records the counters of a hot loop, and raises `LimitExceeded` if the running solution went over
+    its limits. Does nothing outside of `enforce_limits`.
+    """
+    if _watchdog is None:
+        return
+    _watchdog.counters.update(counters)
+    if _watchdog.exceeded is not None:
+        raise _watchdog.error()
+
+
+@contextmanager
+def enforce_limits(limits: Optional[Limits], label: str = "") -> Iterator[None]:
+    """
+    Runs the block within the limits, reporting the progress under `label` at every heartbeat.
+    Raises `LimitExceeded` if they are exceeded. Limits of None (or all None) only run the block.
+    """
+    global _watchdog
+    if limits is None or limits == Limits():
+        yield
+        return
+    if _watchdog is not None:
+        raise RuntimeError("limits are already enforced, they can't be nested")
+    watchdog = _watchdog = _Watchdog(limits, label)
+    watchdog.start()
+    try:
+        try:
+            yield
+        finally:
+            # An interrupt sent just before is still delivered, in here at the latest, and handled below
+            watchdog.finish()
+    except KeyboardInterrupt:
+        if not watchdog.interrupted:  # a genuine one
+            raise
+        raise watchdog.error() from None
+    finally:
+        watchdog.stop()
+        _watchdog = None
@@ -0,0 +1,177 @@
+"""
+Memory accounting of the solutions: peak resident set size, tracemalloc peak and top allocation sites.
+
+Each day / part is solved twice, in fresh interpreters, as the peak RSS is a high-water mark of the
+whole process: once untraced for the peak RSS, as tracemalloc's own bookkeeping (a traceback per
+allocation, the snapshots kept) would take up most of it otherwise, and once traced. The solution
+module is imported before tracemalloc starts, so that the traced peak only covers parsing and
+computing (numpy reports its array buffers to tracemalloc, so they are counted). The RSS peak also
+includes the interpreter and imported libraries, it is what the solution takes when run normally.
+
+A snapshot only lists the allocations still alive when it is taken. To see which sites make up
+the peak, a background thread polls the traced memory and takes a new snapshot each time it grows
+past the previous snapshot by some margin. The top sites are read from the largest snapshot, so
+they are an approximation of the peak, while the peak itself is exact. Allocations are attributed
+to the innermost line of the solution they come from, rather than to the library allocating.
+"""
+import json
+import subprocess
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc.solutions import DAYS, PARTS, PYTHON_DIR
+
+DEFAULT_TOP = 5  # allocation sites reported per solution
+SAMPLING_INTERVAL = 0.005  # seconds between two polls of the traced memory
+TRACEBACK_DEPTH = 8  # frames kept per allocation, to find the line of the solution behind it
+SNAPSHOT_MARGIN = 1.1  # take a new snapshot when the traced memory grows past 110% of the last one
+_MARKER = "aoc-memory-report:"
+_PROBE = """
+import sys
+sys.path.insert(0, {python_dir!r})
+from aoc.memory import measure_in_process
+print({marker!r} + measure_in_process({day}, {part}, {top}, traced={traced}).to_json())
+"""
+
+
+class MemoryReport(NamedTuple):
+    """Peak memory (in bytes) used while solving a day / part, and the allocation sites making up the peak."""
+
+    day: int
+    part: int
+    peak_rss: int
+    traced_peak: int
+    top_sites: List[Tuple[str, int]]  # ('file:line', bytes) from the largest snapshot
+
+    def over_budget(self, budget: int) -> bool:
+        return self.traced_peak > budget
+
+    def to_json(self) -> str:
+        return json.dumps(self._asdict())
+
+
+def _peak_rss() -> int:
+    """Returns the peak resident set size of the current process, in bytes."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else 1024 * peak  # kilobytes on Linux
+
+
+class _PeakSnapshots:
+    """Background thread snapshotting the traced allocations every time they reach a new high."""
+
+    def __init__(self):
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(SAMPLING_INTERVAL):
+            self.take_if_larger()
+
+    def take_if_larger(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > SNAPSHOT_MARGIN * self._size:
+            self.snapshot, self._size = tracemalloc.take_snapshot(), current
+
+    def __enter__(self) -> "_PeakSnapshots":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.take_if_larger()  # the results may be the largest allocations
+
+
+def _solution_frame(traceback: tracemalloc.Traceback) -> tracemalloc.Frame:
+    """Returns the innermost frame of the traceback in a solution, or the innermost frame if none is."""
+    for frame in reversed(traceback):  # most recent call last
+        if Path(frame.filename).parent.name.startswith("day_"):
+            return frame
+    return traceback[-1]
+
+
+def measure_in_process(day: int, part: int, top: int = DEFAULT_TOP, traced: bool = True) -> MemoryReport:
+    """
+    Solves the given day and part in the current process, tracing its allocations. Untraced, only the
+    peak RSS is measured (the traced peak is 0 and there are no sites): traced, the peak RSS includes
+    the memory of tracemalloc itself.
+    """
+    from aoc.runner import run_solution
+    from aoc.solutions import load_solution
+
+    if not traced:
+        run_solution(day, part)
+        return MemoryReport(day, part, _peak_rss(), 0, [])
+
+    load_solution(day, part)  # imports are not what we are after here, see aoc.importtime
+    tracemalloc.start(TRACEBACK_DEPTH)
+    with _PeakSnapshots() as snapshots:
+        run_solution(day, part)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sites = Counter()
+    if snapshots.snapshot is not None:
+        for statistic in snapshots.snapshot.statistics("traceback"):
+            frame = _solution_frame(statistic.traceback)
+            sites[f"{frame.filename}:{frame.lineno}"] += statistic.size
+    return MemoryReport(day, part, _peak_rss(), traced_peak, sites.most_common(top))
+
+
+def _measure_in_interpreter(day: int, part: int, top: int, traced: bool) -> MemoryReport:
+    """Runs measure_in_process in a fresh interpreter and returns its report."""
+    probe = _PROBE.format(python_dir=str(PYTHON_DIR), marker=_MARKER, day=day, part=part, top=top, traced=traced)
+    process = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    report = next(line for line in process.stdout.splitlines() if line.startswith(_MARKER))
+    fields = json.loads(report[len(_MARKER) :])
+    fields["top_sites"] = [tuple(site) for site in fields["top_sites"]]
+    return MemoryReport(**fields)
+
+
+def measure_memory(day: int, part: int, top: int = DEFAULT_TOP) -> MemoryReport:
+    """
+    Solves the given day and part in two fresh interpreters, untraced and traced, and returns its
+    memory report: the peak RSS of the untraced run, with the traced peak and sites of the traced one.
+    """
+    untraced = _measure_in_interpreter(day, part, top, traced=False)
+    return _measure_in_interpreter(day, part, top, traced=True)._replace(peak_rss=untraced.peak_rss)
+
+
+def measure_all(days: Iterable[int] = DAYS, parts: Iterable[int] = PARTS, top: int = DEFAULT_TOP) -> List[MemoryReport]:
+    return [measure_memory(day, part, top) for day in days for part in parts]
+
+
+def _site_name(site: str) -> str:
+    """Shortens the file of an allocation site, relative to the python directory when it's one of ours."""
+    filename, _, lineno = site.rpartition(":")
+    prefix = str(PYTHON_DIR) + "/"
+    return f"{filename[len(prefix):] if filename.startswith(prefix) else filename}:{lineno}"
+
+
+def format_reports(reports: List[MemoryReport], budget: Optional[int] = None) -> str:
+    """Formats the reports as a text table, with sizes in MiB, followed by the top allocation sites."""
+    header = f"{'day':>3} {'part':>4} {'peak rss':>10} {'traced':>10}  top allocation site"
+    lines = [header, "-" * len(header)]
+    for report in reports:
+        site = ""
+        if report.top_sites:
+            site = f"{_site_name(report.top_sites[0][0])} ({report.top_sites[0][1] / 2 ** 20:.1f})"
+        flag = "  <- over budget" if budget is not None and report.over_budget(budget) else ""
+        lines.append(
+            f"{report.day:>3} {report.part:>4} {report.peak_rss / 2 ** 20:>10.1f} "
+            f"{report.traced_peak / 2 ** 20:>10.1f}  {site}{flag}"
+        )
+
+    for report in reports:
+        if len(report.top_sites) > 1:
+            lines.extend(["", f"Day {report.day} part {report.part}:"])
+            lines.extend(f"{size / 2 ** 20:>10.2f}  {_site_name(site)}" for site, size in report.top_sites)
+    return "\n".join(lines)
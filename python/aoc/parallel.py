@@ -0,0 +1,114 @@
+"""
+Running day / part solutions concurrently on a pool of worker processes.
+
+The pool holds one worker per core and workers are reused from one job to the next, so each of
+them imports numpy & co. (and the solution modules) at most once. Jobs are submitted longest
+first according to the timings of the previous run (longest-processing-time ordering), which
+keeps a long job from being started last while the other workers sit idle. Jobs without a
+previous timing are assumed to be long and go first. Exceptions raised by a solution don't
+stop the run: they are reported with the other results.
+"""
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aoc.cache import AnswerCache
+from aoc.limits import Limits
+from aoc.runner import Timing, format_table, run_solution
+from aoc.solutions import DAYS, PARTS, PYTHON_DIR
+
+DEFAULT_TIMINGS_FILE = PYTHON_DIR / ".cache" / "timings.json"
+
+
+class ParallelReport(NamedTuple):
+    """Timings of all jobs (sorted by day and part) and the wall time of the whole run, in seconds."""
+
+    timings: List[Timing]
+    wall_time: float
+    workers: int
+
+    @property
+    def errors(self) -> List[Timing]:
+        return [timing for timing in self.timings if timing.error is not None]
+
+    @property
+    def speedup(self) -> float:
+        """Sum of the jobs' times over the wall time of the run."""
+        return sum(timing.total_time for timing in self.timings) / self.wall_time
+
+
+def load_previous_timings(timings_file: Path = DEFAULT_TIMINGS_FILE) -> Dict[Tuple[int, int], float]:
+    """Returns the total time of each (day, part) from the last run, empty if there was none."""
+    try:
+        saved = json.loads(Path(timings_file).read_text())
+    except (OSError, ValueError):
+        return {}
+    return {tuple(map(int, job.split("."))): total for job, total in saved.items()}
+
+
+def save_timings(timings: List[Timing], timings_file: Path = DEFAULT_TIMINGS_FILE) -> None:
+    """Saves the total time of each (day, part), updating those from previous runs. Cached runs are skipped."""
+    saved = {f"{day}.{part}": total for (day, part), total in load_previous_timings(timings_file).items()}
+    saved.update({f"{t.day}.{t.part}": t.total_time for t in timings if not t.cached and t.error is None})
+    Path(timings_file).parent.mkdir(parents=True, exist_ok=True)
+    Path(timings_file).write_text(json.dumps(saved, indent=2))
+
+
+def schedule(jobs: Iterable[Tuple[int, int]], previous_timings: Dict[Tuple[int, int], float]) -> List[Tuple[int, int]]:
+    """Orders jobs longest first according to previous timings, the ones never timed before going first."""
+    return sorted(jobs, key=lambda job: previous_timings.get(job, float("inf")), reverse=True)
+
+
+def _solve(
+    day: int,
+    part: int,
+    inputfile: Optional[Path],
+    cache: Optional[AnswerCache],
+    sidecars: bool = False,
+    limits: Optional[Limits] = None,
+) -> Timing:
+    """Runs in a worker: solves and times the job, turning any exception into a reported error."""
+    start = time.perf_counter()
+    try:
+        return run_solution(day, part, inputfile, cache, sidecars, limits)
+    except Exception:
+        return Timing(day, part, None, 0.0, 0.0, time.perf_counter() - start, error=traceback.format_exc())
+
+
+def run_parallel(
+    days: Iterable[int] = DAYS,
+    parts: Iterable[int] = PARTS,
+    workers: Optional[int] = None,
+    cache: Optional[AnswerCache] = None,
+    timings_file: Path = DEFAULT_TIMINGS_FILE,
+    sidecars: bool = False,
+    limits: Optional[Limits] = None,
+) -> ParallelReport:
+    """
+    Runs all requested days and parts on a pool of `workers` processes (one per core by default),
+    longest jobs first, and saves their timings to order the next run.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = schedule([(day, part) for day in days for part in parts], load_previous_timings(timings_file))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_solve, day, part, None, cache, sidecars, limits) for day, part in jobs]
+        timings = [future.result() for future in futures]
+    wall_time = time.perf_counter() - start
+
+    save_timings(timings, timings_file)
+    return ParallelReport(sorted(timings, key=lambda timing: (timing.day, timing.part)), wall_time, workers)
+
+
+def format_report(report: ParallelReport) -> str:
+    """Formats the report as the timings table, followed by the wall time and parallel speedup."""
+    summary = (
+        f"\n{len(report.timings)} jobs on {report.workers} workers in {1e3 * report.wall_time:.2f} ms "
+        f"(speedup {report.speedup:.2f}x), {len(report.errors)} errors"
+    )
+    return format_table(report.timings) + summary
@@ -0,0 +1,228 @@
+"""
+Sampling profiles of the solutions, written as flamegraphs.
+
+A day / part is parsed and solved again and again until it has run for some minimum time (short
+solutions would only get a handful of samples otherwise), while a background thread samples the
+stack of the main thread at a fixed interval. Sampling does not slow the solution down the way
+tracing every call does, so the profile shows where the time goes in the uninstrumented code:
+the set rebuilds of day 12's `find_paths`, or the time spent under scipy's `dijkstra` in day 15.
+
+Frames are named after their function, file and line, so that the time spent in a NumPy or SciPy
+call shows as the line of the solution making it. The in-process sampler only sees Python frames,
+and a thread holding the GIL delays the samples: the switch interval is lowered to the sampling
+interval for the duration of the profile. `record_with_py_spy` records the profile with py-spy
+instead (an optional dependency), from outside of a fresh interpreter and with the native frames of
+the compiled libraries.
+
+Profiles are written in the collapsed stack format (one `root;...;leaf count` line per stack, read
+by flamegraph.pl, speedscope and most flamegraph tools) or as a speedscope JSON file, to be opened
+in https://www.speedscope.app.
+"""
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from aoc.solutions import PYTHON_DIR, default_input, load_solution
+
+FORMATS = ("collapsed", "speedscope")
+DEFAULT_INTERVAL = 0.001  # seconds between two samples
+DEFAULT_MIN_TIME = 1.0  # seconds of solving to profile, at least one run
+DEFAULT_TOP = 10  # functions listed in the summary
+_PROBE = """
+import sys
+sys.path.insert(0, {python_dir!r})
+from pathlib import Path
+from aoc.profiling import solve_repeatedly
+solve_repeatedly({day}, {part}, Path({inputfile!r}), {min_time})
+"""
+
+Frame = Tuple[str, str, int]  # function, file relative to the python directory when it's one of ours, line
+
+
+class Profile(NamedTuple):
+    """Samples of the stacks (root first) of a day / part, solved `runs` times in `duration` seconds."""
+
+    day: int
+    part: int
+    interval: float
+    runs: int
+    duration: float
+    stacks: Dict[Tuple[Frame, ...], int]
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+
+def _relative_file(filename: str) -> str:
+    prefix = str(PYTHON_DIR) + "/"
+    return filename[len(prefix) :] if filename.startswith(prefix) else filename
+
+
+def _frame_label(frame: Frame, lines: bool = True) -> str:
+    function, filename, lineno = frame
+    return f"{function} ({filename}:{lineno})" if lines else f"{function} ({filename})"
+
+
+def solve_repeatedly(day: int, part: int, inputfile: Path, min_time: float = DEFAULT_MIN_TIME) -> int:
+    """Parses and solves the day / part until `min_time` seconds have passed, returns the number of runs."""
+    module = load_solution(day, part)
+    solve = getattr(module, f"part{part}")
+    runs, start = 0, time.perf_counter()
+    while runs == 0 or time.perf_counter() - start < min_time:
+        solve(module.parse(inputfile))
+        runs += 1
+    return runs
+
+
+class _Sampler:
+    """Background thread sampling the stack of a thread, from the frames called by `solve_repeatedly`."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.stacks: Counter = Counter()
+        self._thread_id = thread_id
+        self._interval = interval
+        self._root = solve_repeatedly.__code__
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.sample()
+
+    def sample(self) -> None:
+        frame: Optional[FrameType] = sys._current_frames().get(self._thread_id)
+        stack = []
+        while frame is not None and frame.f_code is not self._root:
+            code = frame.f_code
+            stack.append((code.co_qualname, _relative_file(code.co_filename), frame.f_lineno))
+            frame = frame.f_back
+        if frame is not None and stack:  # within a run, not between two of them
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def __enter__(self) -> "_Sampler":
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self._interval)  # so that the sampler gets the GIL on time
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+
+def profile_in_process(
+    day: int,
+    part: int,
+    inputfile: Optional[Path] = None,
+    interval: float = DEFAULT_INTERVAL,
+    min_time: float = DEFAULT_MIN_TIME,
+    warmup: bool = False,
+) -> Profile:
+    """
+    Samples the stacks of the given day and part solved in the current process. With `warmup`, it
+    is solved once before sampling, leaving out the libraries imported on first use and the kernels
+    compiled on their first call.
+    """
+    inputfile = Path(inputfile) if inputfile is not None else default_input(day)
+    load_solution(day, part)  # imports are not what we are after here, see aoc.importtime
+    if warmup:
+        solve_repeatedly(day, part, inputfile, 0)
+    start = time.perf_counter()
+    with _Sampler(threading.get_ident(), interval) as sampler:
+        runs = solve_repeatedly(day, part, inputfile, min_time)
+    return Profile(day, part, interval, runs, time.perf_counter() - start, dict(sampler.stacks))
+
+
+def record_with_py_spy(
+    day: int,
+    part: int,
+    output: Path,
+    output_format: str = "collapsed",
+    inputfile: Optional[Path] = None,
+    interval: float = DEFAULT_INTERVAL,
+    min_time: float = DEFAULT_MIN_TIME,
+) -> None:
+    """Records the profile of the day and part solved in a fresh interpreter with py-spy, native frames included."""
+    py_spy = shutil.which("py-spy")
+    if py_spy is None:
+        raise RuntimeError("py-spy is not installed, it is needed for native frames (pip install py-spy)")
+    inputfile = Path(inputfile) if inputfile is not None else default_input(day)
+    probe = _PROBE.format(
+        python_dir=str(PYTHON_DIR), day=day, part=part, inputfile=str(inputfile.resolve()), min_time=min_time
+    )
+    command = [py_spy, "record", "--native", "--rate", str(round(1 / interval)), "--output", str(output)]
+    command += ["--format", "raw" if output_format == "collapsed" else "speedscope", "--", sys.executable, "-c", probe]
+    subprocess.run(command, check=True)
+
+
+def write_collapsed(profile: Profile, output: Path, lines: bool = True) -> None:
+    """Writes the stacks in the collapsed format, one `root;...;leaf count` line per stack."""
+    counts = Counter()
+    for stack, count in profile.stacks.items():
+        counts[";".join(_frame_label(frame, lines) for frame in stack)] += count
+    output.write_text("".join(f"{stack} {count}\n" for stack, count in sorted(counts.items())))
+
+
+def write_speedscope(profile: Profile, output: Path, lines: bool = True) -> None:
+    """Writes the stacks as a sampled profile in speedscope's JSON format, weighted in seconds."""
+    frames: Dict[Tuple, int] = {}
+    samples = []
+    for stack in profile.stacks:
+        keys = [frame if lines else frame[:2] for frame in stack]
+        samples.append([frames.setdefault(key, len(frames)) for key in keys])
+    weight = profile.duration / profile.samples if profile.samples else profile.interval
+    name = f"day {profile.day} part {profile.part}"
+    document = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": [dict(zip(("name", "file", "line"), key)) for key in frames]},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": profile.duration,
+                "samples": samples,
+                "weights": [count * weight for count in profile.stacks.values()],
+            }
+        ],
+        "name": name,
+        "exporter": "aoc.profiling",
+    }
+    output.write_text(json.dumps(document))
+
+
+def write_profile(profile: Profile, output: Path, output_format: str = "collapsed", lines: bool = True) -> None:
+    if output_format not in FORMATS:
+        raise ValueError(f"unknown format {output_format!r}, expected one of {', '.join(FORMATS)}")
+    writer = write_collapsed if output_format == "collapsed" else write_speedscope
+    writer(profile, output, lines)
+
+
+def format_summary(profile: Profile, top: int = DEFAULT_TOP) -> str:
+    """Formats the share of samples of the top functions, by self time (on top of the stack) and total time."""
+    self_samples, total_samples = Counter(), Counter()
+    for stack, count in profile.stacks.items():
+        self_samples[stack[-1][:2]] += count
+        for function in {frame[:2] for frame in stack}:  # once per stack, for recursive functions
+            total_samples[function] += count
+
+    lines = [
+        f"Day {profile.day} part {profile.part}: {profile.samples} samples over {profile.runs} runs "
+        f"in {profile.duration:.2f} s ({profile.samples / profile.duration:.0f} per second)"
+    ]
+    for title, counts in (("self", self_samples), ("total", total_samples)):
+        lines.extend(["", f"{title:>7}  function"])
+        for function, count in counts.most_common(top):
+            name, filename = function
+            lines.append(f"{100 * count / max(profile.samples, 1):>6.1f}%  {name} ({filename})")
+    return "\n".join(lines)
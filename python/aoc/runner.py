@@ -0,0 +1,126 @@
+"""
+Running solutions in-process and timing each of their stages: importing the module, parsing
+the input and computing the answer.
+"""
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from aoc.cache import AnswerCache, cache_key
+from aoc.limits import LimitExceeded, Limits, enforce_limits
+from aoc.solutions import DAYS, PARTS, default_input, load_solution
+from aoc.tracing import span
+
+
+class Timing(NamedTuple):
+    """
+    Answer and wall times (in seconds) of the stages of a single day / part run. Answers found in
+    the cache are flagged, and the time spent looking them up is counted as compute time. Runs
+    which failed hold the formatted traceback in `error` instead of an answer.
+    """
+
+    day: int
+    part: int
+    answer: Any
+    import_time: float
+    parse_time: float
+    compute_time: float
+    cached: bool = False
+    error: Optional[str] = None
+
+    @property
+    def total_time(self) -> float:
+        return self.import_time + self.parse_time + self.compute_time
+
+
+def run_solution(
+    day: int,
+    part: int,
+    inputfile: Optional[Path] = None,
+    cache: Optional[AnswerCache] = None,
+    sidecars: bool = False,
+    limits: Optional[Limits] = None,
+) -> Timing:
+    """
+    Imports, parses and solves the given day and part, timing each stage. If a cache is given, the
+    answer is looked up there first, and stored there after solving if it wasn't found. With
+    `sidecars`, the parsed input is loaded from its binary sidecar when possible, see aoc.sidecars.
+    Parsing and solving going over the `limits` are cancelled and reported as errors, see aoc.limits.
+    """
+    inputfile = Path(inputfile) if inputfile is not None else default_input(day)
+
+    if cache is not None:
+        start = time.perf_counter()
+        key = cache_key(day, part, inputfile)
+        answer = cache.get(key)
+        if answer is not None:
+            return Timing(day, part, answer, 0.0, 0.0, time.perf_counter() - start, cached=True)
+
+    name = f"day_{day:02d}.part{part}"  # spans of the stages, recorded if tracing is active
+    start = time.perf_counter()
+    with span(f"{name}.import"):
+        module = load_solution(day, part)  # this is free if it has already been imported
+    imported, parsed = time.perf_counter(), None
+    try:
+        with enforce_limits(limits, f"day {day} part {part}"):
+            with span(f"{name}.parse"):
+                if sidecars:
+                    from aoc.sidecars import parse_with_sidecar  # imports numpy
+
+                    parsed_input = parse_with_sidecar(day, part, inputfile)
+                else:
+                    parsed_input = module.parse(inputfile)
+            parsed = time.perf_counter()
+            with span(f"{name}.compute"):
+                answer = getattr(module, f"part{part}")(parsed_input)
+    except LimitExceeded as error:  # report the time spent until it was cancelled, with its progress
+        stopped = time.perf_counter()
+        parse_time = (parsed or stopped) - imported
+        compute_time = stopped - parsed if parsed is not None else 0.0
+        return Timing(day, part, None, imported - start, parse_time, compute_time, error=f"LimitExceeded: {error}")
+    computed = time.perf_counter()
+
+    if cache is not None:
+        cache.put(key, answer)
+    return Timing(day, part, answer, imported - start, parsed - imported, computed - parsed)
+
+
+def run_all(
+    days: Iterable[int] = DAYS,
+    parts: Iterable[int] = PARTS,
+    cache: Optional[AnswerCache] = None,
+    sidecars: bool = False,
+    limits: Optional[Limits] = None,
+) -> List[Timing]:
+    """Runs all the requested days and parts in turn, on their shipped inputs."""
+    return [run_solution(day, part, cache=cache, sidecars=sidecars, limits=limits) for day in days for part in parts]
+
+
+def format_table(timings: List[Timing]) -> str:
+    """Formats the timings as a text table, with times in milliseconds."""
+    header = f"{'day':>3} {'part':>4} {'import':>10} {'parse':>10} {'compute':>10} {'total':>10}  answer"
+    lines = [header, "-" * len(header)]
+    multiline_answers = []
+
+    for timing in timings:
+        answer = str(timing.answer)
+        if timing.error is not None:  # show the exception in the table and the full traceback below it
+            multiline_answers.append((timing, timing.error))
+            answer = "ERROR: " + timing.error.strip().splitlines()[-1]
+        elif "\n" in answer:  # answers drawn as text (day 13 part 2) are displayed below the table
+            multiline_answers.append((timing, answer))
+            answer = "(see below)"
+        if timing.cached:
+            answer += " [cached]"
+        lines.append(
+            f"{timing.day:>3} {timing.part:>4} {1e3 * timing.import_time:>10.2f} {1e3 * timing.parse_time:>10.2f} "
+            f"{1e3 * timing.compute_time:>10.2f} {1e3 * timing.total_time:>10.2f}  {answer}"
+        )
+
+    total = sum(timing.total_time for timing in timings)
+    lines.append("-" * len(header))
+    lines.append(f"{'all':>8} {'':>10} {'':>10} {'':>10} {1e3 * total:>10.2f}")
+
+    for timing, answer in multiline_answers:
+        lines.extend(["", f"Day {timing.day} part {timing.part}:", answer])
+    return "\n".join(lines)
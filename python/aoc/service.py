@@ -0,0 +1,283 @@
+"""
+Local solve service: a long-running asyncio server answering (day, part, input) requests.
+
+The server speaks a minimal HTTP/1.1 (keep-alive, JSON bodies) on a TCP port or a Unix socket:
+
+    POST /solve   {"day": 9, "part": 2, "input": "2199943210\n..."}  or  {..., "inputfile": "/path"}
+    GET  /health  GET /stats
+
+Requests are solved on a pool of worker processes which are warmed up when the server starts:
+each of them imports the heavy libraries and every solution module before the first request, so
+that answering only costs parsing and computing. Answers are kept in a bounded in-memory cache
+(least recently used entries are dropped first), keyed by day, part and the hash of the input.
+Identical requests arriving while the first one is still being solved are coalesced: they all
+wait for the same computation instead of starting new ones.
+
+The service is meant to be local: requests may name input files on the server's filesystem.
+"""
+import asyncio
+import hashlib
+import http.client
+import importlib
+import json
+import os
+import signal
+import socket
+import tempfile
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from aoc.cache import file_digest
+from aoc.parallel import _solve
+from aoc.runner import Timing
+from aoc.solutions import DAYS, PARTS, load_solution
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8021
+DEFAULT_CACHE_ENTRIES = 1024
+MAX_REQUEST_BYTES = 2 ** 26  # bigger inputs should be sent by path
+WARM_IMPORTS = ("numpy", "pandas", "scipy.sparse.csgraph")  # imported by the solutions, some of them lazily
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}
+
+
+def _warm_up() -> None:
+    """Runs once in each worker process when it starts: imports the heavy libraries and all solutions."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is for the server, which shuts the pool down
+    for name in WARM_IMPORTS:
+        importlib.import_module(name)
+    for day in DAYS:
+        for part in PARTS:
+            load_solution(day, part)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+class BadRequest(Exception):
+    """Raised for requests the service can't answer, reported with a 400 status."""
+
+
+class LRUAnswers:
+    """Bounded in-memory cache of the timings of solved requests, dropping the least recently used first."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, int, str], Timing]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[int, int, str]) -> Optional[Timing]:
+        timing = self._entries.get(key)
+        if timing is not None:
+            self._entries.move_to_end(key)
+        return timing
+
+    def put(self, key: Tuple[int, int, str], timing: Timing) -> None:
+        self._entries[key] = timing
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SolveService:
+    """Solves requests on a pool of warm worker processes, with coalescing and an in-memory cache."""
+
+    def __init__(self, workers: Optional[int] = None, cache_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_warm_up)
+        self.answers = LRUAnswers(cache_entries)
+        self.in_flight: Dict[Tuple[int, int, str], asyncio.Future] = {}
+        self.stats = Counter()
+        self._spool = tempfile.TemporaryDirectory(prefix="aoc-service-")  # inputs received as text
+
+    async def warm_up(self) -> None:
+        """Starts all workers and waits until they have imported everything."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _worker_pid) for _ in range(self.workers)))
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+        self._spool.cleanup()
+
+    async def _compute(self, key: Tuple[int, int, str], text: Optional[str], inputfile: Optional[Path]) -> Timing:
+        day, part, digest = key
+        if text is not None:  # solutions parse files: write the input in the spool directory for the time being
+            inputfile = Path(self._spool.name) / f"{digest}-{uuid.uuid4().hex}.txt"
+            inputfile.write_text(text)
+        try:
+            timing = await asyncio.get_running_loop().run_in_executor(self.pool, _solve, day, part, inputfile, None)
+        finally:
+            if text is not None:
+                inputfile.unlink()
+        self.stats["computed"] += 1
+        if timing.error is None:
+            self.answers.put(key, timing)
+        return timing
+
+    async def solve(
+        self, day: int, part: int, text: Optional[str] = None, inputfile: Optional[Path] = None
+    ) -> Tuple[Timing, str]:
+        """Returns the timing of the request and how it was answered: 'cached', 'coalesced' or 'computed'."""
+        if day not in DAYS or part not in PARTS:
+            raise BadRequest(f"no solution for day {day} part {part}")
+        if (text is None) == (inputfile is None):
+            raise BadRequest("exactly one of 'input' and 'inputfile' is needed")
+        if inputfile is not None and not Path(inputfile).is_file():
+            raise BadRequest(f"no such input file: {inputfile}")
+
+        self.stats["requests"] += 1
+        digest = hashlib.sha256(text.encode()).hexdigest() if text is not None else file_digest(inputfile)
+        key = (day, part, digest)
+
+        timing = self.answers.get(key)
+        if timing is not None:
+            self.stats["cached"] += 1
+            return timing, "cached"
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, text, inputfile))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            how = "computed"
+        else:
+            self.stats["coalesced"] += 1
+            how = "coalesced"
+        # Shielded, so that a client going away doesn't cancel the computation others may be waiting for
+        return await asyncio.shield(task), how
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "workers": self.workers}
+        if method == "GET" and path == "/stats":
+            return 200, {**self.stats, "cache_entries": len(self.answers), "in_flight": len(self.in_flight)}
+        if method != "POST" or path != "/solve":
+            return 404, {"error": f"no route for {method} {path}"}
+
+        try:
+            request = json.loads(body)
+            day, part = int(request["day"]), int(request["part"])
+        except (ValueError, KeyError, TypeError):
+            raise BadRequest("expected a JSON object with 'day', 'part' and 'input' or 'inputfile'")
+        for field in ("input", "inputfile"):
+            if not isinstance(request.get(field, ""), (str, type(None))):
+                raise BadRequest(f"'{field}' should be a string, got {type(request[field]).__name__}")
+        inputfile = Path(request["inputfile"]) if request.get("inputfile") is not None else None
+        timing, how = await self.solve(day, part, request.get("input"), inputfile)
+        return 200, {
+            "day": day,
+            "part": part,
+            "answer": timing.answer,
+            "error": timing.error,
+            "how": how,
+            "parse_time": timing.parse_time,
+            "compute_time": timing.compute_time,
+        }
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the requests of a connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if length > MAX_REQUEST_BYTES:
+                    status, payload, keep_alive = 413, {"error": "request too large, send the input by path"}, False
+                else:
+                    body = await reader.readexactly(length)
+                    try:
+                        status, payload = await self._route(method, path, body)
+                    except BadRequest as error:
+                        status, payload = 400, {"error": str(error)}
+
+                content = json.dumps(payload, default=str).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):  # client gone, or garbage
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[Path] = None,
+    workers: Optional[int] = None,
+    cache_entries: int = DEFAULT_CACHE_ENTRIES,
+) -> None:
+    """Warms up the workers, then serves requests until interrupted or terminated."""
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+    service = SolveService(workers, cache_entries)
+    try:
+        await service.warm_up()
+        if unix_socket is not None:
+            server = await asyncio.start_unix_server(service.handle_connection, path=str(unix_socket))
+            address = str(unix_socket)
+        else:
+            server = await asyncio.start_server(service.handle_connection, host, port)
+            address = f"http://{host}:{port}"
+        print(f"Serving on {address} with {service.workers} warm workers", flush=True)
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+        if unix_socket is not None:
+            Path(unix_socket).unlink(missing_ok=True)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket."""
+
+    def __init__(self, path: Path, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = str(path)
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def request_answer(
+    day: int,
+    part: int,
+    text: Optional[str] = None,
+    inputfile: Optional[Path] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: Optional[Path] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Client side: asks a running service for an answer, returns the decoded response."""
+    if unix_socket is not None:
+        connection = _UnixHTTPConnection(unix_socket, timeout)
+    else:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    body = {"day": day, "part": part, "input": text, "inputfile": str(inputfile) if inputfile else None}
+    try:
+        connection.request("POST", "/solve", json.dumps(body), {"Content-Type": "application/json"})
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
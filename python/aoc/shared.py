@@ -0,0 +1,213 @@
+"""
+Distributing large parsed inputs to worker processes through shared memory, each worker being handed
+zero-copy views of them and the shard it owns.
+
+Sending a NumPy array to a worker of a process pool pickles it, so every task gets its own copy of
+the whole input: the board stack of day 4, the vents of day 5, the map of day 15. Within a
+`SharedArrays` block, arrays are copied once into `multiprocessing.shared_memory` segments, and
+tasks only carry the names, shapes and dtypes of the segments (`SharedArray`), which the workers map
+as NumPy views, along with their shard (a range of boards, a band of rows, a tile...). Outputs can be
+shared as well: workers write their shard of a shared array inplace, and the parent reads the whole
+of it without any copy either.
+
+Segments belong to the process which created them. They are unlinked when the block exits, whether
+it completes, raises, or a worker crashed (the pool is then broken, and the block raises). Workers
+only map the segments they are given, never unlink them, and unmap them after each task, so a
+worker dying holds nothing. Should the parent itself be killed before unwinding, its workers exit
+as soon as they notice, and the resource tracker process of multiprocessing, which they all share,
+then unlinks the segments left behind.
+
+Solutions only take their sharded paths with more than one worker, which there are not by default.
+The number of workers is set per run with `set_workers` (or `use_workers` for a block), or with the
+AOC_WORKERS environment variable, 0 meaning one per core: `AOC_WORKERS=4 python second.py`. Tasks
+are pickled by reference, so the functions mapped have to be module level ones.
+
+This module does not import multiprocessing at the top, as solutions import it whether they use
+workers or not.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+ENVIRONMENT_VARIABLE = "AOC_WORKERS"
+PARENT_POLL_INTERVAL = 1.0  # seconds between two checks by the workers that their parent is still there
+
+
+def _from_environment() -> int:
+    value = os.environ.get(ENVIRONMENT_VARIABLE)
+    return int(value) if value else 1
+
+
+_workers = _from_environment()
+
+
+def get_workers() -> int:
+    """Returns the number of worker processes the solutions can use, one per core if it was set to 0."""
+    return _workers or os.cpu_count() or 1
+
+
+def set_workers(workers: int) -> int:
+    """
+    Sets the number of worker processes (1 for none, 0 for one per core), exported to the environment
+    for the processes to come, and returns the previous one.
+    """
+    global _workers
+    if workers < 0:
+        raise ValueError(f"the number of workers can't be negative, got {workers}")
+    previous, _workers = _workers, workers
+    os.environ[ENVIRONMENT_VARIABLE] = str(workers)
+    return previous
+
+
+@contextmanager
+def use_workers(workers: int) -> Iterator[None]:
+    """Sets the number of worker processes for the duration of the block."""
+    previous = set_workers(workers)
+    try:
+        yield
+    finally:
+        set_workers(previous)
+
+
+class SharedArray(NamedTuple):
+    """What a worker needs to map an array of a shared memory segment: its name, shape and dtype."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def split(length: int, shards: int) -> List[slice]:
+    """Splits a range of `length` items into at most `shards` contiguous slices of about the same length."""
+    bounds = np.linspace(0, length, min(shards, length) + 1).astype(int).tolist() if length else [0]
+    return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _attach(value: Any, segments: List["shared_memory.SharedMemory"]) -> Any:
+    """Returns the value with the shared arrays it holds (in tuples and lists too) mapped as views."""
+    from multiprocessing import shared_memory
+
+    if isinstance(value, SharedArray):
+        segment = shared_memory.SharedMemory(value.name)
+        segments.append(segment)
+        return np.ndarray(value.shape, dtype=value.dtype, buffer=segment.buf)
+    if isinstance(value, (tuple, list)) and not hasattr(value, "_fields"):
+        return type(value)(_attach(item, segments) for item in value)
+    return value
+
+
+def _watch_parent(parent: int) -> None:
+    """
+    Runs in a worker when it starts: exits it as soon as its parent is gone. Workers of a killed parent
+    would otherwise wait for tasks forever, and keep the resource tracker from unlinking its segments.
+    """
+
+    def watch() -> None:
+        while os.getppid() == parent:
+            time.sleep(PARENT_POLL_INTERVAL)
+        os._exit(1)
+
+    threading.Thread(target=watch, name="aoc-parent-watch", daemon=True).start()
+
+
+def _run_task(function: Callable[..., Any], shard: Any, arguments: Dict[str, Any]) -> Any:
+    """Runs in a worker: maps the shared arrays of the arguments, calls the function on the shard and unmaps them."""
+    segments: List["shared_memory.SharedMemory"] = []
+    try:
+        views = {name: _attach(value, segments) for name, value in arguments.items()}
+        result = function(shard, **views)
+        del views
+        return result
+    finally:
+        for segment in segments:
+            try:
+                segment.close()
+            except BufferError:  # the function kept a view somewhere, it goes when the worker does
+                pass
+
+
+class SharedArrays:
+    """
+    Shared memory segments holding arrays for the duration of a block, and the pool of workers the
+    tasks using them are mapped on. Everything is released when the block exits.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers if workers is not None else get_workers()
+        self._segments: Dict[str, "shared_memory.SharedMemory"] = {}
+        self._pool: Optional["ProcessPoolExecutor"] = None
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def zeros(self, shape: Tuple[int, ...], dtype: Any) -> SharedArray:
+        """Returns a new shared array of zeros, for instance for the workers to write their shard of an output."""
+        from multiprocessing import shared_memory
+
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)  # segments can't be empty
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        self._segments[segment.name] = segment
+        shared = SharedArray(segment.name, tuple(int(length) for length in shape), dtype.str)
+        self.view(shared).fill(0)  # already zeros on Linux, not necessarily elsewhere
+        return shared
+
+    def share(self, array: np.ndarray) -> SharedArray:
+        """Copies the array into a new segment and returns it as a shared array."""
+        shared = self.zeros(array.shape, array.dtype)
+        self.view(shared)[...] = array
+        return shared
+
+    def view(self, shared: SharedArray) -> np.ndarray:
+        """Returns the array of a segment of this block, without copying it. It can't be used past the block."""
+        return np.ndarray(shared.shape, dtype=shared.dtype, buffer=self._segments[shared.name].buf)
+
+    def map(self, function: Callable[..., Any], shards: Iterable[Any], **arguments: Any) -> List[Any]:
+        """
+        Calls `function(shard, **arguments)` for each shard on the pool of workers, the shared arrays
+        in the arguments being mapped as views, and returns the results in the order of the shards.
+        With a single worker, the calls are made in this process, on the views of the segments.
+        """
+        shards = list(shards)
+        if self.workers <= 1:
+            views = {name: self._view_all(value) for name, value in arguments.items()}
+            return [function(shard, **views) for shard in shards]
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(
+                max_workers=min(self.workers, max(len(shards), 1)), initializer=_watch_parent, initargs=(os.getpid(),)
+            )
+        futures = [self._pool.submit(_run_task, function, shard, arguments) for shard in shards]
+        return [future.result() for future in futures]
+
+    def _view_all(self, value: Any) -> Any:
+        if isinstance(value, SharedArray):
+            return self.view(value)
+        if isinstance(value, (tuple, list)) and not hasattr(value, "_fields"):
+            return type(value)(self._view_all(item) for item in value)
+        return value
+
+    def close(self) -> None:
+        """Stops the workers (waiting for the running tasks), and unmaps and unlinks every segment."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        for segment in self._segments.values():
+            try:
+                segment.close()
+            except BufferError:  # a view is still alive in this process, the mapping goes with it
+                pass
+            segment.unlink()
+        self._segments.clear()
@@ -0,0 +1,142 @@
+"""
+Binary sidecars of the parsed inputs, so that repeated runs skip text parsing.
+
+The first time a day's input is parsed through `parse_with_sidecar`, the parsed structure is saved
+as arrays in a sidecar file next to the input: `inputs.txt` parsed by `day_09/first.py` is saved
+as `inputs.first.parsed.npz`. Later runs load the arrays memory-mapped instead of parsing again,
+so that large inputs load in milliseconds and only the pages actually used are read.
+
+Sidecars are uncompressed `.npz` archives: each array is a plain `.npy` file stored in the zip,
+which `np.load` can read, and which is memory-mapped here at its offset in the archive. Memory-
+mapped arrays are read-only, which holds as solutions leave their parsed input untouched.
+
+A sidecar is only used if it was written from the same input (by hash), by the same parser (by
+hash of the source file of its module) and with the current `SIDECAR_VERSION`. The
+input is only hashed again if its size or modification time changed since the sidecar was written.
+
+Parsed inputs which are an array or a tuple of arrays are saved as they are. Other parsers can be
+given two functions in their module: `parsed_to_arrays`, returning a dict of arrays from the
+parsed input, and `parsed_from_arrays`, building the parsed input back from that dict. Days
+without either (strings, dicts...) are parsed as usual.
+"""
+import json
+import os
+import struct
+import sys
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from aoc.cache import file_digest
+from aoc.solutions import load_solution
+
+SIDECAR_VERSION = 1  # bump when the layout of the sidecars changes
+_META = "__meta__"  # name of the JSON metadata in the archive
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")  # zip local file header, followed by the file name and extra field
+
+
+def sidecar_path(inputfile: Path, parser: Callable) -> Path:
+    """Returns the path of the sidecar of the input parsed by the given parse function."""
+    module = parser.__module__.rpartition(".")[2]  # first or second
+    return inputfile.with_name(f"{inputfile.stem}.{module}.parsed.npz")
+
+
+def to_arrays(parser: Callable, parsed: Any) -> Optional[Dict[str, np.ndarray]]:
+    """Returns the parsed input as a dict of arrays, or None if this parser's output can't be saved."""
+    module = sys.modules[parser.__module__]
+    if hasattr(module, "parsed_to_arrays"):
+        return module.parsed_to_arrays(parsed)
+    if isinstance(parsed, np.ndarray):
+        return {"parsed": parsed}
+    if isinstance(parsed, tuple) and all(isinstance(item, np.ndarray) for item in parsed):
+        return {f"item_{index}": item for index, item in enumerate(parsed)}
+    return None
+
+
+def from_arrays(parser: Callable, arrays: Dict[str, np.ndarray]) -> Any:
+    """Builds the parsed input back from the arrays returned by `to_arrays`."""
+    module = sys.modules[parser.__module__]
+    if hasattr(module, "parsed_from_arrays"):
+        return module.parsed_from_arrays(arrays)
+    if "parsed" in arrays:
+        return arrays["parsed"]
+    return tuple(arrays[f"item_{index}"] for index in range(len(arrays)))
+
+
+def save_sidecar(path: Path, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+    """Writes the arrays and the metadata to an uncompressed .npz archive, atomically."""
+    if any(array.dtype.hasobject for array in arrays.values()):
+        raise TypeError("arrays of Python objects can't be memory-mapped")
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with temporary.open("wb") as f:
+        np.savez(f, **arrays, **{_META: np.array(json.dumps(meta))})
+    os.replace(temporary, path)
+
+
+def _memory_map_member(archive_path: Path, f, info: zipfile.ZipInfo) -> np.ndarray:
+    """Returns the array stored in the archive member as a read-only memory-mapped array."""
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{info.filename} is compressed, it can't be memory-mapped")
+    f.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    name_length, extra_length = header[-2:]
+    f.seek(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)  # start of the .npy file
+
+    version = np.lib.format.read_magic(f)
+    read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+    shape, fortran_order, dtype = read_header(f)
+    if not np.prod(shape, dtype=np.int64):  # empty files can't be memory-mapped
+        return np.empty(shape, dtype=dtype)
+    order = "F" if fortran_order else "C"
+    array = np.memmap(archive_path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order=order)
+    return array.view(np.ndarray)  # plain arrays, the memory map is kept alive as their base
+
+
+def load_sidecar(path: Path) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Returns the metadata and the memory-mapped arrays of a sidecar."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, path.open("rb") as f:
+        for info in archive.infolist():
+            arrays[info.filename[: -len(".npy")]] = _memory_map_member(path, f, info)
+    meta = json.loads(arrays.pop(_META).item())
+    return meta, arrays
+
+
+def _input_stat(inputfile: Path) -> Tuple[int, int]:
+    stat = inputfile.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def parse_with_sidecar(day: int, part: int, inputfile: Path) -> Any:
+    """
+    Returns the parsed input of the given day and part, loaded from its sidecar if it is up to date,
+    or parsed from the text (and then saved to a new sidecar if the parsed structure allows it).
+    """
+    parser = load_solution(day, part).parse
+    path = sidecar_path(inputfile, parser)
+    # Only the module defining the parser is hashed: hashing all the dependencies of a solver takes longer than parsing
+    expected = {"version": SIDECAR_VERSION, "parser": file_digest(Path(sys.modules[parser.__module__].__file__))}
+
+    if path.exists():
+        try:
+            meta, arrays = load_sidecar(path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):  # unreadable, start over
+            meta, arrays = {}, {}
+        if all(meta.get(key) == value for key, value in expected.items()):
+            if meta.get("stat") == list(_input_stat(inputfile)):
+                return from_arrays(parser, arrays)
+            if meta.get("input") == file_digest(inputfile):  # touched but unchanged, don't hash it next time
+                save_sidecar(path, arrays, {**meta, "stat": list(_input_stat(inputfile))})
+                return from_arrays(parser, arrays)
+
+    parsed = parser(inputfile)
+    arrays = to_arrays(parser, parsed)
+    if arrays is not None:
+        meta = {**expected, "input": file_digest(inputfile), "stat": list(_input_stat(inputfile))}
+        try:
+            save_sidecar(path, arrays, meta)
+        except OSError:  # read-only location, no sidecar then
+            pass
+    return parsed
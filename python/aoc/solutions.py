@@ -0,0 +1,80 @@
+"""
+Locating and importing the daily solution modules.
+
+Each day lives in its own `day_XX` directory with a `first.py` and a `second.py` module, which
+are meant to be ran as scripts from that directory. Several `second.py` modules import from
+their `first.py` sibling with `from first import ...`, which only works as a script. Here the
+modules are imported as `day_XX.first` and `day_XX.second`, and `first` is temporarily aliased
+to the right day's module while a `second.py` is imported.
+"""
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import IO, Any, Callable, Optional, Tuple
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent  # the directory holding all day_XX folders
+DAYS = tuple(range(1, 18))
+PARTS = (1, 2)
+PART_MODULES = {1: "first", 2: "second"}
+STREAMING_DAYS = (1, 2, 3, 8, 10)  # days whose parts can also read their input from a stream
+
+
+def day_directory(day: int) -> Path:
+    """Returns the directory holding the solutions for the given day."""
+    return PYTHON_DIR / f"day_{day:02d}"
+
+
+def default_input(day: int) -> Path:
+    """Returns the path to the puzzle input shipped with the given day."""
+    return day_directory(day) / "inputs.txt"
+
+
+def module_name(day: int, part: int) -> str:
+    """Returns the importable name of the module for the given day and part, for instance 'day_09.second'."""
+    return f"day_{day:02d}.{PART_MODULES[part]}"
+
+
+def load_solution(day: int, part: int) -> ModuleType:
+    """Imports (once) and returns the module solving the given day and part."""
+    name = module_name(day, part)
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if str(PYTHON_DIR) not in sys.path:  # the day_XX directories are imported as namespace packages
+        sys.path.insert(0, str(PYTHON_DIR))
+
+    if part == 1:
+        return importlib.import_module(name)
+
+    # The second part may do 'from first import ...', make sure this resolves to the same day's first part
+    first = load_solution(day, 1)
+    previous = sys.modules.get("first")
+    sys.modules["first"] = first
+    try:
+        return importlib.import_module(name)
+    finally:
+        if previous is None:
+            del sys.modules["first"]
+        else:
+            sys.modules["first"] = previous
+
+
+def get_parser(day: int, part: int) -> Callable[[Path], Any]:
+    """Returns the `parse` function of the given day and part."""
+    return load_solution(day, part).parse
+
+
+def get_solver(day: int, part: int) -> Callable[[Any], Any]:
+    """Returns the `part1` or `part2` function of the given day and part."""
+    return getattr(load_solution(day, part), f"part{part}")
+
+
+def get_stream_solver(day: int, part: int) -> Callable[[IO], Any]:
+    """Returns the `part1_stream` or `part2_stream` function of the given day and part, see aoc.streams."""
+    return getattr(load_solution(day, part), f"part{part}_stream")
+
+
+def get_combined_solver(day: int) -> Optional[Callable[[Any], Tuple[Any, Any]]]:
+    """Returns the `both_parts` function of the given day if it has one, see aoc.combined."""
+    return getattr(load_solution(day, 2), "both_parts", None)
@@ -0,0 +1,65 @@
+"""
+Reading inputs from streams (stdin, pipes, any file object) by bounded chunks of whole lines.
+
+Solutions which are per-line reductions expose `partN_stream(stream)` functions built on these
+helpers, which only hold one chunk at a time, so that arbitrarily large inputs can be piped
+through them in constant memory. Chunks are read with `read1` when the stream has it, which
+returns as soon as some data is available: computing starts while the producer is still writing.
+
+This module does not import numpy at the top, as the line-based days don't need it.
+"""
+from typing import IO, TYPE_CHECKING, Iterator, List
+
+if TYPE_CHECKING:
+    import numpy as np
+
+STREAM_CHUNK_SIZE = 2 ** 20  # bytes read at once, chunks may be longer to end on a whole line
+
+
+def iter_chunks(stream: IO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yields the contents of a binary or text stream as bytes, by chunks ending on a newline (but the last one)."""
+    stream = getattr(stream, "buffer", stream)  # read text wrappers such as sys.stdin from their binary buffer
+    read = getattr(stream, "read1", stream.read)
+    remainder = b""
+
+    while True:
+        chunk = read(chunk_size)
+        if isinstance(chunk, str):  # text streams without a buffer, such as io.StringIO
+            chunk = chunk.encode()
+        if not chunk:
+            break
+        chunk = remainder + chunk
+        end = chunk.rfind(b"\n") + 1
+        remainder = chunk[end:]  # the beginning of a line, to be completed by the next chunk
+        if end:
+            yield chunk[:end]
+    if remainder:
+        yield remainder
+
+
+def iter_line_chunks(stream: IO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[List[str]]:
+    """Yields the lines of the stream, without their newlines, by chunks."""
+    for chunk in iter_chunks(stream, chunk_size):
+        yield chunk.decode().splitlines()
+
+
+def iter_int_chunks(stream: IO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator["np.ndarray"]:
+    """Yields the integers of the stream as int64 arrays, by chunks."""
+    import numpy as np
+
+    from aoc.inputs import parse_ints
+
+    for chunk in iter_chunks(stream, chunk_size):
+        yield parse_ints(np.frombuffer(chunk, dtype=np.uint8))
+
+
+def iter_digit_rows(stream: IO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator["np.ndarray"]:
+    """Yields the rows of digits of the stream (all of the same length) as 2D uint8 arrays, by chunks."""
+    import numpy as np
+
+    for chunk in iter_chunks(stream, chunk_size):
+        if not chunk.endswith(b"\n"):  # the last line of the stream
+            chunk += b"\n"
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        width = chunk.index(b"\n")
+        yield data.reshape(-1, width + 1)[:, :width] - ord("0")
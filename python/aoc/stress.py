@@ -0,0 +1,296 @@
+"""
+Stress suite: solves the pathological inputs of aoc.adversarial at growing sizes, recording the
+time, the peak memory and any crash of each run, to measure and track the cliffs of the solutions.
+
+Each day / part / size is solved in a fresh interpreter, as crashes can take the interpreter down
+(stack overflows, the out-of-memory killer) and the peak resident set size is a high-water mark of
+the whole process. It's polled from /proc while the child runs, whatever kills it, and reported by the
+child itself when it gets to (the resource usage of a reaped child would do, if Linux didn't count
+the memory of the parent it was forked from in it).
+Runs are given a time and a memory limit (see aoc.limits), and the address space of the child is
+capped at what it has mapped once the solution is imported, plus the memory limit, so that a huge
+allocation fails with a MemoryError rather than swapping. A child which doesn't come back in time
+despite the limits is killed.
+
+A run ends with one of these outcomes:
+- "ok": solved, with its answer;
+- "limit": cancelled for going over the time or memory limit, with how far it got;
+- "crash": any exception (RecursionError, MemoryError, ValueError...), or the child killed by a signal;
+- "skipped": a smaller size of the same pathology and part already failed, larger ones would too.
+
+Results are written as JSON with the commit they were run on, and `compare_stress` shows how the
+outcomes and times of two runs differ, so that a cliff moving (or appearing) between two commits
+shows up.
+"""
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from aoc.adversarial import PATHOLOGIES, PATHOLOGIES_BY_NAME, Pathology, adversarial_input_path, generate_adversarial
+from aoc.backends import get_backend
+from aoc.benchmarks import _git_revision
+from aoc.generators import DEFAULT_SEED
+from aoc.solutions import PARTS, PYTHON_DIR
+
+DEFAULT_TIME_LIMIT = 10.0  # seconds per run
+DEFAULT_MEMORY_LIMIT = 1000.0  # MiB per run
+START_ALLOWANCE = 30.0  # seconds given to a child to start and import on top of its time limit, before killing it
+POLL_INTERVAL = 0.05  # seconds between two reads of the peak memory of the child
+ANSWER_DIGITS = 100  # answers longer than this are only recorded by their length
+_MARKER = "aoc-stress-report:"
+_PROBE = """
+import sys
+sys.path.insert(0, {python_dir!r})
+from aoc.stress import stress_in_process
+print({marker!r} + stress_in_process({day}, {part}, {inputfile!r}, {time_limit!r}, {memory_limit!r}), flush=True)
+"""
+
+
+class StressResult(NamedTuple):
+    """Outcome of solving a pathological input, with the time spent parsing and solving and the peak RSS in bytes."""
+
+    name: str
+    day: int
+    part: int
+    size: int
+    input_bytes: Optional[int]  # None if it was never generated, all parts having failed at a smaller size
+    outcome: str  # ok, limit, crash or skipped
+    answer: Optional[str] = None
+    time: Optional[float] = None
+    peak_rss: Optional[int] = None
+    error: Optional[str] = None  # what stopped it, for any other outcome than ok
+
+    @property
+    def failed(self) -> bool:
+        return self.outcome in ("limit", "crash")
+
+
+def _address_space() -> int:
+    """Returns the size of the virtual memory of the current process, in bytes."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _high_water_mark(pid: Any = "self") -> int:
+    """Returns the peak resident set size of a process so far, in bytes, 0 once it's gone or without /proc."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return 1024 * int(line.split()[1])  # in kB
+    except OSError:
+        pass
+    return 0
+
+
+def _short_answer(answer: Any) -> str:
+    """Returns the answer as a string, or its length if it's too long to be worth recording."""
+    if isinstance(answer, int) and answer.bit_length() > 4 * ANSWER_DIGITS:  # str() may refuse past 4300 digits
+        return f"<{answer.bit_length()} bits integer>"
+    text = str(answer)
+    return text if len(text) <= ANSWER_DIGITS else f"<{len(text)} characters>"
+
+
+def stress_in_process(day: int, part: int, inputfile: str, time_limit: float, memory_limit: float) -> str:
+    """
+    Solves the given day and part on an input within the limits, in the current process, and returns
+    the outcome, answer, time and error as JSON. Only meant to run in the child of `stress_run`.
+    """
+    import resource
+
+    from aoc.limits import Limits
+    from aoc.runner import run_solution
+    from aoc.solutions import load_solution
+
+    load_solution(day, part)  # imports are not what we are after here, see aoc.importtime
+    try:
+        cap = _address_space() + int(memory_limit * 2 ** 20)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    except (OSError, ValueError):  # no /proc, or a lower hard limit already: the memory limit still applies
+        pass
+
+    start = time.perf_counter()
+    try:
+        timing = run_solution(day, part, inputfile, limits=Limits(time=time_limit, memory=memory_limit))
+    except Exception as error:  # anything is a crash here, the point is to find them
+        message = str(error).splitlines()[0] if str(error) else ""
+        elapsed, error = time.perf_counter() - start, f"{type(error).__name__}: {message}"
+        return json.dumps({"outcome": "crash", "time": elapsed, "peak_rss": _high_water_mark(), "error": error})
+    report = {"time": timing.parse_time + timing.compute_time, "peak_rss": _high_water_mark()}
+    if timing.error is not None:
+        return json.dumps({"outcome": "limit", "error": timing.error, **report})
+    return json.dumps({"outcome": "ok", "answer": _short_answer(timing.answer), **report})
+
+
+def _signal_name(number: int) -> str:
+    try:
+        return signal.Signals(number).name
+    except ValueError:
+        return f"signal {number}"
+
+
+def stress_run(
+    name: str, part: int, size: int, time_limit: float = DEFAULT_TIME_LIMIT, memory_limit: float = DEFAULT_MEMORY_LIMIT
+) -> StressResult:
+    """Solves a part of the day of a pathology on its input of the given size (generated if needed), in a child."""
+    pathology = PATHOLOGIES_BY_NAME[name]
+    inputfile = adversarial_input_path(name, size)
+    if not inputfile.exists():
+        generate_adversarial(name, size)
+    probe = _PROBE.format(
+        python_dir=str(PYTHON_DIR),
+        marker=_MARKER,
+        day=pathology.day,
+        part=part,
+        inputfile=str(inputfile),
+        time_limit=time_limit,
+        memory_limit=memory_limit,
+    )
+
+    with tempfile.TemporaryFile("w+") as output, tempfile.TemporaryFile("w+") as errors:
+        process = subprocess.Popen([sys.executable, "-c", probe], stdout=output, stderr=errors, cwd=PYTHON_DIR)
+        deadline = time.monotonic() + time_limit + START_ALLOWANCE
+        peak_rss, killed = 0, False
+        while process.poll() is None:
+            peak_rss = max(peak_rss, _high_water_mark(process.pid))
+            if time.monotonic() > deadline:
+                process.kill()
+                process.wait()
+                killed = True
+            time.sleep(POLL_INTERVAL)
+        output.seek(0)
+        errors.seek(0)
+        reports = [line for line in output.read().splitlines() if line.startswith(_MARKER)]
+        last_error = next(reversed(errors.read().strip().splitlines()), "")
+
+    result = StressResult(name, pathology.day, part, size, inputfile.stat().st_size, "crash", peak_rss=peak_rss)
+    if reports:
+        report = json.loads(reports[0][len(_MARKER) :])
+        return result._replace(**{**report, "peak_rss": max(peak_rss, report["peak_rss"])})
+    if killed:
+        return result._replace(error=f"killed after {time_limit + START_ALLOWANCE:g} s, the limits didn't stop it")
+    if process.returncode < 0:
+        return result._replace(error=f"killed by {_signal_name(-process.returncode)}")
+    return result._replace(error=f"exited with code {process.returncode}: {last_error}")
+
+
+def run_stress(
+    names: Optional[Sequence[str]] = None,
+    parts: Iterable[int] = PARTS,
+    sizes: Optional[Sequence[int]] = None,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    memory_limit: float = DEFAULT_MEMORY_LIMIT,
+    days: Optional[Iterable[int]] = None,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """
+    Runs the requested pathologies (all of them by default, or those of the given days) at their
+    sizes, or the given ones, and returns the results with some run metadata. Past the first size
+    at which a part fails, larger sizes of that part are skipped.
+    """
+    pathologies: List[Pathology] = [PATHOLOGIES_BY_NAME[name] for name in names] if names else PATHOLOGIES
+    if days is not None:
+        pathologies = [pathology for pathology in pathologies if pathology.day in set(days)]
+    parts = list(parts)
+    results = []
+    for pathology in pathologies:
+        failed = set()  # parts which already failed at a smaller size
+        for size in sizes or pathology.sizes:
+            for part in parts:
+                if part in failed:
+                    inputfile = adversarial_input_path(pathology.name, size)
+                    input_bytes = inputfile.stat().st_size if inputfile.exists() else None
+                    result = StressResult(pathology.name, pathology.day, part, size, input_bytes, "skipped")
+                else:
+                    result = stress_run(pathology.name, part, size, time_limit, memory_limit)
+                    if result.failed:
+                        failed.add(part)
+                if verbose:
+                    print(format_stress_line(result), file=sys.stderr, flush=True)
+                results.append(result._asdict())
+    return {
+        "commit": _git_revision(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "backend": get_backend(),
+        "time_limit": time_limit,
+        "memory_limit": memory_limit,
+        "seed": DEFAULT_SEED,
+        "results": results,
+    }
+
+
+def save_stress(results: Dict[str, Any], outputfile: Path) -> None:
+    outputfile.write_text(json.dumps(results, indent=2))
+
+
+def load_stress(inputfile: Path) -> Dict[str, Any]:
+    return json.loads(Path(inputfile).read_text())
+
+
+def _format_size(nbytes: Optional[int]) -> str:
+    if nbytes is None:
+        return ""
+    for unit in ("B", "KiB", "MiB"):
+        if nbytes < 1024:
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} GiB"
+
+
+def format_stress_line(result: StressResult) -> str:
+    elapsed = f"{result.time:.2f}" if result.time is not None else ""
+    details = result.error if result.error is not None else ""
+    return (
+        f"{result.name:<28} {result.part:>4} {result.size:>9} {_format_size(result.input_bytes):>10} "
+        f"{elapsed:>9} {_format_size(result.peak_rss):>10}  {result.outcome:<7} {details}"
+    ).rstrip()
+
+
+def format_stress(results: Dict[str, Any]) -> str:
+    """
+    Formats the results as a text table with times in seconds, followed by the cliffs: the largest
+    size each pathology and part was solved at, and what stopped it at the next one.
+    """
+    header = f"{'pathology':<28} {'part':>4} {'size':>9} {'input':>10} {'time (s)':>9} {'peak rss':>10}  outcome"
+    lines = [header, "-" * len(header)]
+    rows = [StressResult(**result) for result in results["results"]]
+    lines.extend(format_stress_line(result) for result in rows)
+
+    lines.extend(["", "Cliffs:"])
+    for name in dict.fromkeys(result.name for result in rows):
+        for part in sorted({result.part for result in rows if result.name == name}):
+            runs = [result for result in rows if result.name == name and result.part == part]
+            solved = [result.size for result in runs if result.outcome == "ok"]
+            failure = next((result for result in runs if result.failed), None)
+            reached = f"solved up to size {max(solved)}" if solved else "never solved"
+            stopped = f", {failure.outcome} at size {failure.size}: {failure.error}" if failure is not None else ""
+            lines.append(f"    {name} part {part}: {reached}{stopped}")
+    return "\n".join(lines)
+
+
+def _run_key(result: Dict[str, Any]) -> Tuple[str, int, int]:
+    return result["name"], result["part"], result["size"]
+
+
+def compare_stress(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> str:
+    """Formats the outcomes that changed and the ratio of times (candidate / baseline) of the runs found in both."""
+    baseline_results = {_run_key(result): result for result in baseline["results"]}
+    lines = [f"baseline: {baseline.get('commit')}", f"candidate: {candidate.get('commit')}"]
+    for result in candidate["results"]:
+        reference = baseline_results.get(_run_key(result))
+        if reference is None or "skipped" in (result["outcome"], reference["outcome"]):
+            continue
+        label = f"{result['name']} part {result['part']} size {result['size']}"
+        if result["outcome"] != reference["outcome"]:
+            lines.append(f"{label}: {reference['outcome']} -> {result['outcome']} {result['error'] or ''}".rstrip())
+        elif result["outcome"] == "ok" and reference["time"]:
+            lines.append(f"{label}: {result['time'] / reference['time']:>8.3g}x the baseline time")
+    return "\n".join(lines)
@@ -0,0 +1,142 @@
+"""
+Opt-in instrumentation of the hot functions of the solutions, exported as Chrome / Perfetto traces.
+
+Functions decorated with `traced`, and blocks wrapped in `with span(name)`, record a span (start,
+wall time, CPU time) each time they run while a `Tracer` is active, nested as the calls are. The
+spans are written as a Chrome trace event JSON file, which chrome://tracing or ui.perfetto.dev
+display as a timeline, and are aggregated per function: number of calls, inclusive wall and CPU
+times (recursive calls are only counted once, in their outermost call) and self time.
+
+When no tracer is active, a decorated function costs one global lookup and an extra call, so the
+decorators are left in place in the solutions.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+_tracer: Optional["Tracer"] = None  # the active tracer, if any
+
+
+class SpanStats(NamedTuple):
+    """Aggregated calls and times (in seconds) of a function or block over a traced run."""
+
+    name: str
+    calls: int
+    wall_time: float
+    cpu_time: float
+    self_time: float
+
+
+class Tracer:
+    """Records the spans of traced functions and blocks, to be exported as a trace or aggregated."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self._children_time: List[float] = []  # wall time spent in children, for each open span
+        self._open: Dict[str, int] = {}  # number of open spans per name, to spot recursive calls
+        self._stats: Dict[str, List] = {}  # name -> [calls, wall time, cpu time, self time]
+
+    def enter(self, name: str) -> tuple:
+        self._children_time.append(0.0)
+        self._open[name] = self._open.get(name, 0) + 1
+        return time.perf_counter(), time.process_time()
+
+    def exit(self, name: str, start: tuple) -> None:
+        wall_time = time.perf_counter() - start[0]
+        cpu_time = time.process_time() - start[1]
+        self_time = wall_time - self._children_time.pop()
+        if self._children_time:
+            self._children_time[-1] += wall_time
+        self._open[name] -= 1
+
+        stats = self._stats.setdefault(name, [0, 0.0, 0.0, 0.0])
+        stats[0] += 1
+        if not self._open[name]:  # the outermost of recursive calls covers the inner ones
+            stats[1] += wall_time
+            stats[2] += cpu_time
+        stats[3] += self_time
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",  # a complete event, with its duration
+                "ts": 1e6 * (start[0] - self.origin),
+                "dur": 1e6 * wall_time,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"cpu_ms": 1e3 * cpu_time, "self_ms": 1e3 * self_time},
+            }
+        )
+
+    def stats(self) -> List[SpanStats]:
+        """Returns the aggregated spans, by decreasing self time."""
+        stats = [SpanStats(name, *values) for name, values in self._stats.items()]
+        return sorted(stats, key=lambda span_stats: span_stats.self_time, reverse=True)
+
+    def save(self, outputfile: Path) -> None:
+        """Writes the spans as a Chrome trace event file."""
+        trace = {"traceEvents": sorted(self.events, key=lambda event: event["ts"]), "displayTimeUnit": "ms"}
+        Path(outputfile).write_text(json.dumps(trace))
+
+
+def traced(function: Callable) -> Callable:
+    """Decorator recording a span for every call of the function while tracing is active."""
+    source = Path(function.__code__.co_filename)
+    name = f"{source.parent.name}.{source.stem}.{function.__qualname__}"  # the same whether run as a script or not
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return function(*args, **kwargs)
+        start = tracer.enter(name)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            tracer.exit(name, start)
+
+    return wrapper
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Records a span for the wrapped block while tracing is active."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    start = tracer.enter(name)
+    try:
+        yield
+    finally:
+        tracer.exit(name, start)
+
+
+@contextmanager
+def tracing(outputfile: Optional[Path] = None) -> Iterator[Tracer]:
+    """Activates a new tracer for the wrapped block, and writes its trace to `outputfile` if given."""
+    global _tracer
+    previous, _tracer = _tracer, Tracer()
+    tracer = _tracer
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
+        if outputfile is not None:
+            tracer.save(outputfile)
+
+
+def format_stats(stats: List[SpanStats], top: Optional[int] = None) -> str:
+    """Formats the aggregated spans as a text table, with times in milliseconds."""
+    header = f"{'calls':>8} {'wall':>10} {'cpu':>10} {'self':>10}  name"
+    lines = [header, "-" * len(header)]
+    for span_stats in stats[:top]:
+        lines.append(
+            f"{span_stats.calls:>8} {1e3 * span_stats.wall_time:>10.2f} {1e3 * span_stats.cpu_time:>10.2f} "
+            f"{1e3 * span_stats.self_time:>10.2f}  {span_stats.name}"
+        )
+    return "\n".join(lines)
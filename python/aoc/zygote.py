@@ -0,0 +1,297 @@
+"""
+Fork server: a background zygote process keeping the libraries and solutions imported, from which
+command line calls fork instead of starting over.
+
+A call such as `python -m aoc run -d 6` spends most of its time importing numpy, pandas and scipy
+rather than solving. The zygote imports them once, along with every solution module and the aoc
+modules running them, and then waits on a Unix socket. When a command which solves something is
+run while a zygote is alive, the command line only parses its arguments and hands them over, with
+its working directory, its environment and its standard streams (passed as file descriptors): the
+zygote forks, and the child runs the command as if it had been started from the command line,
+writing directly to the caller's terminal or pipes. The caller waits for the exit code of the child
+and forwards Ctrl+C to it. The cost of a call is then that of starting a bare interpreter and a fork.
+
+Without a zygote, or if it doesn't answer, commands run as usual in the calling process. A zygote
+whose modules changed on disk since it imported them refuses to fork stale code: it exits, and the
+command runs as usual. The kernels backends (numba, taichi) are not imported by the zygote.
+
+    python -m aoc zygote start   # in the background, returns once it's warm
+    python -m aoc zygote status
+    python -m aoc zygote stop
+"""
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aoc.solutions import PYTHON_DIR
+
+ENVIRONMENT_VARIABLE = "AOC_ZYGOTE_SOCKET"
+DEFAULT_SOCKET = PYTHON_DIR / ".cache" / "zygote.sock"
+FORKED_COMMANDS = ("run", "both", "batch", "stream", "check", "bench", "profile", "generate")
+ZYGOTE_IMPORTS = (
+    "numpy",
+    "pandas",
+    "scipy.sparse.csgraph",
+    "aoc.batch",
+    "aoc.benchmarks",
+    "aoc.combined",
+    "aoc.differential",
+    "aoc.generators",
+    "aoc.limits",
+    "aoc.profiling",
+    "aoc.runner",
+    "aoc.sidecars",
+    "aoc.tracing",
+)
+START_TIMEOUT = 60.0  # seconds to wait for a starting zygote to be warm
+_STDIO = (0, 1, 2)
+
+
+def socket_path() -> Path:
+    return Path(os.environ.get(ENVIRONMENT_VARIABLE, DEFAULT_SOCKET))
+
+
+def _send(connection: socket.socket, message: Dict[str, Any], fds: Optional[List[int]] = None) -> None:
+    data = json.dumps(message).encode() + b"\n"
+    if fds:
+        socket.send_fds(connection, [data], fds)
+    else:
+        connection.sendall(data)
+
+
+def _receive(stream) -> Optional[Dict[str, Any]]:
+    """Reads a JSON message line from the file of a connection, None if it was closed first."""
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def _connect(path: Path, timeout: Optional[float] = None) -> Optional[socket.socket]:
+    """Returns a connection to the zygote, or None if none is listening on the socket."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(str(path))
+    except OSError:  # no socket, or nobody listening on it anymore
+        connection.close()
+        return None
+    return connection
+
+
+# Zygote side
+
+
+def _module_files() -> Dict[str, int]:
+    """Returns the modification times of the files of the imported modules of this repository."""
+    files = {}
+    for module in list(sys.modules.values()):
+        filename = getattr(module, "__file__", None)
+        if filename is not None and filename.startswith(str(PYTHON_DIR)) and os.path.exists(filename):
+            files[filename] = os.stat(filename).st_mtime_ns
+    return files
+
+
+def _stale(module_files: Dict[str, int]) -> bool:
+    for filename, mtime in module_files.items():
+        try:
+            if os.stat(filename).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def warm_up() -> None:
+    """Imports the heavy libraries, the aoc modules running the commands and all the solutions."""
+    import importlib
+
+    from aoc.solutions import DAYS, PARTS, load_solution
+
+    for name in ZYGOTE_IMPORTS:
+        importlib.import_module(name)
+    for day in DAYS:
+        for part in PARTS:
+            load_solution(day, part)
+
+
+def _run_child(connection: socket.socket, request: Dict[str, Any], fds: List[int]) -> None:
+    """Runs in the forked child: takes over the caller's streams, directory and environment, and runs the command."""
+    from aoc.__main__ import main
+    from aoc.backends import DEFAULT_BACKEND
+    from aoc.backends import ENVIRONMENT_VARIABLE as BACKEND_VARIABLE
+    from aoc.backends import set_backend
+    from aoc.budget import ENVIRONMENT_VARIABLE as BUDGET_VARIABLE
+    from aoc.budget import set_memory_budget
+    from aoc.shared import ENVIRONMENT_VARIABLE as WORKERS_VARIABLE
+    from aoc.shared import set_workers
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # reaped automatically by the zygote, not by its children
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for fd, target in zip(fds, _STDIO):
+        os.dup2(fd, target)
+        os.close(fd)
+    sys.stdin = open(0, closefd=False)
+    sys.stdout = open(1, "w", closefd=False)
+    sys.stderr = open(2, "w", closefd=False)
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    set_backend(os.environ.get(BACKEND_VARIABLE, DEFAULT_BACKEND))  # all were read when the zygote imported them
+    set_memory_budget(float(os.environ[BUDGET_VARIABLE]) if os.environ.get(BUDGET_VARIABLE) else None)
+    set_workers(int(os.environ[WORKERS_VARIABLE]) if os.environ.get(WORKERS_VARIABLE) else 1)
+
+    _send(connection, {"pid": os.getpid()})
+    code = 0
+    try:
+        main(["--no-zygote", *request["argv"]])
+    except SystemExit as exit:
+        if isinstance(exit.code, str):
+            print(exit.code, file=sys.stderr)
+        code = exit.code if isinstance(exit.code, int) else int(exit.code is not None)
+    except BaseException as error:
+        import traceback
+
+        traceback.print_exception(error, error, error.__traceback__.tb_next)  # from main, as when run directly
+        code = 130 if isinstance(error, KeyboardInterrupt) else 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    try:
+        _send(connection, {"exit": code})
+    finally:
+        os._exit(code)
+
+
+def serve_zygote(path: Optional[Path] = None) -> None:
+    """Warms up and forks a child running each command received on the socket, until asked to stop."""
+    path = Path(path) if path is not None else socket_path()
+    warm_up()
+    module_files = _module_files()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():  # left over by a zygote which didn't stop cleanly, or one alive (which start checks)
+        path.unlink()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen(16)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # children are reaped as they exit
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    started, forks = time.time(), 0
+
+    try:
+        while True:
+            connection, _ = listener.accept()
+            data, fds, _, _ = socket.recv_fds(connection, 2 ** 16, len(_STDIO))
+            with connection, connection.makefile("rb") as stream:  # closed here, the child keeps its own copy
+                request = json.loads(data + (stream.readline() if not data.endswith(b"\n") else b""))
+                command = request.get("command")
+                if command == "status":
+                    _send(connection, {"pid": os.getpid(), "started": started, "forks": forks})
+                elif command == "stop":
+                    _send(connection, {"stopped": os.getpid()})
+                    return
+                elif command == "run" and len(fds) == len(_STDIO):
+                    if _stale(module_files):  # don't run old code, let the caller run it itself
+                        _send(connection, {"stale": True})
+                        return
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    if os.fork() == 0:
+                        try:
+                            listener.close()
+                            _run_child(connection, request, fds)
+                        finally:  # never back into the loop of the zygote
+                            os._exit(1)
+                    forks += 1
+                for fd in fds:
+                    os.close(fd)
+    finally:
+        listener.close()
+        if path.exists():
+            path.unlink()
+
+
+# Caller side
+
+
+def run_in_zygote(argv: List[str], path: Optional[Path] = None) -> Optional[int]:
+    """
+    Runs the command line arguments in a child of the zygote, and returns its exit code, or None if
+    no zygote could run it (the command should then run in this process).
+    """
+    connection = _connect(Path(path) if path is not None else socket_path())
+    if connection is None:
+        return None
+    with connection, connection.makefile("rb") as stream:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        request = {"command": "run", "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+        try:
+            _send(connection, request, list(_STDIO))
+            started = _receive(stream)
+        except (OSError, ValueError):
+            return None
+        if started is None or "pid" not in started:
+            if started is not None and started.get("stale"):
+                print("the zygote was out of date and stopped, running without it", file=sys.stderr)
+            return None
+        while True:
+            try:
+                finished = _receive(stream)
+                break
+            except KeyboardInterrupt:  # the child is not in our process group, pass it on
+                os.kill(started["pid"], signal.SIGINT)
+    return finished["exit"] if finished is not None else 1  # closed without an exit code, the child crashed
+
+
+def zygote_status(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Returns the pid, start time and number of forks of the zygote, or None if none is alive."""
+    connection = _connect(Path(path) if path is not None else socket_path(), timeout=5)
+    if connection is None:
+        return None
+    with connection, connection.makefile("rb") as stream:
+        _send(connection, {"command": "status"})
+        return _receive(stream)
+
+
+def start_zygote(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Starts a zygote in the background if none is alive, waits until it's warm, and returns its status."""
+    path = Path(path) if path is not None else socket_path()
+    status = zygote_status(path)
+    if status is not None:
+        return status
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.with_suffix(".log").open("ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "aoc", "zygote", "serve", "--socket", str(path)],
+            cwd=PYTHON_DIR,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,  # not stopped by the Ctrl+C of the terminal which started it
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"the zygote exited with code {process.returncode}, see {path.with_suffix('.log')}")
+        status = zygote_status(path)
+        if status is not None:
+            return status
+        time.sleep(0.05)
+    raise RuntimeError(f"the zygote was not ready after {START_TIMEOUT:g} s, see {path.with_suffix('.log')}")
+
+
+def stop_zygote(path: Optional[Path] = None) -> Optional[int]:
+    """Stops the zygote, returns its pid or None if none was alive."""
+    connection = _connect(Path(path) if path is not None else socket_path(), timeout=5)
+    if connection is None:
+        return None
+    with connection, connection.makefile("rb") as stream:
+        _send(connection, {"command": "stop"})
+        response = _receive(stream)
+    return response["stopped"] if response is not None else None
@@ -52,8 +52,41 @@ In the example above, the changes are as follows:
 In this example, there are 7 measurements that are larger than the previous measurement.
 How many measurements are larger than the previous measurement?
 """
+import sys
+from pathlib import Path
+from typing import IO
+
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.inputs import read_int_column  # noqa: E402
+from aoc.streams import iter_int_chunks  # noqa: E402
+
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the depth measurements from the input file as a numpy array of ints."""
+    return read_int_column(inputfile)
+
+
+def part1(inputs: np.ndarray) -> int:
+    """Counts the measurements that are larger than the previous one."""
+    return int(np.sum(inputs[1:] > inputs[:-1]))  # Sum which elements are larger than the previous element
+
+
+def part1_stream(stream: IO) -> int:
+    """Same as part1, reading the measurements from a stream by chunks."""
+    increases = 0
+    previous = np.empty(0, dtype=np.int64)  # the last measurement of the previous chunk, compared to the first one
+    for depths in iter_int_chunks(stream):
+        depths = np.concatenate([previous, depths])
+        increases += part1(depths)
+        previous = depths[-1:]
+    return increases
+
+
 if __name__ == "__main__":
-    inputs = np.loadtxt("inputs.txt")  # Read input as array
-    print(np.sum(inputs[1:] > inputs[:-1]))  # Sum which elements are larger than the previous element
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python first.py -
+        print(part1_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))  # Read input as array
+        print(part1(inputs))
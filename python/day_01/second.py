@@ -39,11 +39,44 @@ In this example, there are 5 sums that are larger than the previous sum.
 Consider sums of a three-measurement sliding window.
 How many sums are larger than the previous sum?
 """
+import sys
+from pathlib import Path
+from typing import IO
+
 import numpy as np
 
-if __name__ == "__main__":
-    inputs = np.loadtxt("inputs.txt", dtype=int)
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.inputs import read_int_column  # noqa: E402
+from aoc.streams import iter_int_chunks  # noqa: E402
+
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the depth measurements from the input file as a numpy array of ints."""
+    return read_int_column(inputfile)
+
+
+def part2(inputs: np.ndarray) -> int:
+    """Counts the three-measurement sliding window sums that are larger than the previous one."""
     # Create a new array stacking elements by three (first into stacked_by_three is
     # inputs[0] + inputs[1] + inputs[2], second element is inputs[1] + inputs[2] + inputs[3], etc.)
     stacked_by_three = inputs[:-2] + inputs[1:-1] + inputs[2:]
-    print(np.sum(stacked_by_three[1:] > stacked_by_three[:-1]))  # compare as for part 1
+    return int(np.sum(stacked_by_three[1:] > stacked_by_three[:-1]))  # compare as for part 1
+
+
+def part2_stream(stream: IO) -> int:
+    """Same as part2, reading the measurements from a stream by chunks."""
+    increases = 0
+    previous = np.empty(0, dtype=np.int64)  # the last measurements of the previous chunk, for windows across chunks
+    for depths in iter_int_chunks(stream):
+        depths = np.concatenate([previous, depths])
+        increases += part2(depths)
+        previous = depths[-3:]
+    return increases
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python second.py -
+        print(part2_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part2(inputs))
@@ -35,18 +35,48 @@ After following these instructions, you would have a horizontal position of 15 a
 Calculate the horizontal position and depth you would have after following the planned course.
 What do you get if you multiply your final horizontal position by your final depth?
 """
+import sys
 from pathlib import Path
+from typing import IO, List, Tuple
 
-if __name__ == "__main__":
-    horizontal_position = 0
-    depth = 0
-    inputs = Path("inputs.txt").read_text().splitlines()
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_line_chunks  # noqa: E402
+
+
+def parse(inputfile: Path) -> List[str]:
+    """Returns the submarine commands from the input file, one per line."""
+    return inputfile.read_text().splitlines()
 
-    for line in inputs:
+
+def follow_commands(commands: List[str], horizontal_position: int = 0, depth: int = 0) -> Tuple[int, int]:
+    """Follows the commands from the given position and returns the final horizontal position and depth."""
+    for line in commands:
         if line.startswith("forward"):
             horizontal_position += int(line.split()[1])
         elif line.startswith("down"):
             depth += int(line.split()[1])
         elif line.startswith("up"):
             depth -= int(line.split()[1])
-    print(horizontal_position * depth)
+    return horizontal_position, depth
+
+
+def part1(inputs: List[str]) -> int:
+    """Follows the commands and returns the product of the final horizontal position and depth."""
+    horizontal_position, depth = follow_commands(inputs)
+    return horizontal_position * depth
+
+
+def part1_stream(stream: IO) -> int:
+    """Same as part1, reading the commands from a stream by chunks."""
+    horizontal_position, depth = 0, 0
+    for commands in iter_line_chunks(stream):
+        horizontal_position, depth = follow_commands(commands, horizontal_position, depth)
+    return horizontal_position * depth
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python first.py -
+        print(part1_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part1(inputs))
@@ -29,15 +29,24 @@ After following these new instructions, you would have a horizontal position of
 Using this new interpretation of the commands, calculate the horizontal position and depth you would have after following the planned course.
 What do you get if you multiply your final horizontal position by your final depth?
 """
+import sys
 from pathlib import Path
+from typing import IO, List, Tuple
 
-if __name__ == "__main__":
-    aim = 0
-    horizontal_position = 0
-    depth = 0
-    inputs = Path("inputs.txt").read_text().splitlines()
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_line_chunks  # noqa: E402
+
+
+def parse(inputfile: Path) -> List[str]:
+    """Returns the submarine commands from the input file, one per line."""
+    return inputfile.read_text().splitlines()
 
-    for line in inputs:
+
+def follow_commands(
+    commands: List[str], aim: int = 0, horizontal_position: int = 0, depth: int = 0
+) -> Tuple[int, int, int]:
+    """Follows the commands from the given aim and position, returns the final aim, horizontal position and depth."""
+    for line in commands:
         if line.startswith("forward"):
             horizontal_position += int(line.split()[1])
             depth += aim * int(line.split()[1])
@@ -45,4 +54,26 @@ if __name__ == "__main__":
             aim += int(line.split()[1])
         elif line.startswith("up"):
             aim -= int(line.split()[1])
-    print(horizontal_position * depth)
+    return aim, horizontal_position, depth
+
+
+def part2(inputs: List[str]) -> int:
+    """Follows the commands with aim and returns the product of the final horizontal position and depth."""
+    _, horizontal_position, depth = follow_commands(inputs)
+    return horizontal_position * depth
+
+
+def part2_stream(stream: IO) -> int:
+    """Same as part2, reading the commands from a stream by chunks."""
+    aim, horizontal_position, depth = 0, 0, 0
+    for commands in iter_line_chunks(stream):
+        aim, horizontal_position, depth = follow_commands(commands, aim, horizontal_position, depth)
+    return horizontal_position * depth
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python second.py -
+        print(part2_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part2(inputs))
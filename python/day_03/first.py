@@ -36,9 +36,38 @@ So, the epsilon rate is 01001, or 9 in decimal. Multiplying the gamma rate (22)
 Use the binary numbers in your diagnostic report to calculate the gamma rate and epsilon rate, then multiply them together. 
 What is the power consumption of the submarine? (Be sure to represent your answer in decimal, not binary.)
 """
+from __future__ import annotations
+
+import sys
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_digit_rows  # noqa: E402
+
+if TYPE_CHECKING:  # pandas is heavy to import, only do it when actually parsing
+    import numpy as np
+    import pandas as pd
+
+
+def parse(inputfile: Path) -> pd.DataFrame:
+    """Read inputs as a dataframe, each element is a bit as string."""
+    import pandas as pd
+
+    inputs = [list(line) for line in inputfile.read_text().splitlines()]
+    return pd.DataFrame(inputs)
+
+
+def parsed_to_arrays(inputs: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Returns the bits as an array, to save the parsed input in a sidecar (see aoc.sidecars)."""
+    return {"bits": inputs.to_numpy(dtype="uint8")}  # the strings of parse as ints, as part 2 parses them
+
 
-import pandas as pd
+def parsed_from_arrays(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Returns the dataframe of bits from the arrays of a sidecar."""
+    import pandas as pd
+
+    return pd.DataFrame(arrays["bits"].astype(str).astype(object))  # of strings, as parse does
 
 
 def find_most_frequent_bits(inputs_df: pd.DataFrame) -> str:
@@ -57,11 +86,28 @@ def find_epsilon_rate(inputs_df: pd.DataFrame) -> int:
     return int(epsilon_bits, 2)  # convert to decimal integer
 
 
-if __name__ == "__main__":
-    # Read inputs as a list of lists, each element is a bit as string
-    inputs = [list(line) for line in Path("inputs.txt").read_text().splitlines()]
-    inputs = pd.DataFrame(inputs)
-
+def part1(inputs: pd.DataFrame) -> int:
+    """Returns the power consumption, the product of the gamma and epsilon rates."""
     gamma = find_gamma_rate(inputs)
     epsilon = find_epsilon_rate(inputs)
-    print(gamma * epsilon)
+    return gamma * epsilon
+
+
+def part1_stream(stream: IO) -> int:
+    """Same as part1, counting the 1s of each column over the chunks of a stream."""
+    ones, count = 0, 0
+    for bits in iter_digit_rows(stream):
+        ones = ones + bits.sum(axis=0)
+        count += len(bits)
+
+    gamma_bits = "".join("1" if 2 * column_ones > count else "0" for column_ones in ones)  # 0 on ties, like mode()
+    epsilon_bits = gamma_bits.replace("1", "2").replace("0", "1").replace("2", "0")
+    return int(gamma_bits, 2) * int(epsilon_bits, 2)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python first.py -
+        print(part1_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part1(inputs))
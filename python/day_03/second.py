@@ -48,10 +48,36 @@ Finally, to find the life support rating, multiply the oxygen generator rating (
 Use the binary numbers in your diagnostic report to calculate the oxygen generator rating and CO2 scrubber rating, then multiply them together.
 What is the life support rating of the submarine? (Be sure to represent your answer in decimal, not binary.)
 """
+from __future__ import annotations
+
+import sys
 from copy import deepcopy
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict
+
+from first import parsed_to_arrays  # the same sidecar arrays, see aoc.sidecars
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_digit_rows  # noqa: E402
+
+if TYPE_CHECKING:  # pandas is heavy to import, only do it when actually parsing
+    import numpy as np
+    import pandas as pd
+
+
+def parse(inputfile: Path) -> pd.DataFrame:
+    """Read inputs as a dataframe of ints, each element is a bit."""
+    import pandas as pd
+
+    inputs = [list(line) for line in inputfile.read_text().splitlines()]
+    return pd.DataFrame(inputs).astype(int)  # convert to pandas dataframe
 
-import pandas as pd
+
+def parsed_from_arrays(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Returns the dataframe of bits from the arrays of a sidecar, saved as part 1 saves them."""
+    import pandas as pd
+
+    return pd.DataFrame(arrays["bits"].astype(int))
 
 
 def find_oxygen_rating(inputs: pd.DataFrame) -> int:
@@ -84,11 +110,49 @@ def find_co2_scrubber_rating(inputs: pd.DataFrame) -> int:
     return int(co2_scrubber_rating_bits, 2)  # convert to int before returning
 
 
-if __name__ == "__main__":
-    # Read inputs as a list of lists, each element is a bit as string
-    inputs = [list(line) for line in Path("inputs.txt").read_text().splitlines()]
-    inputs = pd.DataFrame(inputs).astype(int)  # convert to pandas dataframe
-
+def part2(inputs: pd.DataFrame) -> int:
+    """Returns the life support rating, the product of the oxygen and CO2 scrubber ratings."""
     oxygen_rating = find_oxygen_rating(inputs)
     co2_scrubber_rating = find_co2_scrubber_rating(inputs)
-    print(oxygen_rating * co2_scrubber_rating)
+    return oxygen_rating * co2_scrubber_rating
+
+
+def find_rating_in_histogram(histogram: np.ndarray, keep_most_common: bool) -> int:
+    """
+    Same filtering as the ratings above, on the histogram of the values instead of the values: those
+    starting with the bits kept so far are a slice of the histogram, whose first half starts with a 0
+    and second half with a 1, so the bit criteria only needs the sums of both halves.
+    """
+    low, high = 0, len(histogram)
+    while high - low > 1 and histogram[low:high].sum() > 1:
+        middle = (low + high) // 2
+        zeros, ones = histogram[low:middle].sum(), histogram[middle:high].sum()
+        keep_ones = ones >= zeros if keep_most_common else ones < zeros
+        low, high = (middle, high) if keep_ones else (low, middle)
+    if not histogram[low:high].sum():
+        raise ValueError("no value fits the bit criteria")
+    return low + int(histogram[low:high].argmax())  # the only value left
+
+
+def part2_stream(stream: IO) -> int:
+    """
+    Same as part2, reading the values from a stream by chunks. Ratings need several passes over the
+    values, so they are computed from their histogram, whose size only depends on the number of bits.
+    """
+    import numpy as np
+
+    histogram = None
+    for bits in iter_digit_rows(stream):
+        values = bits.astype(np.int64) @ (1 << np.arange(bits.shape[1] - 1, -1, -1))
+        if histogram is None:
+            histogram = np.zeros(2 ** bits.shape[1], dtype=np.int64)
+        histogram += np.bincount(values, minlength=len(histogram))
+    return find_rating_in_histogram(histogram, True) * find_rating_in_histogram(histogram, False)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python second.py -
+        print(part2_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part2(inputs))
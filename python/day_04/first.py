@@ -67,11 +67,18 @@ Then, multiply that sum by the number that was just called when the board won, 2
 To guarantee victory against the giant squid, figure out which board will win first. 
 What will your final score be if you choose that board?
 """
+import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.grids import smallest_uint  # noqa: E402
+from aoc.shared import get_workers, split  # noqa: E402
+from aoc.tracing import traced  # noqa: E402
+
 
 def read_random_numbers(inputfile: Path) -> np.ndarray:
     """Returns the random numbers (first line) from the input file as a numpy array of ints."""
@@ -80,21 +87,32 @@ def read_random_numbers(inputfile: Path) -> np.ndarray:
 
 
 def read_bingo_boards(inputfile: Path) -> np.ndarray:
-    """Returns an array with the bingo boards from the input file, each as a 5x5 numpy array of ints."""
+    """
+    Returns an array with the bingo boards from the input file, each as a 5x5 numpy array of the
+    narrowest unsigned ints holding their numbers (uint8 for the numbers up to 99 of the puzzle).
+    """
     contents = inputfile.read_text().splitlines()
     boards_lists = [[int(n) for n in line.split()] for line in contents[1:] if line != ""]
     num_boards = len(boards_lists) // 5
-    return np.array(boards_lists).reshape((num_boards, 5, 5))
+    boards = np.array(boards_lists, dtype=np.int64).reshape((num_boards, 5, 5))
+    return boards.astype(smallest_uint(int(boards.max(initial=0))))
 
 
+def parse(inputfile: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the random numbers and the bingo boards from the input file."""
+    return read_random_numbers(inputfile), read_bingo_boards(inputfile)
+
+
+@traced
+@kernel  # compiled with the numba backend
 def check_number_in_boards(number: int, boards: np.ndarray, marked_boards: np.ndarray) -> bool:
-    """Checks the presence of `number` in the board, marks where it is in the dummies with a 1."""
-    # Go through all positions in all boards, if number is found mark it with a 1 in the dummy boards.
+    """Checks the presence of `number` in the board, marks where it is in the boolean dummies."""
+    # Go through all positions in all boards, if number is found mark it in the dummy boards.
     for z in range(boards.shape[0]):  # number of boards
         for y in range(5):  # lazy double loop to go through the board
             for x in range(5):
                 if boards[z, y, x] == number:
-                    marked_boards[z, y, x] = 1
+                    marked_boards[z, y, x] = True
 
 
 def find_sum_of_board(boards: np.ndarray, marked_boards: np.ndarray, index: int, number: int) -> int:
@@ -103,19 +121,20 @@ def find_sum_of_board(boards: np.ndarray, marked_boards: np.ndarray, index: int,
 
     Args:
         boards (np.ndarray): array of bingo boards, each a 5x5 np.ndarray
-        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray with either 0 or 1 values
+        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray of booleans
         index (int): index of the board to check
         number (int): the random number we are currently solving for
     """
     not_marked = []  # will hold all numbers not marked for the win
     for y in range(5):  # lazy double loop to go through the board
         for x in range(5):
-            if not marked_boards[index, y, x]:  # position isn't marked with a 1
-                not_marked.append(boards[index, y, x])
-    return sum(not_marked) * number
+            if not marked_boards[index, y, x]:  # position isn't marked
+                not_marked.append(int(boards[index, y, x]))  # as a Python int, the sum can overflow the board's dtype
+    return sum(not_marked) * int(number)
 
 
 # CAN GO TO MAIN
+@traced
 def check_for_winning_boards(
     boards: np.ndarray,
     marked_boards: np.ndarray,
@@ -129,7 +148,7 @@ def check_for_winning_boards(
 
     Args:
         boards (np.ndarray): array of bingo boards, each a 5x5 np.ndarray
-        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray with either 0 or 1 values
+        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray of booleans
         winner_boards (List[int]): list of indices of the winning boards
         winning_sums (List[int]): list of sums of the winning boards
         number (int): number we are currently indexing for
@@ -138,23 +157,91 @@ def check_for_winning_boards(
         if index in winner_boards:  # no need to check it again if it's already a winner
             continue
         else:
-            # Sum across both axes: if there is a 5 in the result, one of these axes is full of 1s so the board is a winner
+            # Sum across both axes: if there is a 5 in the result, a row or column is all marked so the board wins
             if (5 in np.sum(marked_boards[index], axis=0)) or (5 in np.sum(marked_boards[index], axis=1)):
                 winner_boards.append(index)
                 winning_sums.append(find_sum_of_board(boards, marked_boards, index, number))
 
 
-if __name__ == "__main__":
-    inputs_file = Path("inputs.txt")
-    random_numbers = read_random_numbers(inputs_file)
-    bingo_boards = read_bingo_boards(inputs_file)
+Winner = Tuple[int, int, int]  # turn the board wins at, its index and its score
+
+
+def find_shard_winners(
+    shard: slice, boards: np.ndarray, turns: np.ndarray, numbers: np.ndarray
+) -> Optional[Tuple[Winner, Winner]]:
+    """
+    Runs in a worker: returns the first and last winners among the boards of the shard, with the
+    ties broken as when playing (lowest index first), or None if none of them ever wins.
+
+    Args:
+        shard (slice): range of the boards this worker owns
+        boards (np.ndarray): array of all the bingo boards, shared
+        turns (np.ndarray): turn each number is drawn at, indexed by number (len(numbers) if never), shared
+        numbers (np.ndarray): the random numbers, in the order they are drawn
+    """
+    board_turns = turns[boards[shard]]
+    # A line is complete once its last number is drawn, a board wins with its first complete line
+    win_turns = np.minimum(board_turns.max(axis=2).min(axis=1), board_turns.max(axis=1).min(axis=1))
+    winners = np.flatnonzero(win_turns < len(numbers))
+    if not winners.size:
+        return None
+
+    def winner(index: int) -> Winner:
+        turn = int(win_turns[index])
+        not_marked = boards[shard][index][board_turns[index] > turn]
+        score = sum(int(n) for n in not_marked) * int(numbers[turn])  # as Python ints, like find_sum_of_board
+        return turn, shard.start + index, score
+
+    first = winners[np.argmin(win_turns[winners])]
+    last = winners[::-1][np.argmax(win_turns[winners][::-1])]
+    return winner(first), winner(last)
+
+
+def play_bingo_sharded(inputs: Tuple[np.ndarray, np.ndarray]) -> Tuple[int, int]:
+    """
+    Returns the scores of the first and of the last winning boards, the boards being split between
+    the workers, which all read the same shared stack. Rather than marking the boards number by
+    number, each worker finds the turn each of its boards wins at, from the turn each number is drawn.
+    """
+    from aoc.shared import SharedArrays  # only the sharded path needs it
+
+    random_numbers, bingo_boards = inputs
+    turns = np.full(max(int(bingo_boards.max(initial=0)), int(random_numbers.max(initial=0))) + 1, len(random_numbers))
+    turns[random_numbers[::-1]] = np.arange(len(random_numbers))[::-1]  # the first time a number is drawn counts
+
+    with SharedArrays() as shared:
+        results = shared.map(
+            find_shard_winners,
+            split(len(bingo_boards), get_workers()),
+            boards=shared.share(bingo_boards),
+            turns=shared.share(turns),
+            numbers=random_numbers,
+        )
+    winners = [result for result in results if result is not None]
+    if not winners:
+        raise IndexError("no board ever wins")  # as the scores of the winners are indexed when playing
+    first = min((first for first, _ in winners), key=lambda winner: (winner[0], winner[1]))
+    last = max((last for _, last in winners), key=lambda winner: (winner[0], winner[1]))
+    return first[2], last[2]
+
+
+def part1(inputs: Tuple[np.ndarray, np.ndarray]) -> int:
+    """Plays bingo until the end and returns the score of the first winning board."""
+    if get_workers() > 1:
+        return play_bingo_sharded(inputs)[0]
+    random_numbers, bingo_boards = inputs
 
     # Setting up the variables needed.
-    marked = np.zeros(bingo_boards.shape, dtype=int)  # blank canvas, change values to 1 when marked
+    marked = np.zeros(bingo_boards.shape, dtype=bool)  # blank canvas, set to True when marked
     winner_boards = []
     winning_sums = []
 
     for number in random_numbers:
         check_number_in_boards(number, bingo_boards, marked)
         check_for_winning_boards(bingo_boards, marked, winner_boards, winning_sums, number)
-    print(winning_sums[0])  # sum for the first winning board to be found
+    return int(winning_sums[0])  # sum for the first winning board to be found
+
+
+if __name__ == "__main__":
+    inputs = parse(Path("inputs.txt"))
+    print(part1(inputs))
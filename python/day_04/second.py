@@ -13,12 +13,20 @@ If you were to keep playing until this point, the second board would have a sum
 Figure out which board will win last. Once it wins, what would its final score be?
 """
 # This is exactly part 1 but we return the last winning sum instead of the first one
-# Apart from the last line of code, this is identical to first.py
+# Apart from the returned sum in part2, this is identical to first.py
 
+import sys
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
+from first import play_bingo_sharded
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.grids import smallest_uint  # noqa: E402
+from aoc.shared import get_workers  # noqa: E402
+from aoc.tracing import traced  # noqa: E402
 
 
 def read_random_numbers(inputfile: Path) -> np.ndarray:
@@ -28,21 +36,32 @@ def read_random_numbers(inputfile: Path) -> np.ndarray:
 
 
 def read_bingo_boards(inputfile: Path) -> np.ndarray:
-    """Returns an array with the bingo boards from the input file, each as a 5x5 numpy array of ints."""
+    """
+    Returns an array with the bingo boards from the input file, each as a 5x5 numpy array of the
+    narrowest unsigned ints holding their numbers (uint8 for the numbers up to 99 of the puzzle).
+    """
     contents = inputfile.read_text().splitlines()
     boards_lists = [[int(n) for n in line.split()] for line in contents[1:] if line != ""]
     num_boards = len(boards_lists) // 5
-    return np.array(boards_lists).reshape((num_boards, 5, 5))
+    boards = np.array(boards_lists, dtype=np.int64).reshape((num_boards, 5, 5))
+    return boards.astype(smallest_uint(int(boards.max(initial=0))))
+
 
+def parse(inputfile: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the random numbers and the bingo boards from the input file."""
+    return read_random_numbers(inputfile), read_bingo_boards(inputfile)
 
+
+@traced
+@kernel  # compiled with the numba backend
 def check_number_in_boards(number: int, boards: np.ndarray, marked_boards: np.ndarray) -> bool:
-    """Checks the presence of `number` in the board, marks where it is in the dummies with a 1."""
-    # Go through all positions in all boards, if number is found mark it with a 1 in the dummy boards.
+    """Checks the presence of `number` in the board, marks where it is in the boolean dummies."""
+    # Go through all positions in all boards, if number is found mark it in the dummy boards.
     for z in range(boards.shape[0]):  # number of boards
         for y in range(5):  # lazy double loop to go through the board
             for x in range(5):
                 if boards[z, y, x] == number:
-                    marked_boards[z, y, x] = 1
+                    marked_boards[z, y, x] = True
 
 
 def find_sum_of_board(boards: np.ndarray, marked_boards: np.ndarray, index: int, number: int) -> int:
@@ -51,19 +70,20 @@ def find_sum_of_board(boards: np.ndarray, marked_boards: np.ndarray, index: int,
 
     Args:
         boards (np.ndarray): array of bingo boards, each a 5x5 np.ndarray
-        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray with either 0 or 1 values
+        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray of booleans
         index (int): index of the board to check
         number (int): the random number we are currently solving for
     """
     not_marked = []  # will hold all numbers not marked for the win
     for y in range(5):  # lazy double loop to go through the board
         for x in range(5):
-            if not marked_boards[index, y, x]:  # position isn't marked with a 1
-                not_marked.append(boards[index, y, x])
-    return sum(not_marked) * number
+            if not marked_boards[index, y, x]:  # position isn't marked
+                not_marked.append(int(boards[index, y, x]))  # as a Python int, the sum can overflow the board's dtype
+    return sum(not_marked) * int(number)
 
 
 # CAN GO TO MAIN
+@traced
 def check_for_winning_boards(
     boards: np.ndarray,
     marked_boards: np.ndarray,
@@ -77,7 +97,7 @@ def check_for_winning_boards(
 
     Args:
         boards (np.ndarray): array of bingo boards, each a 5x5 np.ndarray
-        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray with either 0 or 1 values
+        marked_boards (np.ndarray): array of dummies, each a 5x5 np.ndarray of booleans
         winner_boards (List[int]): list of indices of the winning boards
         winning_sums (List[int]): list of sums of the winning boards
         number (int): number we are currently indexing for
@@ -86,23 +106,42 @@ def check_for_winning_boards(
         if index in winner_boards:  # no need to check it again if it's already a winner
             continue
         else:
-            # Sum across both axes: if there is a 5 in the result, one of these axes is full of 1s so the board is a winner
+            # Sum across both axes: if there is a 5 in the result, a row or column is all marked so the board wins
             if (5 in np.sum(marked_boards[index], axis=0)) or (5 in np.sum(marked_boards[index], axis=1)):
                 winner_boards.append(index)
                 winning_sums.append(find_sum_of_board(boards, marked_boards, index, number))
 
 
-if __name__ == "__main__":
-    inputs_file = Path("inputs.txt")
-    random_numbers = read_random_numbers(inputs_file)
-    bingo_boards = read_bingo_boards(inputs_file)
+def play_bingo(inputs: Tuple[np.ndarray, np.ndarray]) -> List[int]:
+    """Plays bingo until the end and returns the scores of the winning boards, in the order they won."""
+    random_numbers, bingo_boards = inputs
 
     # Setting up the variables needed.
-    marked = np.zeros(bingo_boards.shape, dtype=int)  # blank canvas, change values to 1 when marked
+    marked = np.zeros(bingo_boards.shape, dtype=bool)  # blank canvas, set to True when marked
     winner_boards = []
     winning_sums = []
 
     for number in random_numbers:
         check_number_in_boards(number, bingo_boards, marked)
         check_for_winning_boards(bingo_boards, marked, winner_boards, winning_sums, number)
-    print(winning_sums[-1])  # sum for the last winning board to be found
+    return winning_sums
+
+
+def part2(inputs: Tuple[np.ndarray, np.ndarray]) -> int:
+    """Plays bingo until the end and returns the score of the last winning board."""
+    if get_workers() > 1:
+        return play_bingo_sharded(inputs)[1]
+    return int(play_bingo(inputs)[-1])  # sum for the last winning board to be found
+
+
+def both_parts(inputs: Tuple[np.ndarray, np.ndarray]) -> Tuple[int, int]:
+    """Plays bingo a single time for both parts: returns the scores of the first and of the last winning boards."""
+    if get_workers() > 1:
+        return play_bingo_sharded(inputs)
+    winning_sums = play_bingo(inputs)
+    return int(winning_sums[0]), int(winning_sums[-1])
+
+
+if __name__ == "__main__":
+    inputs = parse(Path("inputs.txt"))
+    print(part2(inputs))
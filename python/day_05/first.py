@@ -50,42 +50,179 @@ In the above example, this is anywhere in the diagram with a 2 or larger - a tot
 Consider only horizontal and vertical lines.
 At how many points do at least two lines overlap?
 """
+import sys
 from collections import namedtuple
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Tuple
 
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.budget import fits, tiles  # noqa: E402
+from aoc.inputs import read_segments  # noqa: E402
+from aoc.shared import get_workers, split  # noqa: E402
+
 Line = namedtuple("Line", ["x1", "y1", "x2", "y2"])
+GRID_DTYPE = np.uint8
+GRID_BYTES_PER_POINT = 2  # a uint8 per point of the grid, and a bool when counting the overlaps
+OVERLAP = 2  # points covered by this many lines or more all count the same, so the counts saturate there
+SATURATION_BATCH = int(np.iinfo(GRID_DTYPE).max) - OVERLAP  # segments drawn between two saturations, no overflow
 
 
 def load_lines_from_input(inputfile: Path) -> List[Line]:
     """Parse lines from input file."""
-    lines = []
-    for segment_text in inputfile.read_text().splitlines():
-        (x1, y1), (x2, y2) = [coords.split(",") for coords in segment_text.split(" -> ")]
-        lines.append(Line(int(x1), int(y1), int(x2), int(y2)))
-    return lines
+    return [Line(*segment) for segment in read_segments(inputfile).tolist()]  # parsed at once as an (n, 4) array
 
 
-def create_grid_from_loaded_lines(lines: List[Line]) -> np.ndarray:
-    """Create a grid of the appropriate size from loaded lines."""
+def parse(inputfile: Path) -> List[Line]:
+    """Returns the vent lines from the input file."""
+    return load_lines_from_input(inputfile)
+
+
+def parsed_to_arrays(lines: List[Line]) -> Dict[str, np.ndarray]:
+    """Returns the vent lines as an (n, 4) array, to save the parsed input in a sidecar (see aoc.sidecars)."""
+    return {"segments": np.array(lines, dtype=np.int64).reshape(-1, 4)}
+
+
+def parsed_from_arrays(arrays: Dict[str, np.ndarray]) -> List[Line]:
+    """Returns the vent lines from the arrays of a sidecar."""
+    return [Line(*segment) for segment in arrays["segments"].tolist()]
+
+
+def get_grid_shape(lines: List[Line]) -> Tuple[int, int]:
+    """Returns the shape of the grid holding all the lines."""
     max_x = max(max(line.x1, line.x2) for line in lines)
     max_y = max(max(line.y1, line.y2) for line in lines)
-    return np.zeros(shape=(max_x + 1, max_y + 1), dtype=int)
+    return max_x + 1, max_y + 1
 
 
-if __name__ == "__main__":
-    lines = load_lines_from_input(Path("inputs.txt"))
+def create_grid_from_loaded_lines(lines: List[Line]) -> np.ndarray:
+    """Create a grid of the appropriate size from loaded lines."""
+    return np.zeros(shape=get_grid_shape(lines), dtype=GRID_DTYPE)
+
+
+def get_straight_segments(lines: List[Line]) -> np.ndarray:
+    """Returns the horizontal and vertical lines as an (n, 4) array, leaving out single points as part 1 does."""
+    straight = [line for line in lines if (line.x1 == line.x2) != (line.y1 == line.y2)]
+    return np.array(straight, dtype=np.int64).reshape(-1, 4)
+
+
+def clip_segments(segments: np.ndarray, rows: slice, cols: slice) -> np.ndarray:
+    """
+    Returns the parts of the horizontal, vertical or diagonal segments (rows of x1, y1, x2, y2) inside
+    a tile of the grid, in the coordinates of the tile. Segments missing the tile are left out.
+    """
+    x1, y1, x2, y2 = segments.T
+    x_dir, y_dir = np.sign(x2 - x1), np.sign(y2 - y1)
+    length = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1))
+    first, last = np.zeros_like(length), length.copy()  # range of the steps from (x1, y1) inside the tile
+
+    for start, direction, bounds in ((x1, x_dir, rows), (y1, y_dir, cols)):
+        # Steps keeping the coordinate within the bounds: all of them or none if it doesn't change along the segment
+        inside = (bounds.start <= start) & (start < bounds.stop)
+        lowest = np.select(
+            [direction > 0, direction < 0, inside], [bounds.start - start, start - bounds.stop + 1, 0], length + 1
+        )
+        highest = np.select([direction > 0, direction < 0], [bounds.stop - 1 - start, start - bounds.start], length)
+        first, last = np.maximum(first, lowest), np.minimum(last, highest)
+
+    kept = first <= last
+    x1, y1, x_dir, y_dir, first, last = (array[kept] for array in (x1, y1, x_dir, y_dir, first, last))
+    return np.stack(
+        [
+            x1 + first * x_dir - rows.start,
+            y1 + first * y_dir - cols.start,
+            x1 + last * x_dir - rows.start,
+            y1 + last * y_dir - cols.start,
+        ],
+        axis=1,
+    )
+
+
+def draw_straight_segments(grid: np.ndarray, segments: np.ndarray) -> None:
+    """Adds 1 to the points of the grid covered by each horizontal or vertical segment (or single point), inplace."""
+    for x1, y1, x2, y2 in segments.tolist():
+        grid[min(x1, x2) : max(x1, x2) + 1, min(y1, y2) : max(y1, y2) + 1] += 1
+
+
+def draw_saturating(
+    grid: np.ndarray, segments: np.ndarray, draw_segments: Callable[[np.ndarray, np.ndarray], None]
+) -> None:
+    """
+    Draws the segments on the grid of uint8 with the given function, by batches small enough for the
+    counts not to wrap around, saturating them at OVERLAP after each batch.
+    """
+    for start in range(0, len(segments), SATURATION_BATCH):
+        draw_segments(grid, segments[start : start + SATURATION_BATCH])
+        np.minimum(grid, OVERLAP, out=grid)
+
+
+def count_overlaps_by_tiles(
+    shape: Tuple[int, int], *layers: Tuple[np.ndarray, Callable[[np.ndarray, np.ndarray], None]]
+) -> List[int]:
+    """
+    Draws layers of segments on a grid of the given shape, one tile within the memory budget at a time
+    (see aoc.budget), with the function given for each layer. Returns the number of points where at
+    least two segments overlap once each layer is drawn.
+    """
+    overlaps = [0] * len(layers)
+    for rows, cols in tiles(shape, GRID_BYTES_PER_POINT):
+        tile = np.zeros((rows.stop - rows.start, cols.stop - cols.start), dtype=GRID_DTYPE)
+        for index, (segments, draw_segments) in enumerate(layers):
+            draw_saturating(tile, clip_segments(segments, rows, cols), draw_segments)
+            overlaps[index] += int(np.count_nonzero(tile >= OVERLAP))
+    return overlaps
+
+
+def draw_band(
+    rows: slice, grid: np.ndarray, layers: Tuple[Tuple[np.ndarray, Callable[[np.ndarray, np.ndarray], None]], ...]
+) -> List[int]:
+    """
+    Runs in a worker: draws the layers of segments clipped to the band of rows it owns of the shared
+    grid, and returns the number of points of the band where at least two segments overlap after each layer.
+    """
+    band = grid[rows]
+    overlaps = []
+    for segments, draw_segments in layers:
+        draw_saturating(band, clip_segments(segments, rows, slice(0, grid.shape[1])), draw_segments)
+        overlaps.append(int(np.count_nonzero(band >= OVERLAP)))
+    return overlaps
+
+
+def count_overlaps_sharded(
+    shape: Tuple[int, int], *layers: Tuple[np.ndarray, Callable[[np.ndarray, np.ndarray], None]]
+) -> List[int]:
+    """
+    Same as count_overlaps_by_tiles, on a whole grid in shared memory split in bands of rows between
+    the workers (see aoc.shared), which read the same shared segments and each draw their own band.
+    """
+    from aoc.shared import SharedArrays  # only the sharded path needs it
+
+    with SharedArrays() as shared:
+        shared_layers = tuple((shared.share(segments), draw_segments) for segments, draw_segments in layers)
+        bands = shared.map(
+            draw_band, split(shape[0], get_workers()), grid=shared.zeros(shape, GRID_DTYPE), layers=shared_layers
+        )
+    return [sum(band[index] for band in bands) for index in range(len(layers))]
+
+
+def part1(lines: List[Line]) -> int:
+    """Counts the points where at least two horizontal or vertical lines overlap."""
+    shape = get_grid_shape(lines)
+    if not fits(shape[0] * shape[1] * GRID_BYTES_PER_POINT):  # the grid doesn't fit in memory, draw it by tiles
+        return count_overlaps_by_tiles(shape, (get_straight_segments(lines), draw_straight_segments))[0]
+    if get_workers() > 1:
+        return count_overlaps_sharded(shape, (get_straight_segments(lines), draw_straight_segments))[0]
+
     grid = create_grid_from_loaded_lines(lines)
 
-    # Go through lines, add 1 to the relevant blocks in the grid
-    for line in lines:
-        if (line.x1 == line.x2) or (line.y1 == line.y2):  # horizontal or vertical lines
-            if (line.x1 < line.x2) or (line.y1 < line.y2):  # left -> right or top -> bottom
-                grid[line.x1 : line.x2 + 1, line.y1 : line.y2 + 1] += 1
-            elif (line.x1 > line.x2) or (line.y1 > line.y2):  # right -> left or bottom -> top
-                grid[line.x2 : line.x1 + 1, line.y2 : line.y1 + 1] += 1
+    # Go through horizontal and vertical lines, add 1 to the relevant blocks in the grid
+    draw_saturating(grid, get_straight_segments(lines), draw_straight_segments)
 
     # Number of points with at least 2 lines overlapping -> value in grid is > 1
-    print(np.count_nonzero(grid > 1))
+    return int(np.count_nonzero(grid >= OVERLAP))
+
+
+if __name__ == "__main__":
+    lines = parse(Path("inputs.txt"))
+    print(part1(lines))
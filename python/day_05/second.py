@@ -29,55 +29,191 @@ In the above example, this is still anywhere in the diagram with a 2 or larger -
 Consider all of the lines. 
 At how many points do at least two lines overlap?
 """
+import sys
 from collections import namedtuple
 from pathlib import Path
-from typing import List
+from types import ModuleType
+from typing import Callable, List, Tuple
 
 import numpy as np
+from first import (
+    GRID_BYTES_PER_POINT,
+    GRID_DTYPE,
+    OVERLAP,
+    count_overlaps_by_tiles,
+    count_overlaps_sharded,
+    draw_saturating,
+    get_grid_shape,
+    get_straight_segments,
+    parsed_from_arrays,
+    parsed_to_arrays,
+)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.budget import fits  # noqa: E402
+from aoc.inputs import read_segments  # noqa: E402
+from aoc.shared import get_workers  # noqa: E402
 
 Line = namedtuple("Line", ["x1", "y1", "x2", "y2"])
 
 
 def load_lines_from_input(inputfile: Path) -> List[Line]:
     """Parse lines from input file."""
-    lines = []
-    for segment_text in inputfile.read_text().splitlines():
-        (x1, y1), (x2, y2) = [coords.split(",") for coords in segment_text.split(" -> ")]
-        lines.append(Line(int(x1), int(y1), int(x2), int(y2)))
-    return lines
+    return [Line(*segment) for segment in read_segments(inputfile).tolist()]  # parsed at once as an (n, 4) array
+
+
+def parse(inputfile: Path) -> List[Line]:
+    """Returns the vent lines from the input file."""
+    return load_lines_from_input(inputfile)
 
 
 def create_grid_from_loaded_lines(lines: List[Line]) -> np.ndarray:
     """Create a grid of the appropriate size from loaded lines."""
     max_x = max(max(line.x1, line.x2) for line in lines)
     max_y = max(max(line.y1, line.y2) for line in lines)
-    return np.zeros(shape=(max_x + 1, max_y + 1), dtype=int)
+    return np.zeros(shape=(max_x + 1, max_y + 1), dtype=GRID_DTYPE)
 
 
-if __name__ == "__main__":
+def _draw_straight_segments_loops(grid: np.ndarray, segments: np.ndarray) -> None:
+    """Same as draw_straight_segments, point by point, to be compiled by the numba backend."""
+    for index in range(segments.shape[0]):
+        x1, y1, x2, y2 = segments[index, 0], segments[index, 1], segments[index, 2], segments[index, 3]
+        for x in range(min(x1, x2), max(x1, x2) + 1):
+            for y in range(min(y1, y2), max(y1, y2) + 1):
+                grid[x, y] += 1
+
+
+def _draw_segments_taichi(ti: ModuleType) -> Callable[[np.ndarray, np.ndarray], None]:
+    """
+    Taichi version of draw_straight_segments and draw_diagonal_segments: segments are drawn in
+    parallel, one step of both coordinates towards the end at a time, with atomic additions.
+    """
+
+    @ti.kernel
+    def draw_segments(grid: ti.types.ndarray(ndim=2), segments: ti.types.ndarray(ndim=2)):
+        for index in range(segments.shape[0]):  # the outermost loop runs in parallel
+            x1, y1, x2, y2 = segments[index, 0], segments[index, 1], segments[index, 2], segments[index, 3]
+            x_dir = ti.select(x1 > x2, -1, ti.select(x1 < x2, 1, 0))
+            y_dir = ti.select(y1 > y2, -1, ti.select(y1 < y2, 1, 0))
+            length = ti.cast(ti.max(ti.abs(x2 - x1), ti.abs(y2 - y1)), ti.i32)  # ranges are of 32 bits integers
+            for step in range(length + 1):
+                # Adds a u8 as the grid holds, the counts are kept from wrapping by the batches of draw_saturating
+                ti.atomic_add(grid[x1 + step * x_dir, y1 + step * y_dir], ti.cast(1, ti.u8))
+
+    return draw_segments
+
+
+@kernel(loops=_draw_straight_segments_loops, taichi=_draw_segments_taichi)
+def draw_straight_segments(grid: np.ndarray, segments: np.ndarray) -> None:
+    """Adds 1 to the points of the grid covered by each horizontal or vertical segment (or single point), inplace."""
+    for x1, y1, x2, y2 in segments.tolist():
+        if (x1 <= x2) and (y1 <= y2):  # left -> right or top -> bottom
+            grid[x1 : x2 + 1, y1 : y2 + 1] += 1
+        else:  # right -> left or bottom -> top
+            grid[x2 : x1 + 1, y2 : y1 + 1] += 1
+
+
+def draw_straight_lines(grid: np.ndarray, lines: List[Line]) -> None:
+    """Adds 1 to the points of the grid covered by each horizontal or vertical line, saturating at OVERLAP, inplace."""
+    draw_saturating(grid, get_straight_segments(lines), draw_straight_segments)  # single points are left out
+
+
+def _draw_diagonal_segments_loops(grid: np.ndarray, segments: np.ndarray) -> None:
+    """Same as draw_diagonal_segments, indexing the array of segments, to be compiled by the numba backend."""
+    for index in range(segments.shape[0]):
+        x1, y1, x2, y2 = segments[index, 0], segments[index, 1], segments[index, 2], segments[index, 3]
+        x_dir = -1 if x1 > x2 else 1
+        y_dir = -1 if y1 > y2 else 1
+        for step in range(abs(x2 - x1) + 1):
+            grid[x1 + step * x_dir, y1 + step * y_dir] += 1
+
+
+@kernel(loops=_draw_diagonal_segments_loops, taichi=_draw_segments_taichi)
+def draw_diagonal_segments(grid: np.ndarray, segments: np.ndarray) -> None:
+    """Adds 1 to the points of the grid covered by each diagonal segment, given as rows of x1, y1, x2, y2, inplace."""
+    for x1, y1, x2, y2 in segments.tolist():  # plain ints are faster than numpy scalars one at a time
+        # Find out if coordinates are increasing or decreasing
+        x_dir = -1 if x1 > x2 else 1
+        y_dir = -1 if y1 > y2 else 1
+
+        # Return coordinate pairs, with each coordinate changing one unit at a time
+        # (according to whether it is increasing or decreasing)
+        xy_range = zip(range(x1, x2 + x_dir, x_dir), range(y1, y2 + y_dir, y_dir))
+        for x, y in xy_range:  # add one to each point
+            grid[x, y] += 1
+
+
+def get_diagonal_segments(lines: List[Line]) -> np.ndarray:
+    """Returns the diagonal lines as an (n, 4) array."""
+    diagonals = [line for line in lines if (line.x1 != line.x2) and (line.y1 != line.y2)]  # diagonal lines
+    return np.array(diagonals, dtype=np.int64).reshape(-1, 4)
+
+
+def draw_diagonal_lines(grid: np.ndarray, lines: List[Line]) -> None:
+    """Adds 1 to the points of the grid covered by each diagonal line, saturating at OVERLAP, inplace."""
+    draw_saturating(grid, get_diagonal_segments(lines), draw_diagonal_segments)
+
+
+def get_layers(lines: List[Line]) -> Tuple[Tuple[np.ndarray, Callable[[np.ndarray, np.ndarray], None]], ...]:
+    """Returns the straight and the diagonal segments, each with the function drawing them."""
+    return (get_straight_segments(lines), draw_straight_segments), (
+        get_diagonal_segments(lines),
+        draw_diagonal_segments,
+    )
+
+
+def count_overlaps_within_budget(lines: List[Line]) -> Tuple[int, int]:
+    """
+    Returns the number of points where at least two lines overlap, before and after drawing the diagonals,
+    drawing the grid by tiles if it doesn't fit in the memory budget at once (see aoc.budget).
+    """
+    overlaps = count_overlaps_by_tiles(get_grid_shape(lines), *get_layers(lines))
+    return overlaps[0], overlaps[1]
+
+
+def count_overlaps_with_workers(lines: List[Line]) -> Tuple[int, int]:
+    """Same as count_overlaps_within_budget, the bands of the grid being drawn by the workers (see aoc.shared)."""
+    overlaps = count_overlaps_sharded(get_grid_shape(lines), *get_layers(lines))
+    return overlaps[0], overlaps[1]
+
+
+def grid_fits(lines: List[Line]) -> bool:
+    """Returns whether the whole grid fits in the memory budget."""
+    rows, cols = get_grid_shape(lines)
+    return fits(rows * cols * GRID_BYTES_PER_POINT)
+
+
+def part2(lines: List[Line]) -> int:
+    """Counts the points where at least two lines overlap, diagonals included."""
+    if not grid_fits(lines):
+        return count_overlaps_within_budget(lines)[1]
+    if get_workers() > 1:
+        return count_overlaps_with_workers(lines)[1]
+
     # Same as first part, more cases to consider
-    lines = load_lines_from_input(Path("inputs.txt"))
     grid = create_grid_from_loaded_lines(lines)
-
-    # Go through lines, add 1 to the relevant blocks in the grid
-    for line in lines:
-        if (line.x1 == line.x2) or (line.y1 == line.y2):  # horizontal or vertical lines
-            if (line.x1 < line.x2) or (line.y1 < line.y2):  # left -> right or top -> bottom
-                grid[line.x1 : line.x2 + 1, line.y1 : line.y2 + 1] += 1
-            elif (line.x1 > line.x2) or (line.y1 > line.y2):  # right -> left or bottom -> top
-                grid[line.x2 : line.x1 + 1, line.y2 : line.y1 + 1] += 1
-
-        # ----- Part 2 ----- #
-        elif (line.x1 != line.x2) and (line.y1 != line.y2):  # diagonal lines
-            # Find out if coordinates are increasing or decreasing
-            x_dir = -1 if line.x1 > line.x2 else 1
-            y_dir = -1 if line.y1 > line.y2 else 1
-
-            # Return coordinate pairs, with each coordinate changing one unit at a time
-            # (according to whether it is increasing or decreasing)
-            xy_range = zip(range(line.x1, line.x2 + x_dir, x_dir), range(line.y1, line.y2 + y_dir, y_dir))
-            for x, y in xy_range:  # add one to each point
-                grid[x, y] += 1
+    draw_straight_lines(grid, lines)
+    draw_diagonal_lines(grid, lines)  # ----- Part 2 ----- #
 
     # Number of points with at least 2 lines overlapping -> value in grid is > 1
-    print(np.count_nonzero(grid > 1))
+    return int(np.count_nonzero(grid >= OVERLAP))
+
+
+def both_parts(lines: List[Line]) -> Tuple[int, int]:
+    """Returns the answers of both parts, counting overlaps before and after drawing the diagonals on the same grid."""
+    if not grid_fits(lines):
+        return count_overlaps_within_budget(lines)
+    if get_workers() > 1:
+        return count_overlaps_with_workers(lines)
+
+    grid = create_grid_from_loaded_lines(lines)
+    draw_straight_lines(grid, lines)
+    overlaps = int(np.count_nonzero(grid >= OVERLAP))  # part 1 stops here
+    draw_diagonal_lines(grid, lines)
+    return overlaps, int(np.count_nonzero(grid >= OVERLAP))
+
+
+if __name__ == "__main__":
+    lines = parse(Path("inputs.txt"))
+    print(part2(lines))
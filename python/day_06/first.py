@@ -64,24 +64,80 @@ In this example, after 18 days, there are a total of 26 fish. After 80 days, the
 Find a way to simulate lanternfish. 
 How many lanternfish would there be after 80 days?
 """
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.inputs import read_int_row  # noqa: E402
 
-def reproduce(initial_fishes: np.ndarray, days: int) -> np.ndarray:
-    """Reproduce the fishes through the days, return the final distribution"""
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the initial lanternfish timers from the input file as a numpy array of ints."""
+    return read_int_row(inputfile)
+
+
+def count_timers(initial_fishes: np.ndarray) -> np.ndarray:
+    """Returns how many fishes there are for each countdown value, from 0 to 8."""
     unique, counts = np.unique(initial_fishes, return_counts=True)  # find how many fishes are for each countdown value
 
-    fishes = np.zeros(9, dtype=int)  # this array will keep count of the number of fishes with each countdown value
+    fishes = np.zeros(9, dtype=np.int64)  # this array will keep count of the number of fishes with each countdown value
     fishes[unique] = counts  # we initialize it with the input
-
+    return fishes
+
+
+@lru_cache()
+def max_growth(days: int) -> int:
+    """Returns how many fishes a single one becomes after `days` days at most, the one starting at 0, exactly."""
+    fishes = [1, 0, 0, 0, 0, 0, 0, 0, 0]
+    for _ in range(days):
+        fishes = fishes[1:] + fishes[:1]
+        fishes[6] += fishes[8]
+    return sum(fishes)
+
+
+def counts_dtype(fishes: np.ndarray, days: int) -> np.dtype:
+    """
+    Returns the dtype the counts can be reproduced in for `days` days: int64 as long as they can't
+    overflow it (up to about 1.4 billion fishes for 256 days), Python ints (object) otherwise.
+    """
+    most = int(fishes.sum(axis=-1).max(initial=0)) * max_growth(days)
+    return np.dtype(np.int64) if most <= np.iinfo(np.int64).max else np.dtype(object)
+
+
+def reproduce_counts(fishes: np.ndarray, days: int) -> np.ndarray:
+    """
+    Reproduce the fishes through the days from their counts per countdown value, return the final counts.
+    Counts are along the last axis, so that a matrix with one row per school is reproduced all at once.
+    """
+    fishes = fishes.astype(counts_dtype(fishes, days))  # a copy, checked for overflows
     for index in range(days):
-        fishes_at_zero = fishes[0]
-        fishes[:-1] = fishes[1:]  # shift the array by 1 as all fishes countdown values decrease
-        fishes[8] = fishes_at_zero  # those that were at 0 spawn new fishes which start at 8
-        fishes[6] += fishes_at_zero  # those that were at 0 reset at 6 after spawning a new fish
-    return np.sum(fishes)
+        fishes_at_zero = fishes[..., 0].copy()
+        fishes[..., :-1] = fishes[..., 1:]  # shift the array by 1 as all fishes countdown values decrease
+        fishes[..., 8] = fishes_at_zero  # those that were at 0 spawn new fishes which start at 8
+        fishes[..., 6] += fishes_at_zero  # those that were at 0 reset at 6 after spawning a new fish
+    return fishes
+
+
+def reproduce(initial_fishes: np.ndarray, days: int) -> np.ndarray:
+    """Reproduce the fishes through the days, return the final distribution"""
+    return np.sum(reproduce_counts(count_timers(initial_fishes), days))
+
+
+def part1(initial_lanternfishes: np.ndarray) -> int:
+    """Returns the number of lanternfishes after 80 days."""
+    return int(reproduce(initial_lanternfishes, 80))
+
+
+def part1_batch(schools: List[np.ndarray]) -> List[int]:
+    """Same as part1 for several inputs, reproduced all at once as a matrix of counts with one row per input."""
+    counts = np.array([count_timers(initial_lanternfishes) for initial_lanternfishes in schools], dtype=np.int64)
+    return reproduce_counts(counts.reshape(-1, 9), 80).sum(axis=1).tolist()
 
 
 if __name__ == "__main__":
-    initial_lanternfishes = np.loadtxt("inputs.txt", delimiter=",", dtype=int)
-    print(reproduce(initial_lanternfishes, 80))
+    initial_lanternfishes = parse(Path("inputs.txt"))
+    print(part1(initial_lanternfishes))
@@ -9,25 +9,45 @@ After 256 days in the example above, there would be a total of 26984457539 lante
 How many lanternfish would there be after 256 days?
 """
 # This is exactly part 1 with a different value call
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
 import numpy as np
+from first import count_timers, reproduce_counts
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.inputs import read_int_row  # noqa: E402
+
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the initial lanternfish timers from the input file as a numpy array of ints."""
+    return read_int_row(inputfile)
 
 
 def reproduce(initial_fishes: np.ndarray, days: int) -> np.ndarray:
     """Reproduce the fishes through the days, return the final distribution"""
-    unique, counts = np.unique(initial_fishes, return_counts=True)  # find how many fishes are for each countdown value
+    return np.sum(reproduce_counts(count_timers(initial_fishes), days))
+
+
+def part2(initial_lanternfishes: np.ndarray) -> int:
+    """Returns the number of lanternfishes after 256 days."""
+    return int(reproduce(initial_lanternfishes, 256))
+
+
+def part2_batch(schools: List[np.ndarray]) -> List[int]:
+    """Same as part2 for several inputs, reproduced all at once as a matrix of counts with one row per input."""
+    counts = np.array([count_timers(initial_lanternfishes) for initial_lanternfishes in schools], dtype=np.int64)
+    return reproduce_counts(counts.reshape(-1, 9), 256).sum(axis=1).tolist()
 
-    # This array will keep count of the number of fishes with each countdown value
-    fishes = np.zeros(9, dtype=int)
-    fishes[unique] = counts  # we initialize it with the input
 
-    for index in range(days):
-        fishes_at_zero = fishes[0]
-        fishes[:-1] = fishes[1:]  # shift the array by 1 as all fishes countdown values decrease
-        fishes[8] = fishes_at_zero  # those that were at 0 spawn new fishes which start at 8
-        fishes[6] += fishes_at_zero  # those that were at 0 reset at 6 after spawning a new fish
-    return np.sum(fishes)
+def both_parts(initial_lanternfishes: np.ndarray) -> Tuple[int, int]:
+    """Returns the numbers of lanternfishes after 80 and 256 days, the latter reproduced from the former."""
+    after_80_days = reproduce_counts(count_timers(initial_lanternfishes), 80)
+    after_256_days = reproduce_counts(after_80_days, 256 - 80)
+    return int(np.sum(after_80_days)), int(np.sum(after_256_days))
 
 
 if __name__ == "__main__":
-    initial_lanternfishes = np.loadtxt("inputs.txt", delimiter=",", dtype=int)
-    print(reproduce(initial_lanternfishes, 256))
+    initial_lanternfishes = parse(Path("inputs.txt"))
+    print(part2(initial_lanternfishes))
@@ -42,10 +42,25 @@ position 1 (41 fuel), position 3 (39 fuel), or position 10 (71 fuel).
 Determine the horizontal position that the crabs can align to using the least fuel possible. 
 How much fuel must they spend to align to that position?
 """
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.budget import chunk_length  # noqa: E402
+from aoc.inputs import read_int_row  # noqa: E402
+
+DISTANCES_BYTES_PER_CELL = 24  # peak memory per distance: the list of lists, the matrix and a temporary (measured)
+
 
-def get_distances_arrays(original_positions: np.ndarray) -> np.ndarray:
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the original horizontal positions of the crabs from the input file as a numpy array of ints."""
+    return read_int_row(inputfile)
+
+
+def get_distances_arrays(original_positions: np.ndarray, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
     """
     Given the original horizontal positions, calculates for each submarine the distance to each position.
     The distance is the absolute value of the difference between the two elements.
@@ -55,13 +70,41 @@ def get_distances_arrays(original_positions: np.ndarray) -> np.ndarray:
     The first entry hold the distance of each element to the horizontal position 0.
     The second entry holds the distance of each element to the horizontal position 1.
     Etc...
+
+    Only the horizontal positions from `start` to `stop` (excluded) are computed if given.
     """
-    distance_array = np.array([[x] * original_positions.shape[0] for x in np.arange(0, np.max(original_positions))])
+    stop = np.max(original_positions) + 1 if stop is None else stop  # the farthest crab may be where they align
+    distance_array = np.array([[x] * original_positions.shape[0] for x in np.arange(start, stop)])
     return np.abs(distance_array - original_positions)
 
 
+def get_fuel_costs(
+    original_positions: np.ndarray,
+    fuel_cost_from_distance: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    bytes_per_cell: int = DISTANCES_BYTES_PER_CELL,
+) -> np.ndarray:
+    """
+    Returns the fuel cost for all crabs to align on each horizontal position, from the distances
+    arrays of as many positions at a time as the memory budget allows (see aoc.budget), all of them
+    without a budget. The fuel cost of a move is its distance, unless a function is given.
+    """
+    n_positions = int(np.max(original_positions)) + 1
+    step = chunk_length(n_positions, original_positions.size * bytes_per_cell)
+    fuel_costs = []
+    for start in range(0, n_positions, step):
+        distances_array = get_distances_arrays(original_positions, start, min(start + step, n_positions))
+        if fuel_cost_from_distance is not None:
+            distances_array = fuel_cost_from_distance(distances_array)
+        fuel_costs.append(distances_array.sum(axis=1))  # sum all moves necessary to get to each position
+    return np.concatenate(fuel_costs)
+
+
+def part1(original_positions: np.ndarray) -> int:
+    """Returns the minimum fuel cost for all crabs to align, with a constant cost per move."""
+    fuel_costs = get_fuel_costs(original_positions)  # fuel costs to get to each position
+    return int(min(fuel_costs))  # minimum fuel cost of all possible combinations
+
+
 if __name__ == "__main__":
-    original_positions = np.loadtxt("inputs.txt", delimiter=",", dtype=int)
-    distances_array = get_distances_arrays(original_positions)
-    fuel_costs = distances_array.sum(axis=1)  # sum all moves necessary to get to each position to get the fuel costs for each
-    print(min(fuel_costs))  # minimum fuel cost of all possible combinations
+    original_positions = parse(Path("inputs.txt"))
+    print(part1(original_positions))
@@ -29,7 +29,12 @@ How much fuel must they spend to align to that position?
 # This is essentially part 1 but with a different way to calculate the fuel cost
 # Note: crabs have very bad engineering in these submarines!
 
+from pathlib import Path
+
 import numpy as np
+from first import get_fuel_costs, parse  # the same parsing, and distances by chunks within the memory budget
+
+DISTANCES_BYTES_PER_CELL = 80  # peak memory per distance: the vectorized fuel cost goes through Python objects
 
 
 def fuel_cost_from_distance(n: int) -> int:
@@ -40,25 +45,13 @@ def fuel_cost_from_distance(n: int) -> int:
 fuel_cost_from_distance = np.vectorize(fuel_cost_from_distance)
 
 
-def get_distances_arrays(original_positions: np.ndarray) -> np.ndarray:
-    """
-    Given the original horizontal positions, calculates for each submarine the distance to each position.
-    The distance is the absolute value of the difference between the two elements.
-    The returned array is a matrix of size (original_positions.size, original_positions.size), and each
-    entry is an array with the distances to a given horizontal position.
-
-    The first entry hold the distance of each element to the horizontal position 0.
-    The second entry holds the distance of each element to the horizontal position 1.
-    Etc...
-    """
-    distance_array = np.array([[x] * original_positions.shape[0] for x in np.arange(0, np.max(original_positions))])
-    return np.abs(distance_array - original_positions)
+def part2(original_positions: np.ndarray) -> int:
+    """Returns the minimum fuel cost for all crabs to align, with the increasing cost per move."""
+    # Fuel costs to get to each position, summing the cost of all moves necessary to get there
+    fuel_costs = get_fuel_costs(original_positions, fuel_cost_from_distance, DISTANCES_BYTES_PER_CELL)
+    return int(min(fuel_costs))  # minimum fuel cost of all possible combinations
 
 
 if __name__ == "__main__":
-    original_positions = np.loadtxt("inputs.txt", delimiter=",", dtype=int)
-    distances_array = get_distances_arrays(original_positions)
-    fuel_costs = fuel_cost_from_distance(distances_array).sum(
-        axis=1
-    )  # sum all moves necessary to get to each position to get the fuel costs for each
-    print(min(fuel_costs))  # minimum fuel cost of all possible combinations
+    original_positions = parse(Path("inputs.txt"))
+    print(part2(original_positions))
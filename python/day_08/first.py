@@ -90,8 +90,17 @@ of segments (highlighted above).
 
 In the output values, how many times do digits 1, 4, 7, or 8 appear?
 """
+import sys
 from pathlib import Path
-from typing import List
+from typing import IO, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_line_chunks  # noqa: E402
+
+
+def parse(inputfile: Path) -> List[str]:
+    """Returns the notes from the input file, one entry per line."""
+    return inputfile.read_text().splitlines()
 
 
 def read_line_output_digits(line) -> List[str]:
@@ -101,11 +110,25 @@ def read_line_output_digits(line) -> List[str]:
 
 # The solution is to count the number of output digits that are 1, 4, 7 or 8; which
 # means counting the digits with 2, 4, 3 or 7 segments (letters) in the second part of the line.
-if __name__ == "__main__":
+def part1(inputs: List[str]) -> int:
+    """Counts the output digits that are a 1, 4, 7 or 8."""
     amount = 0
-    for line in Path("inputs.txt").read_text().splitlines():
+    for line in inputs:
         output_digits = read_line_output_digits(line)
         for digit in output_digits:
             if len(digit) in (2, 4, 3, 7):
                 amount += 1
-    print(amount)
+    return amount
+
+
+def part1_stream(stream: IO) -> int:
+    """Same as part1, reading the notes from a stream by chunks."""
+    return sum(part1(lines) for lines in iter_line_chunks(stream))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python first.py -
+        print(part1_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part1(inputs))
@@ -60,10 +60,21 @@ What do you get if you add up all of the output values?
 # Note: the digits segments need to be turned on but not in a specific order, so for instance 'cfbegad' and 'fdgacbe' are the same digit.
 # To circumvent this, let's use sets and frozensets when manipulating the digits, to take order out of the equation, and because these are
 # hashable so I can use them in mappings
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import IO, Dict, List, Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_line_chunks  # noqa: E402
+from aoc.tracing import traced  # noqa: E402
 
+
+def parse(inputfile: Path) -> List[str]:
+    """Returns the notes from the input file, one entry per line."""
+    return inputfile.read_text().splitlines()
+
+
+@traced
 def deduce_pattern(patterns: List[Tuple[frozenset, int]]) -> Dict[str, str]:
     """
     Given a parsed input line, deduces the pattern and returns the determined mapping of pattern -> digit.
@@ -135,8 +146,22 @@ def solve_line(line: str) -> int:
     return int(output_value_string)
 
 
-if __name__ == "__main__":
+def part2(inputs: List[str]) -> int:
+    """Solves the wires mixup of every line and returns the sum of the output values."""
     total_sum = 0
-    for line in Path("inputs.txt").read_text().splitlines():
+    for line in inputs:
         total_sum += solve_line(line)
-    print(total_sum)
+    return total_sum
+
+
+def part2_stream(stream: IO) -> int:
+    """Same as part2, reading the notes from a stream by chunks."""
+    return sum(part2(lines) for lines in iter_line_chunks(stream))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python second.py -
+        print(part2_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part2(inputs))
@@ -31,35 +31,90 @@ The sum of the risk levels of all low points in the heightmap is therefore 15.
 Find all of the low points on your heightmap. 
 What is the sum of the risk levels of all low points on your heightmap?
 """
-from typing import List, Tuple
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
 
 import numpy as np
 
-
-def find_neighbours_indices(x: int, y: int, inputs_shape: Tuple[int, int]) -> List[Tuple[int, int]]:
-    """
-    Given the indices for a point at position [x, y] in the array,
-    returns the indices of its valid neighbours (no diagonal neighbours).
-    """
-    neighbour_indices = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-    return [(a, b) for a, b in neighbour_indices if 0 <= a < inputs_shape[0] and 0 <= b < inputs_shape[1]]
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.grids import neighbour_views, pad  # noqa: E402
+from aoc.inputs import read_digit_grid  # noqa: E402
+
+BORDER_HEIGHT = 10  # higher than any point, so that the border of the map never prevents a low point
+
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the heightmap from the input file as a 2D numpy array of uint8."""
+    return read_digit_grid(inputfile)
+
+
+def _find_low_points_mask_loops(heightmap: np.ndarray) -> np.ndarray:
+    """Same as find_low_points_mask, point by point, to be compiled by the numba backend."""
+    rows, cols = heightmap.shape
+    padded = np.full((rows + 2, cols + 2), BORDER_HEIGHT, dtype=heightmap.dtype)  # no bounds checks this way
+    padded[1:-1, 1:-1] = heightmap
+    is_low_point = np.empty((rows, cols), dtype=np.bool_)
+    for x in range(rows):
+        for y in range(cols):
+            height = padded[x + 1, y + 1]
+            # Bitwise & rather than 'and': without branches, the loop is vectorized by the compiler
+            is_low_point[x, y] = (
+                (height < padded[x, y + 1])
+                & (height < padded[x + 2, y + 1])
+                & (height < padded[x + 1, y])
+                & (height < padded[x + 1, y + 2])
+            )
+    return is_low_point
+
+
+def _find_low_points_mask_taichi(ti: ModuleType) -> Callable[[np.ndarray], np.ndarray]:
+    """Taichi version of find_low_points_mask, comparing all points to their neighbours in parallel."""
+
+    @ti.kernel
+    def mark_low_points(padded: ti.types.ndarray(ndim=2), is_low_point: ti.types.ndarray(dtype=ti.u1, ndim=2)):
+        for x, y in is_low_point:
+            height = padded[x + 1, y + 1]
+            is_low_point[x, y] = ti.cast(
+                (height < padded[x, y + 1])
+                & (height < padded[x + 2, y + 1])
+                & (height < padded[x + 1, y])
+                & (height < padded[x + 1, y + 2]),
+                ti.u1,
+            )
+
+    def find_low_points_mask(heightmap: np.ndarray) -> np.ndarray:
+        is_low_point = np.empty(heightmap.shape, dtype=bool)
+        mark_low_points(pad(heightmap, fill=BORDER_HEIGHT), is_low_point)  # no bounds checks this way
+        return is_low_point
+
+    return find_low_points_mask
+
+
+@kernel(loops=_find_low_points_mask_loops, taichi=_find_low_points_mask_taichi)
+def find_low_points_mask(heightmap: np.ndarray) -> np.ndarray:
+    """Returns the boolean mask of the low points of the heightmap."""
+    # Rather than iterating through the whole array, compare all points at once to their neighbours in each
+    # direction, which are shifted views of the padded heightmap
+    is_low_point = np.ones(heightmap.shape, dtype=bool)
+    for neighbours in neighbour_views(pad(heightmap, fill=BORDER_HEIGHT), connectivity=4):
+        is_low_point &= heightmap < neighbours  # should be smaller than all neighbours to be a low point
+    return is_low_point
 
 
 def find_low_points_indices(heightmap: np.ndarray) -> np.ndarray:
-    """Determine low points and return the list of their locations' indices."""
-    low_points_indices = []
+    """Determine low points and return the array of their locations' indices, one (x, y) row per low point."""
+    return np.argwhere(find_low_points_mask(heightmap))
+
 
-    # Just iterate through the whole array, and check against the neighbours at each position
-    for x in range(heightmap.shape[0]):
-        for y in range(heightmap.shape[1]):
-            neighbours = find_neighbours_indices(x, y, heightmap.shape)
-            # should be smaller than all neighbours to be a low point
-            if all(heightmap[x, y] < heightmap[a][b] for a, b in neighbours):
-                low_points_indices.append((x, y))
-    return low_points_indices
+def part1(heights_map: np.ndarray) -> int:
+    """Returns the sum of the risk levels of all low points."""
+    low_points_indices = find_low_points_indices(heights_map)
+    return int(np.sum(heights_map[tuple(low_points_indices.T)] + 1))
 
 
 if __name__ == "__main__":
-    heights_map = np.genfromtxt("inputs.txt", delimiter=1, dtype=int)  # 2D array of the inputs as integers
-    low_points_indices = find_low_points_indices(heights_map)
-    print(sum(heights_map[a][b] + 1 for a, b in low_points_indices))
+    heights_map = parse(Path("inputs.txt"))  # 2D array of the inputs as integers
+    print(part1(heights_map))
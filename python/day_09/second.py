@@ -47,31 +47,175 @@ In the above example, this is 9 * 14 * 9 = 1134.
 
 What do you get if you multiply together the sizes of the three largest basins?
 """
-from typing import Set, Tuple
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, List, Optional, Set, Tuple
 
 import numpy as np
-from first import find_low_points_indices, find_neighbours_indices  # let's use these again
+from first import find_low_points_indices, parse  # let's use these again
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.grids import MAX_INT32, flat_offsets, pad  # noqa: E402
 
-# This might be ugly but let's do it recursively
-def find_basins(x: int, y: int, heights_map: np.ndarray) -> Set[Tuple[int, int]]:
+
+# This used to be recursive, which was pretty but hit the recursion limit on large basins
+def find_basin(low_point: int, heights: List[int], offsets: List[int]) -> Set[int]:
+    """
+    Given the flat index of a low point in the padded height map (flattened to a list), find all points
+    in its basin and return the set of their flat indices. Neighbours are at the given flat offsets.
+    """
+    basin = {low_point}  # the basin will always include the low point, so we start with that
+    to_visit = [low_point]
+    while to_visit:
+        point = to_visit.pop()
+        for neighbour in (point + offset for offset in offsets):
+            # The neighbour is in the basin if it's higher than the point and if it's lower than a 9, which is
+            # also the height of the border so we never go out of the map. Then we look for its neighbours too.
+            if neighbour not in basin and heights[point] < heights[neighbour] < 9:
+                basin.add(neighbour)
+                to_visit.append(neighbour)
+    return basin
+
+
+def padded_low_points(
+    heights_map: np.ndarray, low_points_indices: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the height map padded with 9s, and the flat indices of its low points in the padded map.
+    The low points are found as in part 1, unless they are given.
+    """
+    if low_points_indices is None:
+        low_points_indices = find_low_points_indices(heights_map)
+    padded = pad(heights_map, fill=9)
+    return padded, np.ravel_multi_index(tuple(low_points_indices.T + 1), padded.shape)
+
+
+def find_basins(heights_map: np.ndarray, low_points_indices: Optional[np.ndarray] = None) -> List[Set[int]]:
+    """
+    Finds the basins of all low points, as sets of flat indices in the padded height map. The low
+    points are found as in part 1, unless they are given.
+    """
+    padded, low_points = padded_low_points(heights_map, low_points_indices)
+    heights = padded.ravel().tolist()  # plain ints are faster than numpy scalars one at a time
+    offsets = flat_offsets(padded.shape, connectivity=4)
+    return [find_basin(low_point, heights, offsets) for low_point in low_points.tolist()]
+
+
+def _basin_sizes_loops(padded: np.ndarray, low_points: np.ndarray) -> np.ndarray:
+    """
+    Same as basin_sizes, marking the points with the last basin they were found in rather than
+    keeping a set per basin, to be compiled by the numba backend.
     """
-    Given the coordinates of a low point in the height map, find all points in its basin and
-    return the set of their coordinates.
+    heights = padded.ravel()
+    cols = padded.shape[1]
+    offsets = (-cols, cols, -1, 1)
+    if heights.size > MAX_INT32:
+        raise OverflowError("the height map has too many points for 32 bits indices")
+    basin_of = np.full(heights.size, -1, dtype=np.int32)
+    stack = np.empty(heights.size, dtype=np.int32)  # each point is visited at most once per basin
+    sizes = np.zeros(low_points.size, dtype=np.int64)
+
+    for basin in range(low_points.size):
+        basin_of[low_points[basin]] = basin
+        stack[0] = low_points[basin]
+        size = 1
+        while size > 0:
+            size -= 1
+            point = stack[size]
+            sizes[basin] += 1
+            for offset in offsets:
+                neighbour = point + offset
+                if basin_of[neighbour] != basin and heights[point] < heights[neighbour] < 9:
+                    basin_of[neighbour] = basin
+                    stack[size] = neighbour
+                    size += 1
+    return sizes
+
+
+def _basin_sizes_taichi(ti: ModuleType) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
     """
-    basin_coordinates = {(x, y)}  # the basin will always include the low point, so we start with that
-    for a, b in find_neighbours_indices(x, y, heights_map.shape):
-        # The neighbour at [a, b] is in the basin if it's higher than point at [x, y] and if it's lower than a 9
-        if heights_map[x, y] < heights_map[a, b] < 9:
-            # We can add the neighbour coordinate to our basin, but we need to also look for its neightbours
-            # so we will recursively find the basins of all neighbours
-            basin_coordinates |= find_basins(a, b, heights_map)
-    return basin_coordinates
+    Taichi version of basin_sizes, as the loop version. Basins are explored one after the other:
+    the same point may be found in several of them, which are marked in the same array.
+    """
+
+    @ti.kernel
+    def measure_basins(
+        heights: ti.types.ndarray(ndim=1),
+        cols: ti.i32,
+        low_points: ti.types.ndarray(ndim=1),
+        basin_of: ti.types.ndarray(dtype=ti.i32, ndim=1),
+        stack: ti.types.ndarray(dtype=ti.i32, ndim=1),
+        sizes: ti.types.ndarray(dtype=ti.i32, ndim=1),
+    ):
+        ti.loop_config(serialize=True)
+        for basin in range(low_points.shape[0]):
+            basin_of[low_points[basin]] = basin
+            stack[0] = ti.cast(low_points[basin], ti.i32)
+            size = 1
+            while size > 0:
+                size -= 1
+                point = stack[size]
+                sizes[basin] += 1
+                for direction in range(4):
+                    offset = -cols  # up, down, left and right
+                    if direction == 1:
+                        offset = cols
+                    elif direction == 2:
+                        offset = -1
+                    elif direction == 3:
+                        offset = 1
+                    neighbour = point + offset
+                    if basin_of[neighbour] != basin and heights[point] < heights[neighbour] < 9:
+                        basin_of[neighbour] = basin
+                        stack[size] = neighbour
+                        size += 1
+
+    def basin_sizes(padded: np.ndarray, low_points: np.ndarray) -> np.ndarray:
+        basin_of = np.full(padded.size, -1, dtype=np.int32)
+        stack = np.empty(padded.size, dtype=np.int32)
+        sizes = np.zeros(low_points.size, dtype=np.int32)
+        measure_basins(padded.ravel(), padded.shape[1], low_points, basin_of, stack, sizes)
+        return sizes.astype(np.int64)
+
+    return basin_sizes
+
+
+@kernel(loops=_basin_sizes_loops, taichi=_basin_sizes_taichi)
+def basin_sizes(padded: np.ndarray, low_points: np.ndarray) -> np.ndarray:
+    """
+    Returns the number of points in the basin of each low point, given by their flat indices in the
+    height map padded with 9s.
+    """
+    heights = padded.ravel().tolist()  # plain ints are faster than numpy scalars one at a time
+    offsets = flat_offsets(padded.shape, connectivity=4)
+    return np.array([len(find_basin(low_point, heights, offsets)) for low_point in low_points.tolist()], dtype=np.int64)
+
+
+def find_basin_sizes(heights_map: np.ndarray, low_points_indices: Optional[np.ndarray] = None) -> np.ndarray:
+    """Returns the sizes of the basins of all low points, found as in part 1 unless they are given."""
+    return basin_sizes(*padded_low_points(heights_map, low_points_indices))
+
+
+def three_largest_basins_product(basin_sizes: np.ndarray) -> int:
+    """Returns the product of the three largest basin sizes."""
+    return int(np.prod(np.sort(basin_sizes)[-3:]))  # multiply the sizes of the 3 biggest basins
+
+
+def part2(heights_map: np.ndarray) -> int:
+    """Returns the product of the sizes of the three largest basins."""
+    all_basin_sizes = find_basin_sizes(heights_map)  # sizes of all basins, from the low points found as in part 1
+    return three_largest_basins_product(all_basin_sizes)
+
+
+def both_parts(heights_map: np.ndarray) -> Tuple[int, int]:
+    """Returns the answers of both parts, finding the low points a single time."""
+    low_points_indices = find_low_points_indices(heights_map)
+    risk_levels = int(np.sum(heights_map[tuple(low_points_indices.T)] + 1))  # as in part 1
+    return risk_levels, three_largest_basins_product(find_basin_sizes(heights_map, low_points_indices))
 
 
 if __name__ == "__main__":
-    heights_map = np.genfromtxt("inputs.txt", delimiter=1, dtype=int)  # 2D array of the inputs as integers
-    low_points_indices = find_low_points_indices(heights_map)  # first find the low points as in part 1
-    all_basins = [find_basins(index[0], index[1], heights_map) for index in low_points_indices]  # get all basins
-    all_basins.sort(key=len, reverse=True)  # sort the basins by length (number of elements in the basin) inplace
-    print(len(all_basins[0]) * len(all_basins[1]) * len(all_basins[2]))  # multiply the lenghts of the 3 biggest ones
+    heights_map = parse(Path("inputs.txt"))  # 2D array of the inputs as integers
+    print(part2(heights_map))
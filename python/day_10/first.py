@@ -68,13 +68,23 @@ file is 6+57+1197+25137 = 26397 points!
 Find the first illegal character in each corrupted line of the navigation subsystem. 
 What is the total syntax error score for those errors?
 """
+import sys
 from collections import deque
 from pathlib import Path
+from typing import IO, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_line_chunks  # noqa: E402
 
 PAIRS = {"(": ")", "[": "]", "{": "}", "<": ">"}
 SCORES = {")": 3, "]": 57, "}": 1197, ">": 25137}
 
 
+def parse(inputfile: Path) -> List[str]:
+    """Returns the navigation subsystem lines from the input file."""
+    return inputfile.read_text().splitlines()
+
+
 def line_score(line: str) -> int:
     """
     Returns the score of a given line, which would be 0 if it is not corrupted.
@@ -87,13 +97,28 @@ def line_score(line: str) -> int:
     for character in line:
         if character in PAIRS:  # opening character
             queue.append(PAIRS[character])  # put its "closing" partner in the queue, which we hope to find later
-        elif character != queue[-1]:  #  closing character, but it doesn't match the last one added in the queue -> corruption
+        elif (
+            character != queue[-1]
+        ):  #  closing character, but it doesn't match the last one added in the queue -> corruption
             return SCORES[character]  # return the score of this character
         elif character == queue[-1]:  # closing character, and it matches the last one in the queue
             queue.pop()  # remove the expected character from the queue and consider that pair done
     return 0  # if we get here, the line is not corrupted
 
 
+def part1(inputs: List[str]) -> int:
+    """Returns the total syntax error score of the corrupted lines."""
+    return sum(line_score(line) for line in inputs)
+
+
+def part1_stream(stream: IO) -> int:
+    """Same as part1, reading the lines from a stream by chunks."""
+    return sum(part1(lines) for lines in iter_line_chunks(stream))
+
+
 if __name__ == "__main__":
-    inputs = Path("inputs.txt").read_text().splitlines()
-    print(sum(line_score(line) for line in inputs))
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python first.py -
+        print(part1_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part1(inputs))
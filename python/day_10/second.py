@@ -51,17 +51,30 @@ In this example, the middle score is 288957 because there are the same number of
 Find the completion string for each incomplete line, score the completion strings, and sort the scores. 
 What is the middle score?
 """
+import sys
 from collections import deque
 from pathlib import Path
 from statistics import median
+from typing import IO, List, Optional, Tuple
+
+from first import SCORES as SYNTAX_ERROR_SCORES
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.streams import iter_line_chunks  # noqa: E402
 
 PAIRS = {"(": ")", "[": "]", "{": "}", "<": ">"}
 SCORES = {")": 1, "]": 2, "}": 3, ">": 4}
 
 
-def line_score(line: str) -> int:
+def parse(inputfile: Path) -> List[str]:
+    """Returns the navigation subsystem lines from the input file."""
+    return inputfile.read_text().splitlines()
+
+
+def check_line(line: str) -> Tuple[Optional[str], deque]:
     """
-    Returns the score of a given line, which would be 0 if it is not corrupted.
+    Returns the first illegal character of a line (None if it is not corrupted), and the queue of the
+    closing characters which are still expected at that point.
     We solve using the fact that any closing character should match the opening character
     directly to its left, or the first opening character to its left once the valid pairs
     been removed.
@@ -72,11 +85,15 @@ def line_score(line: str) -> int:
         if character in PAIRS:  # opening character
             queue.append(PAIRS[character])  # put its "closing" partner in the queue, which we hope to find later
         elif character != queue[-1]:  #  as seen in part 1 -> corrupted line
-            return 0  # return 0 as we don't care about corrupted lines here
+            return character, queue
         elif character == queue[-1]:  # closing character, and it matches the last one in the queue
             queue.pop()  # remove the expected character from the queue and consider that pair done
+    return None, queue
 
-    # By this point, in the queue we have all expected closing characters that we not encountered
+
+def completion_score(queue: deque) -> int:
+    """Returns the score of the closing characters completing a line, from the queue of expected characters."""
+    # In the queue we have all expected closing characters that we not encountered
     # These are the characters that are missing from the line, and we calculate the score from them
     score = 0
     for character in reversed(queue):  # the order in which we added matters because of the multiplication!
@@ -85,9 +102,46 @@ def line_score(line: str) -> int:
     return score
 
 
-if __name__ == "__main__":
-    inputs = Path("inputs.txt").read_text().splitlines()
+def line_score(line: str) -> int:
+    """Returns the completion score of a given line, which would be 0 if it is corrupted."""
+    illegal_character, queue = check_line(line)
+    if illegal_character is not None:
+        return 0  # return 0 as we don't care about corrupted lines here
+    return completion_score(queue)
+
+
+def part2(inputs: List[str]) -> int:
+    """Returns the middle completion score of the incomplete lines."""
     line_scores = [line_score(line) for line in inputs]
     # Keep scores from incomplete lines only, don't keep 0s (corrupted lines scores) as it will affect the median
     non_zero_scores = [score for score in line_scores if score != 0]
-    print(median(non_zero_scores))
+    return median(non_zero_scores)
+
+
+def part2_stream(stream: IO) -> int:
+    """Same as part2, reading the lines from a stream by chunks: only the scores of incomplete lines are kept."""
+    non_zero_scores = []
+    for lines in iter_line_chunks(stream):
+        non_zero_scores.extend(score for score in map(line_score, lines) if score != 0)
+    return median(non_zero_scores)
+
+
+def both_parts(inputs: List[str]) -> Tuple[int, int]:
+    """Returns the answers of both parts, checking each line a single time."""
+    syntax_error_score, completion_scores = 0, []
+    for line in inputs:
+        illegal_character, queue = check_line(line)
+        if illegal_character is not None:  # corrupted line, scored as in part 1
+            syntax_error_score += SYNTAX_ERROR_SCORES[illegal_character]
+        else:
+            completion_scores.append(completion_score(queue))
+    # Complete lines score 0, leave them out of the median as part 2 does
+    return syntax_error_score, median([score for score in completion_scores if score != 0])
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["-"]:  # stream the input from stdin, for instance: cat inputs.txt | python second.py -
+        print(part2_stream(sys.stdin))
+    else:
+        inputs = parse(Path("inputs.txt"))
+        print(part2(inputs))
@@ -311,34 +311,168 @@ After 100 steps, there have been a total of 1656 flashes.
 Given the starting energy levels of the dumbo octopuses in your cavern, simulate 100 steps. 
 How many total flashes are there after 100 steps?
 """
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, List
+
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.grids import count_neighbours, interior, pad  # noqa: E402
+from aoc.inputs import read_digit_grid  # noqa: E402
+from aoc.limits import progress  # noqa: E402
+
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the octopi energy levels from the input file as a 2D numpy array of uint8, with a border of 0s."""
+    return pad(read_digit_grid(inputfile))
+
+
+def _flash_step_loops(energy_levels: np.ndarray) -> np.ndarray:
+    """
+    Same as flash_step, one flash at a time with a stack of the octopi about to flash, to be compiled
+    by the numba backend. Stacks of grids are stepped one grid after the other.
+    """
+    rows, cols = energy_levels.shape[-2], energy_levels.shape[-1]
+    grids = energy_levels.reshape((energy_levels.size // (rows * cols), rows, cols))
+    flashed = np.zeros(grids.shape, dtype=np.bool_)
+    stack = np.empty((rows * cols, 2), dtype=np.int32)  # of coordinates, each octopus flashes at most once
+
+    for grid in range(grids.shape[0]):
+        size = 0
+        for x in range(1, rows - 1):  # the border never gains energy, so it never flashes
+            for y in range(1, cols - 1):
+                grids[grid, x, y] += 1
+                if grids[grid, x, y] > 9:
+                    flashed[grid, x, y] = True
+                    stack[size, 0], stack[size, 1] = x, y
+                    size += 1
+
+        while size > 0:  # each flash gives energy to the neighbours, which may flash in turn
+            size -= 1
+            x, y = stack[size, 0], stack[size, 1]
+            for dx in range(-1, 2):
+                for dy in range(-1, 2):
+                    nx, ny = x + dx, y + dy
+                    if 0 < nx < rows - 1 and 0 < ny < cols - 1 and not flashed[grid, nx, ny]:
+                        grids[grid, nx, ny] += 1
+                        if grids[grid, nx, ny] > 9:
+                            flashed[grid, nx, ny] = True
+                            stack[size, 0], stack[size, 1] = nx, ny
+                            size += 1
+
+        for x in range(1, rows - 1):  # reset all flashers to 0
+            for y in range(1, cols - 1):
+                if flashed[grid, x, y]:
+                    grids[grid, x, y] = 0
+    return flashed.reshape(energy_levels.shape)
+
+
+def _flash_step_taichi(ti: ModuleType) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Taichi version of flash_step, as the loop version: the grids of a stack are stepped in parallel,
+    each of them one flash at a time. Energy levels are worked on as 32 bits integers.
+    """
+
+    @ti.kernel
+    def step_grids(
+        levels: ti.types.ndarray(dtype=ti.i32, ndim=3),
+        flashed: ti.types.ndarray(dtype=ti.u1, ndim=3),
+        stack: ti.types.ndarray(dtype=ti.i32, ndim=3),
+    ):
+        rows, cols = levels.shape[1], levels.shape[2]
+        for grid in range(levels.shape[0]):  # the outermost loop runs in parallel
+            size = 0
+            for x, y in ti.ndrange((1, rows - 1), (1, cols - 1)):  # the border never gains energy, so it never flashes
+                levels[grid, x, y] += 1
+                if levels[grid, x, y] > 9:
+                    flashed[grid, x, y] = ti.cast(1, ti.u1)
+                    stack[grid, size, 0], stack[grid, size, 1] = x, y
+                    size += 1
+
+            while size > 0:  # each flash gives energy to the neighbours, which may flash in turn
+                size -= 1
+                x, y = stack[grid, size, 0], stack[grid, size, 1]
+                for dx, dy in ti.ndrange((-1, 2), (-1, 2)):
+                    nx, ny = x + dx, y + dy
+                    if 0 < nx < rows - 1 and 0 < ny < cols - 1 and not flashed[grid, nx, ny]:
+                        levels[grid, nx, ny] += 1
+                        if levels[grid, nx, ny] > 9:
+                            flashed[grid, nx, ny] = ti.cast(1, ti.u1)
+                            stack[grid, size, 0], stack[grid, size, 1] = nx, ny
+                            size += 1
+
+            for x, y in ti.ndrange(rows, cols):  # reset all flashers to 0
+                if flashed[grid, x, y]:
+                    levels[grid, x, y] = 0
+
+    def flash_step(energy_levels: np.ndarray) -> np.ndarray:
+        rows, cols = energy_levels.shape[-2], energy_levels.shape[-1]
+        levels = energy_levels.reshape((-1, rows, cols)).astype(np.int32)
+        flashed = np.zeros(levels.shape, dtype=bool)
+        stack = np.empty((levels.shape[0], rows * cols, 2), dtype=np.int32)  # each octopus flashes at most once
+        step_grids(levels, flashed, stack)
+        energy_levels[...] = levels.reshape(energy_levels.shape)
+        return flashed.reshape(energy_levels.shape)
+
+    return flash_step
+
+
+@kernel(loops=_flash_step_loops, taichi=_flash_step_taichi)
+def flash_step(energy_levels: np.ndarray) -> np.ndarray:
+    """
+    Runs a single step, updating the padded energy levels inplace, and returns the (padded) mask of the
+    octopi which flashed. Works the same on a stack of grids, along the first axis.
+    """
+    levels = interior(energy_levels)  # the border never gains energy, so it never flashes
+    levels += 1  # everyone's energy increases at this step
+
+    # Masks of the octopi that flashed during this step, and of those flashing in the current wave. They are
+    # padded as the energy levels so that counting flashing neighbours is a sum of shifted views.
+    flashed = np.zeros(energy_levels.shape, dtype=bool)
+    flashing = np.zeros(energy_levels.shape, dtype=bool)
+    interior(flashing)[...] = levels > 9
+
+    # Let's determine flashing octopi until no one flashes
+    waves = 0
+    while flashing.any():
+        waves += 1
+        progress(waves=waves)  # of this step, see aoc.limits
+        flashed |= flashing
+        levels += count_neighbours(flashing, connectivity=8)  # everyone gains 1 per flashing neighbour
+        # Re-determine who will flash, as energy levels have changed (only 1 flash per step is allowed)
+        interior(flashing)[...] = (levels > 9) & ~interior(flashed)
+    levels[interior(flashed)] = 0  # reset all flashers to 0 (levels are at most 9 + 1 + 8 before, no overflow)
+    return flashed
+
 
 def count_step_flashes(energy_levels: np.ndarray) -> int:
-    """Count and return the number of flashes in a single step."""
-    m, n = energy_levels.shape
-    flashes = 0
-    energy_levels += 1  # everyone's energy increases at this step
-
-    # Determine coordinates of octopi that will flash (<1000 as we will set flashers to >1000 and only 1 flash per step is allowed)
-    flashing_octopi = np.where((energy_levels > 9) & (energy_levels < 1000))
-
-    # Let's determine flashing octopis until no one flashes
-    while len(flashing_octopi[0]) > 0:
-        flashing_coordinates = list(zip(*flashing_octopi))  # x, y positions in the array of those who flash
-        for x, y in flashing_coordinates:  # let's add energy to the neighors of each flashing octopi
-            flashes += 1  # count this flash
-            energy_levels[max(0, x - 1) : min(m, x + 2), max(0, y - 1) : min(n, y + 2)] += 1
-            energy_levels[x, y] += 1000
-        # Re-determine who will flash, as energy levels have changed
-        flashing_octopi = np.where((energy_levels > 9) & (energy_levels < 1000))
-    energy_levels[energy_levels > 1000] = 0  # reset all flashers to 0
-    return flashes
+    """Count and return the number of flashes in a single step, updating the padded energy levels inplace."""
+    return int(np.count_nonzero(flash_step(energy_levels)))
 
 
-if __name__ == "__main__":
-    energy_levels = np.genfromtxt("inputs.txt", delimiter=1, dtype=int)
+def part1(energy_levels: np.ndarray) -> int:
+    """Returns the total number of flashes after 100 steps."""
+    energy_levels = energy_levels.copy()  # steps modify energy levels inplace, leave the parsed input untouched
     flashes = 0
     for step in range(100):
         flashes += count_step_flashes(energy_levels)
-    print(flashes)
+    return flashes
+
+
+def part1_batch(grids: List[np.ndarray]) -> List[int]:
+    """Same as part1 for several grids, which are stacked and stepped all at once when they have the same shape."""
+    if len({grid.shape for grid in grids}) != 1:
+        return [part1(grid) for grid in grids]
+    energy_levels = np.stack(grids)  # a copy, the parsed inputs are left untouched
+    flashes = np.zeros(len(grids), dtype=np.int64)
+    for step in range(100):
+        flashes += np.count_nonzero(flash_step(energy_levels), axis=(1, 2))
+    return flashes.tolist()
+
+
+if __name__ == "__main__":
+    energy_levels = parse(Path("inputs.txt"))
+    print(part1(energy_levels))
@@ -45,18 +45,71 @@ After step 195:
 If you can calculate the exact moments when the octopuses will all flash simultaneously, you should be able to navigate through the cavern. 
 What is the first step during which all octopuses flash?
 """
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
 import numpy as np
-from first import count_step_flashes  # let's get this from part 1
+from first import count_step_flashes, flash_step, parse  # let's get this from part 1
 
-if __name__ == "__main__":
-    energy_levels = np.genfromtxt("inputs.txt", delimiter=1, dtype=int)
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.limits import progress  # noqa: E402
+
+
+def part2(energy_levels: np.ndarray) -> int:
+    """Returns the first step during which all octopi flash."""
+    energy_levels = energy_levels.copy()  # steps modify energy levels inplace, leave the parsed input untouched
     steps = 0
 
-    while True:
+    while True:  # some grids never synchronize, see aoc.limits to give up on them
         steps += 1
+        progress(steps=steps)
         _ = count_step_flashes(energy_levels)  # this modifies energy levels accordingly
 
         if np.sum(energy_levels) == 0:  # all levels have been reset to 0, so everyone flashed that step!
             break
+    return steps
 
-    print(steps)
+
+def part2_batch(grids: List[np.ndarray]) -> List[int]:
+    """Same as part2 for several grids, which are stacked and stepped all at once when they have the same shape."""
+    if len({grid.shape for grid in grids}) != 1:
+        return [part2(grid) for grid in grids]
+    energy_levels = np.stack(grids)  # a copy, the parsed inputs are left untouched
+    remaining = np.arange(len(grids))  # indices of the grids which haven't synchronized yet
+    synchronized_at = np.zeros(len(grids), dtype=np.int64)
+    steps = 0
+
+    while len(remaining):
+        steps += 1
+        progress(steps=steps, remaining=len(remaining))
+        flash_step(energy_levels)
+        everyone_flashed = ~energy_levels.any(axis=(1, 2))  # as in part2, all levels are back to 0
+        if everyone_flashed.any():  # no need to step these grids anymore
+            synchronized_at[remaining[everyone_flashed]] = steps
+            remaining, energy_levels = remaining[~everyone_flashed], energy_levels[~everyone_flashed]
+    return synchronized_at.tolist()
+
+
+def both_parts(energy_levels: np.ndarray) -> Tuple[int, int]:
+    """
+    Returns the answers of both parts from a single simulation: flashes are counted during the first
+    100 steps while stepping towards the first synchronized step (which may come before step 100).
+    """
+    energy_levels = energy_levels.copy()  # steps modify energy levels inplace, leave the parsed input untouched
+    flashes = steps = synchronized_at = 0
+
+    while steps < 100 or not synchronized_at:
+        steps += 1
+        progress(steps=steps)
+        step_flashes = count_step_flashes(energy_levels)
+        if steps <= 100:
+            flashes += step_flashes
+        if not synchronized_at and np.sum(energy_levels) == 0:  # as in part2, everyone flashed that step
+            synchronized_at = steps
+    return flashes, synchronized_at
+
+
+if __name__ == "__main__":
+    energy_levels = parse(Path("inputs.txt"))
+    print(part2(energy_levels))
@@ -109,10 +109,16 @@ start-RW
 
 How many paths through this cave system are there that visit small caves at most once?
 """
+import sys
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Set, Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.limits import progress  # noqa: E402
+
+PROGRESS_INTERVAL = 1 << 16  # paths extended between two progress reports, a report per path slows the search down
+
 
 def construct_cave_map(inputfile: Path) -> Tuple[Dict[str, Set[str]], Set[str]]:
     """Provided with the input, maps which caves are connected to which and which caves are small."""
@@ -130,27 +136,43 @@ def construct_cave_map(inputfile: Path) -> Tuple[Dict[str, Set[str]], Set[str]]:
     return caves, small_caves
 
 
+def parse(inputfile: Path) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    """Returns the cave map and the set of small caves from the input file."""
+    return construct_cave_map(inputfile)
+
+
 def find_paths(caves: Dict[str, Set[str]], small_caves: Set[str]) -> Set[Tuple[str, ...]]:
     """
     Provided with the cave map, finds all acceptable paths: goes from start to end, and at most
     once through small caves.
     """
     paths: Set[Tuple[str, ...]] = {("start",)}  # will store all unique paths
+    length = 1  # of the paths being extended
     while True:
-        for path in [*paths]:
+        for index, path in enumerate([*paths]):
             if path[-1] == "end":  # this path is valid, let's leave it alone
                 continue
+            if not index % PROGRESS_INTERVAL:  # cancelled here if it goes over its limits, see aoc.limits
+                progress(paths=len(paths))
             paths.remove(path)  # does not lead to the end, remove it
             unvisitable = {cave for cave in path if cave in small_caves}  # find the "unvisitable" caves
             for cave in caves[path[-1]] - unvisitable:  # for each cave that is connected to the last one, and visitable
                 paths.add((*path, cave))
-        if all([p[-1] == "end" for p in paths]):  # all remaining paths lead to the end
+        length += 1
+        frontier = sum(path[-1] != "end" for path in paths)  # paths which don't lead to the end yet
+        progress(length=length, frontier=frontier)
+        if not frontier:  # all remaining paths lead to the end
             break
     return paths
 
 
-if __name__ == "__main__":
-    inputfile = Path("inputs.txt")
-    caves, small_caves = construct_cave_map(inputfile)
+def part1(cave_map: Tuple[Dict[str, Set[str]], Set[str]]) -> int:
+    """Returns the number of paths visiting small caves at most once."""
+    caves, small_caves = cave_map
     paths = find_paths(caves, small_caves)
-    print(len(paths))
+    return len(paths)
+
+
+if __name__ == "__main__":
+    cave_map = parse(Path("inputs.txt"))
+    print(part1(cave_map))
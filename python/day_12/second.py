@@ -49,21 +49,28 @@ start,b,end
 The slightly larger example above now has 103 paths through it, and the even larger example now has 3509 paths through it.
 Given these new rules, how many paths through this cave system are there?
 """
+import sys
 from collections import Counter
 from pathlib import Path
 from typing import Dict, Set, Tuple
 
-from first import construct_cave_map
+from first import PROGRESS_INTERVAL, parse
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.limits import progress  # noqa: E402
 
 
 # Almost same as part 1 but we tweak the logic a bit
 def find_paths(caves: Dict[str, Set[str]], small_caves: Set[str]) -> Set[Tuple[str, ...]]:
     """Provided with the cave map, finds all acceptable paths with new rules."""
     paths: Set[Tuple[str, ...]] = {("start",)}  # will store all unique paths
+    length = 1  # of the paths being extended
     while True:
-        for path in [*paths]:
+        for index, path in enumerate([*paths]):
             if path[-1] == "end":  # this path is valid, let's leave it alone
                 continue
+            if not index % PROGRESS_INTERVAL:  # cancelled here if it goes over its limits, see aoc.limits
+                progress(paths=len(paths))
             paths.remove(path)  # does not lead to the end, remove it
             small_cave_visits = Counter([cave for cave in path if cave in small_caves])
 
@@ -75,13 +82,21 @@ def find_paths(caves: Dict[str, Set[str]], small_caves: Set[str]) -> Set[Tuple[s
 
             for cave in caves[path[-1]] - unvisitable:  # for each cave that is connected to the last one, and visitable
                 paths.add((*path, cave))
-        if all([p[-1] == "end" for p in paths]):  # all remaining paths lead to the end
+        length += 1
+        frontier = sum(path[-1] != "end" for path in paths)  # paths which don't lead to the end yet
+        progress(length=length, frontier=frontier)
+        if not frontier:  # all remaining paths lead to the end
             break
     return paths
 
 
-if __name__ == "__main__":
-    inputfile = Path("inputs.txt")
-    caves, small_caves = construct_cave_map(inputfile)
+def part2(cave_map: Tuple[Dict[str, Set[str]], Set[str]]) -> int:
+    """Returns the number of paths visiting a single small cave at most twice."""
+    caves, small_caves = cave_map
     paths = find_paths(caves, small_caves)
-    print(len(paths))
+    return len(paths)
+
+
+if __name__ == "__main__":
+    cave_map = parse(Path("inputs.txt"))
+    print(part2(cave_map))
@@ -123,11 +123,25 @@ After the first fold in the example above, 17 dots are visible - dots that end u
 
 How many dots are visible after completing just the first fold instruction on your transparent paper?
 """
+import sys
 from pathlib import Path
-from typing import List, Tuple
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.budget import fits  # noqa: E402
+from aoc.tracing import traced  # noqa: E402
+
+PAGE_BYTES_PER_POSITION = 3  # peak memory per position of the page when folding it: a bool and copies of the halves
+
+
+def parse(inputfile: Path) -> Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]:
+    """Returns the dots coordinates and the folds instructions from the input file."""
+    return parse_input(inputfile)
+
 
 def parse_input(filename: Path) -> Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]:
     """
@@ -146,36 +160,146 @@ def parse_input(filename: Path) -> Tuple[List[Tuple[int, int]], List[Tuple[str,
     return dots, folds
 
 
-def construct_manual_page(dots: List[Tuple[int, int]]) -> np.ndarray:
-    """Constructs the page from the dots positions. Dots are indicated with a 1, other positions with a 0."""
+def parsed_to_arrays(inputs: Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]) -> Dict[str, np.ndarray]:
+    """Returns the dots and the folds as arrays, to save the parsed input in a sidecar (see aoc.sidecars)."""
+    dots, folds = inputs
+    return {
+        "dots": np.array(dots, dtype=np.int64).reshape(-1, 2),
+        "fold_axes": np.array([axis for axis, _ in folds], dtype="U1"),
+        "fold_positions": np.array([int(position) for _, position in folds], dtype=np.int64),
+    }
+
+
+def parsed_from_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]:
+    """Returns the dots and the folds from the arrays of a sidecar, as parse_input does."""
+    dots = list(map(tuple, arrays["dots"].tolist()))
+    folds = list(zip(arrays["fold_axes"].tolist(), map(str, arrays["fold_positions"].tolist())))
+    return dots, folds
+
+
+def get_page_shape(dots: List[Tuple[int, int]]) -> Tuple[int, int]:
+    """Returns the shape of the page holding all the dots."""
     x_max = max([x for x, _ in dots])
     y_max = max([y for _, y in dots])
-    page = np.zeros((x_max + 1, y_max + 1), dtype=int)
+    return x_max + 1, y_max + 1
+
+
+def page_fits(dots: List[Tuple[int, int]]) -> bool:
+    """Returns whether the page can be folded within the memory budget."""
+    rows, cols = get_page_shape(dots)
+    return fits(rows * cols * PAGE_BYTES_PER_POSITION)
+
+
+def construct_manual_page(dots: List[Tuple[int, int]], shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Constructs the page from the dots positions, as an array of booleans: dots are True, other
+    positions False. The page is just large enough for the dots, unless its shape is given.
+    """
+    page = np.zeros(get_page_shape(dots) if shape is None else shape, dtype=bool)
     for coordinate in dots:
-        page[coordinate] = 1
+        page[coordinate] = True
     return page
 
 
+def fold_dots(dots: np.ndarray, shape: Tuple[int, int], axis: str, index: int) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Folds the coordinates of the dots (an (n, 2) array) rather than the page, the same way as the
+    dense folds, and returns them with the shape of the folded page. Dots folded on the same
+    position are kept once.
+    """
+    along = 0 if axis == "x" else 1
+    folded_length = max(index, shape[along] - index - 1)  # longest half, the other is aligned on the fold line side
+    dots = dots[dots[:, along] != index]  # dots on the fold line disappear
+    positions = dots[:, along]
+    folded = dots.copy()
+    folded[:, along] = folded_length - index + np.where(positions < index, positions, 2 * index - positions)
+    folded_shape = (folded_length, shape[1]) if along == 0 else (shape[0], folded_length)
+    return np.unique(folded, axis=0), folded_shape
+
+
+def _fold_array_loops(array: np.ndarray, axis: str, index: int) -> np.ndarray:
+    """
+    Same as fold_array, dot by dot, to be compiled by the numba backend. When both halves have
+    different lengths, the smaller one is aligned on the fold line side of the other.
+    """
+    along_x = axis == "x"
+    length = array.shape[0] if along_x else array.shape[1]
+    folded_length = max(index, length - index - 1)
+    offset = folded_length - index  # the back half moves when the front one is longer
+    folded = np.zeros((folded_length, array.shape[1]) if along_x else (array.shape[0], folded_length), array.dtype)
+    for x in range(array.shape[0]):
+        for y in range(array.shape[1]):
+            position = x if along_x else y
+            if array[x, y] and position != index:  # dots on the fold line disappear
+                folded_position = offset + (position if position < index else 2 * index - position)
+                if along_x:
+                    folded[folded_position, y] = True
+                else:
+                    folded[x, folded_position] = True
+    return folded
+
+
+def _fold_array_taichi(ti: ModuleType) -> Callable[[np.ndarray, str, int], np.ndarray]:
+    """Taichi version of fold_array, as the loop version, moving all dots in parallel."""
+
+    @ti.kernel
+    def fold(
+        array: ti.types.ndarray(ndim=2),
+        folded: ti.types.ndarray(ndim=2),
+        along_x: ti.i32,
+        index: ti.i32,
+        offset: ti.i32,
+    ):
+        for x, y in array:
+            position = ti.select(along_x, x, y)
+            if array[x, y] != 0 and position != index:  # dots on the fold line disappear
+                folded_position = offset + ti.select(position < index, position, 2 * index - position)
+                if along_x:
+                    folded[folded_position, y] = ti.cast(1, ti.u1)
+                else:
+                    folded[x, folded_position] = ti.cast(1, ti.u1)
+
+    def fold_array(array: np.ndarray, axis: str, index: int) -> np.ndarray:
+        along_x = axis == "x"
+        length = array.shape[0] if along_x else array.shape[1]
+        folded_length = max(index, length - index - 1)
+        folded = np.zeros((folded_length, array.shape[1]) if along_x else (array.shape[0], folded_length), array.dtype)
+        fold(np.ascontiguousarray(array), folded, along_x, index, folded_length - index)
+        return folded
+
+    return fold_array
+
+
+@traced
+@kernel(loops=_fold_array_loops, taichi=_fold_array_taichi)
 def fold_array(array: np.ndarray, axis: str, index: int) -> np.ndarray:
     """Folds the array in the right place (axis, index) and return the new version with updated dots."""
-    # We will slice the paper into two sections and flip
-    if axis == "x":
-        back = array[:index, :].copy()
-        front = array[index + 1 :, :].copy()
-        folded = np.flip(front, axis=0) + back
-    elif axis == "y":
-        back = array[:, :index].copy()
-        front = array[:, index + 1 :].copy()
-        folded = np.flip(front, axis=1) + back
-    return np.where(folded > 1, 1, folded)  # since overlapping dots count as one, values higher than 1 stay 1
-
+    # We will slice the paper into two sections and flip, folding along y is folding the transposed page along x
+    page = array if axis == "x" else array.T
+    back = page[:index]
+    front = np.flip(page[index + 1 :], axis=0)
+    # When both halves have different lengths, the smaller one is aligned on the fold line side of the other
+    folded = np.zeros((max(len(back), len(front)), page.shape[1]), dtype=array.dtype)
+    folded[len(folded) - len(back) :] |= back  # overlapping dots count as one
+    folded[len(folded) - len(front) :] |= front
+    return folded if axis == "x" else folded.T
+
+
+def part1(inputs: Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]) -> int:
+    """Returns the number of dots visible after the first fold."""
+    dots, folds = inputs
+    if not page_fits(dots):  # fold the coordinates of the dots instead
+        fold_axis, fold_index = folds[0]
+        return len(fold_dots(np.array(dots), get_page_shape(dots), fold_axis, int(fold_index))[0])
 
-if __name__ == "__main__":
-    puzzle_input = Path("inputs.txt")
-    dots, folds = parse_input(puzzle_input)
     manual_page = construct_manual_page(dots)
 
     # In part 1 we only do the first fold
     fold_axis, fold_index = folds[0]
-    manual_page = fold_array(manual_page, axis=fold_axis, index=int(fold_index))
-    print(np.sum(manual_page))  # number of dots is the number of 1s in our folded page
+    manual_page = fold_array(manual_page, fold_axis, int(fold_index))
+    return int(np.count_nonzero(manual_page))  # number of dots in our folded page
+
+
+if __name__ == "__main__":
+    inputs = parse(Path("inputs.txt"))
+    print(part1(inputs))
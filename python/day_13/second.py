@@ -6,16 +6,31 @@ The manual says the code is always eight capital letters.
 
 What code do you use to activate the infrared thermal imaging camera system?
 """
+import sys
 from pathlib import Path
+from typing import List, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-from first import construct_manual_page, parse_input
+from first import (
+    _fold_array_loops,
+    _fold_array_taichi,
+    construct_manual_page,
+    fold_dots,
+    get_page_shape,
+    page_fits,
+    parse,
+)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.tracing import traced  # noqa: E402
 
 
 # It turns out my implementation for part 1 does not take in account the possible case where both halves
 # during the folding have different dimensions, which was fine for my first fold but not the others.
 # This implementation does.
+@traced
+@kernel(loops=_fold_array_loops, taichi=_fold_array_taichi)  # which handle halves of different lengths as this one
 def fold_array(array: np.ndarray, axis: str, index: int) -> np.ndarray:
     """Folds the array in the right place (axis, index) and return the new version with updated dots."""
     # We will slice the paper into two sections and flip
@@ -23,32 +38,85 @@ def fold_array(array: np.ndarray, axis: str, index: int) -> np.ndarray:
         back = array[:index, :].copy()
         front = array[index + 1 :, :].copy()
         # We check the cases where both halves don't have the same dimensions and can't overlap
-        if len(back[0]) > len(front[0]):  # front half is too small, we need to add a row
-            front = np.hstack((front, np.zeros((len(back), len(back[0]) - len(front[0])))))  # zero pad it
-        elif len(front[0]) > len(back[0]):  # back half is too small, we need to add a row
-            back = np.hstack((np.zeros((len(front), len(front[0]) - len(back[0]))), back))  # zero pad it
-        folded = np.flip(front, axis=0) + back
+        if len(back) > len(front):  # front half is too small, we need to add rows
+            front = np.vstack((front, np.zeros((len(back) - len(front), array.shape[1]), array.dtype)))  # pad it
+        elif len(front) > len(back):  # back half is too small, we need to add rows
+            back = np.vstack((np.zeros((len(front) - len(back), array.shape[1]), array.dtype), back))  # pad it
+        folded = np.flip(front, axis=0) | back  # overlapping dots count as one
 
     elif axis == "y":
         back = array[:, :index].copy()
         front = array[:, index + 1 :].copy()
         # Check for the dimensions again, same logic
         if len(back[0]) > len(front[0]):
-            front = np.hstack((front, np.zeros((len(back), len(back[0]) - len(front[0])))))
+            front = np.hstack((front, np.zeros((len(back), len(back[0]) - len(front[0])), array.dtype)))
         elif len(front[0]) > len(back[0]):
-            back = np.hstack((np.zeros((len(front), len(front[0]) - len(back[0]))), back))
-        folded = np.flip(front, axis=1) + back
-    return np.where(folded > 1, 1, folded)  # since overlapping dots count as one, values higher than 1 stay 1
+            back = np.hstack((np.zeros((len(front), len(front[0]) - len(back[0])), array.dtype), back))
+        folded = np.flip(front, axis=1) | back
+    return folded
 
 
-if __name__ == "__main__":
-    puzzle_input = Path("inputs.txt")
-    dots, folds = parse_input(puzzle_input)
+def fold_dots_then_page(inputs: Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]) -> Tuple[int, np.ndarray]:
+    """
+    Applies all the folds to the coordinates of the dots rather than to the page, which only gets
+    constructed once folded. Returns the number of dots after the first fold, and the final page.
+    """
+    dots, folds = inputs
+    folded_dots, shape = np.array(dots), get_page_shape(dots)
+    visible_dots = None
+    for fold in folds:
+        folded_dots, shape = fold_dots(folded_dots, shape, fold[0], int(fold[1]))
+        if visible_dots is None:  # part 1 only does the first fold
+            visible_dots = len(folded_dots)
+    return visible_dots, construct_manual_page(list(map(tuple, folded_dots.tolist())), shape)
+
+
+def fold_manual_page(inputs: Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]) -> np.ndarray:
+    """Constructs the manual page and applies all the folds to it, returns the final page."""
+    dots, folds = inputs
+    if not page_fits(dots):  # the page doesn't fit in the memory budget, fold the coordinates of the dots instead
+        return fold_dots_then_page(inputs)[1]
+
     manual_page = construct_manual_page(dots)
 
     # In part 2 we do all the folds
     for fold in folds:
         manual_page = fold_array(manual_page, fold[0], int(fold[1]))
+    return manual_page
+
+
+def draw_manual_page(manual_page: np.ndarray) -> str:
+    """Returns the page as text, dots are drawn with a '#' and it is transposed as for the display."""
+    return "\n".join("".join("#" if dot else "." for dot in row) for row in manual_page.T)
+
+
+def part2(inputs: Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]) -> str:
+    """Returns the final page as text, once all folds are done."""
+    return draw_manual_page(fold_manual_page(inputs))
+
+
+def both_parts(inputs: Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]) -> Tuple[int, str]:
+    """Returns the answers of both parts, counting the dots after the first fold on the way to the final page."""
+    dots, folds = inputs
+    if not page_fits(dots):
+        visible_dots, manual_page = fold_dots_then_page(inputs)
+        return visible_dots, draw_manual_page(manual_page)
+
+    manual_page = construct_manual_page(dots)
+    visible_dots = None
+
+    for fold in folds:
+        manual_page = fold_array(manual_page, fold[0], int(fold[1]))
+        if visible_dots is None:  # part 1 only does the first fold
+            visible_dots = int(np.count_nonzero(manual_page))
+    return visible_dots, draw_manual_page(manual_page)
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt  # only needed for the display, which part2 does not do
+
+    inputs = parse(Path("inputs.txt"))
+    manual_page = fold_manual_page(inputs)
 
     # Display the final grid, transposed here in my case
     plt.imshow(manual_page.T)
@@ -64,7 +64,12 @@ What do you get if you take the quantity of the most common element and subtract
 """
 from collections import Counter
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterator, Tuple
+
+
+def parse(inputfile: Path) -> Tuple[str, Dict[str, str]]:
+    """Returns the polymer template and the pair insertion rules from the input file."""
+    return parse_input(inputfile)
 
 
 def parse_input(inputfile: Path) -> Tuple[str, Dict[str, str]]:
@@ -74,13 +79,13 @@ def parse_input(inputfile: Path) -> Tuple[str, Dict[str, str]]:
     return sequence, rules
 
 
-def grow_polymer(polymer: str, rules: Dict[str, str], nsteps: int) -> Counter:
-    """Grow the polymer_sequence nsteps times according to the rules, returns counts of elements."""
+def iter_growth(polymer: str, rules: Dict[str, str]) -> Iterator[Counter]:
+    """Grows the polymer_sequence step after step according to the rules, yields counts of elements after each."""
     # Instantiate counts of elements and pairs
     element_counts = Counter(polymer)
     pair_counts = Counter(polymer[i : i + 2] for i in range(len(polymer) - 1))
 
-    for step in range(nsteps):
+    while True:
         new_count = Counter()
         for pair, num in pair_counts.items():  # let's apply the rules to each pair
             if pair in rules:
@@ -92,11 +97,26 @@ def grow_polymer(polymer: str, rules: Dict[str, str], nsteps: int) -> Counter:
                 element_counts[c] += num  # update the amount of Cs
             else:
                 new_count[pair] += num  # the pair hasn't changed
-            pair_counts = new_count  # update the pair counts
+        pair_counts = new_count  # update the pair counts
+        yield element_counts  # updated inplace at the next step
+
+
+def grow_polymer(polymer: str, rules: Dict[str, str], nsteps: int) -> Counter:
+    """Grow the polymer_sequence nsteps times according to the rules, returns counts of elements."""
+    growth = iter_growth(polymer, rules)
+    element_counts = Counter(polymer)  # if there are no steps
+    for step in range(nsteps):
+        element_counts = next(growth)
     return element_counts
 
 
-if __name__ == "__main__":
-    sequence, rules = parse_input(Path("inputs.txt"))
+def part1(inputs: Tuple[str, Dict[str, str]]) -> int:
+    """Returns the difference between the most and least common elements after 10 steps."""
+    sequence, rules = inputs
     element_counts = grow_polymer(sequence, rules, 10)  # we do 10 steps in part 1
-    print(max(element_counts.values()) - min(element_counts.values()))
+    return max(element_counts.values()) - min(element_counts.values())
+
+
+if __name__ == "__main__":
+    inputs = parse(Path("inputs.txt"))
+    print(part1(inputs))
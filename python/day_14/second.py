@@ -11,10 +11,29 @@ Apply 40 steps of pair insertion to the polymer template and find the most and l
 What do you get if you take the quantity of the most common element and subtract the quantity of the least common element?
 """
 from pathlib import Path
+from typing import Dict, Tuple
 
-from first import grow_polymer, parse_input
+from first import grow_polymer, iter_growth, parse
 
-if __name__ == "__main__":
-    sequence, rules = parse_input(Path("inputs.txt"))
+
+def part2(inputs: Tuple[str, Dict[str, str]]) -> int:
+    """Returns the difference between the most and least common elements after 40 steps."""
+    sequence, rules = inputs
     element_counts = grow_polymer(sequence, rules, 40)  # this is exactly part 1 with 40 steps
-    print(max(element_counts.values()) - min(element_counts.values()))
+    return max(element_counts.values()) - min(element_counts.values())
+
+
+def both_parts(inputs: Tuple[str, Dict[str, str]]) -> Tuple[int, int]:
+    """Returns the answers of both parts, growing the polymer to 10 steps and then on to 40 steps."""
+    sequence, rules = inputs
+    answers = []
+    for step, element_counts in enumerate(iter_growth(sequence, rules), start=1):
+        if step in (10, 40):
+            answers.append(max(element_counts.values()) - min(element_counts.values()))
+        if step == 40:
+            return tuple(answers)
+
+
+if __name__ == "__main__":
+    inputs = parse(Path("inputs.txt"))
+    print(part2(inputs))
@@ -41,17 +41,116 @@ The total risk of this path is 40 (the starting position is never entered, so it
 
 What is the lowest total risk of any path from the top left to the bottom right?
 """
+import heapq
+import sys
+from array import array
+from pathlib import Path
+
 import numpy as np
-from skimage.graph import route_through_array
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.budget import fits  # noqa: E402
+from aoc.grids import neighbour_table, smallest_uint  # noqa: E402
+from aoc.inputs import read_digit_grid  # noqa: E402
+
+GRAPH_BYTES_PER_POSITION = 224  # peak memory per position of the map when building and searching the graph (measured)
+UNREACHED = 2 ** 32 - 1  # distance of the positions not reached yet by the loop version, in uint32
+
+
+def parse(inputfile: Path) -> np.ndarray:
+    """Returns the risk levels map from the input file as a 2D numpy array of uint8."""
+    return read_digit_grid(inputfile)
 
 
 def get_shortest_path_cost(costs_map: np.ndarray) -> int:
     """Finds the shortest path in the array and return the calculated cost."""
-    path, path_cost = route_through_array(costs_map, start=(0, 0), end=(-1, -1), fully_connected=False, geometric=False)
-    return path_cost - costs_map[0, 0]  # we do not count the starting position for the cost
+    from scipy.sparse import csr_matrix  # scipy is heavy to import, only do it when needed
+    from scipy.sparse.csgraph import dijkstra
+
+    # Graph of the moves between neighbouring positions, each weighing the risk level of the position moved to
+    neighbours = neighbour_table(costs_map.shape, connectivity=4)
+    sources, directions = np.nonzero(neighbours >= 0)
+    targets = neighbours[sources, directions]
+    graph = csr_matrix((costs_map.ravel()[targets], (sources, targets)), shape=(costs_map.size, costs_map.size))
+
+    # We never move into the starting position, so its risk level is never counted
+    return int(dijkstra(graph, indices=0)[-1])
+
+
+def highest_lowest_risk(rows: int, cols: int) -> int:
+    """Returns a bound of the lowest total risk across a map of the given shape: the risk of a path along its edges."""
+    return 9 * (rows + cols - 2)
+
+
+def _find_lowest_risk_loops(costs_map: np.ndarray, repeats: int) -> int:
+    """
+    Same as find_lowest_risk, reading the risk levels from the array, to be compiled by the numba
+    backend. Distances are always uint32, the dtype of an array can't depend on the values here.
+    """
+    rows, cols = costs_map.shape
+    full_rows, full_cols = rows * repeats, cols * repeats
+    if 9 * (full_rows + full_cols - 2) >= UNREACHED:  # highest_lowest_risk, which numba can't call
+        raise OverflowError("the map is too large for 32 bits distances")
+    distances = np.full(full_rows * full_cols, UNREACHED, dtype=np.uint32)
+    distances[0] = 0
+    heap = [(0, 0)]
+    while heap:
+        distance, position = heapq.heappop(heap)
+        if position == full_rows * full_cols - 1:
+            return distance
+        if distance > distances[position]:  # already reached with a lower risk
+            continue
+        x, y = position // full_cols, position % full_cols
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < full_rows and 0 <= ny < full_cols:
+                risk = (costs_map[nx % rows, ny % cols] + nx // rows + ny // cols - 1) % 9 + 1
+                if distance + risk < distances[nx * full_cols + ny]:
+                    distances[nx * full_cols + ny] = distance + risk
+                    heapq.heappush(heap, (distance + risk, nx * full_cols + ny))
+    return -1
+
+
+@kernel(loops=_find_lowest_risk_loops)
+def find_lowest_risk(costs_map: np.ndarray, repeats: int) -> int:
+    """
+    Returns the lowest total risk from the top left to the bottom right of the map repeated `repeats`
+    times in both directions, each tile one risk level higher than the one above or on its left (9
+    wrapping back to 1), as in part 2. This is Dijkstra's algorithm with a heap, computing the risk
+    levels as needed: the only structure spanning the full map is the array of distances, of 2 bytes
+    per position up to about 3640 x 3640 positions (4 beyond), when the graph of get_shortest_path_cost
+    takes over 200.
+    """
+    rows, cols = costs_map.shape
+    risk_levels = costs_map.tolist()  # plain ints are faster than numpy scalars one at a time
+    full_rows, full_cols = rows * repeats, cols * repeats
+    dtype = smallest_uint(highest_lowest_risk(full_rows, full_cols) + 1)  # leaving its highest value for unreached
+    distances = array(dtype.char, [np.iinfo(dtype).max]) * (full_rows * full_cols)  # same typecodes as numpy
+    distances[0] = 0
+    heap = [(0, 0)]
+    while heap:
+        distance, position = heapq.heappop(heap)
+        if position == full_rows * full_cols - 1:
+            return distance
+        if distance > distances[position]:  # already reached with a lower risk
+            continue
+        x, y = divmod(position, full_cols)
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < full_rows and 0 <= ny < full_cols:
+                risk = (risk_levels[nx % rows][ny % cols] + nx // rows + ny // cols - 1) % 9 + 1
+                if distance + risk < distances[nx * full_cols + ny]:
+                    distances[nx * full_cols + ny] = distance + risk
+                    heapq.heappush(heap, (distance + risk, nx * full_cols + ny))
+    return -1
+
+
+def part1(costs_map: np.ndarray) -> int:
+    """Returns the lowest total risk of any path from the top left to the bottom right."""
+    if not fits(costs_map.size * GRAPH_BYTES_PER_POSITION):  # the graph doesn't fit in the memory budget
+        return find_lowest_risk(costs_map, 1)
+    return int(get_shortest_path_cost(costs_map))
 
 
 if __name__ == "__main__":
-    costs_map = np.genfromtxt("inputs.txt", delimiter=1, dtype=int)
-    path_cost = get_shortest_path_cost(costs_map)
-    print(path_cost)
+    costs_map = parse(Path("inputs.txt"))
+    print(part1(costs_map))
@@ -130,8 +130,16 @@ The total risk of this path is 315 (the starting position is still never entered
 Using the full map, what is the lowest total risk of any path from the top left to the bottom right?
 """
 # Well this is fucking annoying
+import sys
+from pathlib import Path
+from typing import Tuple
+
 import numpy as np
-from first import get_shortest_path_cost
+from first import GRAPH_BYTES_PER_POSITION, find_lowest_risk, get_shortest_path_cost, parse
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.budget import fits  # noqa: E402
+from aoc.shared import get_workers  # noqa: E402
 
 
 def duplicate_array_with_additional_cost(array: np.ndarray, cost: int) -> np.ndarray:
@@ -153,8 +161,37 @@ def create_new_map(costs_map: np.ndarray) -> np.ndarray:
     return np.concatenate([np.concatenate(array, axis=1) for array in parts], axis=0)
 
 
-if __name__ == "__main__":
-    costs_map = np.genfromtxt("inputs.txt", delimiter=1, dtype=int)
+def fill_tile(tile: Tuple[int, int], costs_map: np.ndarray, full_map: np.ndarray) -> None:
+    """Runs in a worker: writes the tile it owns of the shared full map, the initial map with its additional cost."""
+    i, j = tile
+    rows, cols = costs_map.shape
+    full_map[i * rows : (i + 1) * rows, j * cols : (j + 1) * cols] = (costs_map + (i + j) - 1) % 9 + 1  # 9 wraps to 1
+
+
+def get_shortest_path_cost_sharded(costs_map: np.ndarray) -> int:
+    """
+    Returns the lowest total risk through the full map, built in shared memory by the workers, a tile
+    each (see aoc.shared). The search itself runs in this process, on the shared map without copying it.
+    """
+    from aoc.shared import SharedArrays  # only the sharded path needs it
+
+    with SharedArrays() as shared:
+        full_map = shared.zeros((5 * costs_map.shape[0], 5 * costs_map.shape[1]), costs_map.dtype)
+        tiles = [(i, j) for i in range(5) for j in range(5)]
+        shared.map(fill_tile, tiles, costs_map=shared.share(costs_map), full_map=full_map)
+        return int(get_shortest_path_cost(shared.view(full_map)))
+
+
+def part2(costs_map: np.ndarray) -> int:
+    """Returns the lowest total risk of any path through the full map."""
+    if not fits(25 * costs_map.size * (GRAPH_BYTES_PER_POSITION + 1)):  # explore the full map without building it
+        return find_lowest_risk(costs_map, 5)
+    if get_workers() > 1:
+        return get_shortest_path_cost_sharded(costs_map)
     full_map = create_new_map(costs_map)
-    path_cost = get_shortest_path_cost(full_map)
-    print(path_cost)
+    return int(get_shortest_path_cost(full_map))
+
+
+if __name__ == "__main__":
+    costs_map = parse(Path("inputs.txt"))
+    print(part2(costs_map))
@@ -105,10 +105,14 @@ Here are a few more examples of hexadecimal-encoded transmissions:
 Decode the structure of your hexadecimal-encoded BITS transmission; what do you get if you add up the version numbers in all packets?
 """
 # Committing this code after unifying the approach for part 1 and 2
+import sys
 from math import prod
 from pathlib import Path
 from typing import Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.tracing import traced  # noqa: E402
+
 ID_TO_OPERATION = {
     0: sum,
     1: prod,
@@ -128,6 +132,12 @@ def hexadecimal_to_binary(string: str) -> str:
     return "".join(f"{int(x, 16):04b}" for x in string)  # each character is a 4-lengthed binary
 
 
+def parse(inputfile: Path) -> str:
+    """Returns the transmission from the input file, converted to its binary representation."""
+    transmission: str = inputfile.read_text()
+    return hexadecimal_to_binary(transmission)
+
+
 def parse_numbers(binary_string: str) -> Tuple[int, int]:
     """Given the binary version of the transmission, parses the numbers."""
     pointer, numbers = 0, []
@@ -139,6 +149,7 @@ def parse_numbers(binary_string: str) -> Tuple[int, int]:
     return 5 * len(numbers), int("".join(numbers), base=2)
 
 
+@traced
 def parse_message(binary_string: str) -> Tuple[int, int, int]:
     """Given the binary version of the transmission string, parse subpackets and return the solutions."""
     version = int(binary_string[:3], base=2)  # version is encoded in the first 3 characters
@@ -153,7 +164,9 @@ def parse_message(binary_string: str) -> Tuple[int, int, int]:
     numbers = []
 
     # Ok, now we need to parse the sub-packets
-    if binary_string[pointer] == "0":  # the next 15 bits are the length in bits of the sub-packets contained in this packet
+    if (
+        binary_string[pointer] == "0"
+    ):  # the next 15 bits are the length in bits of the sub-packets contained in this packet
         len_subpackets = int(binary_string[pointer + 1 : pointer + 16], base=2)
         pointer += 16  # this will put us at the start of the first sub-packet (after these 15 bits)
         parse_until = pointer + len_subpackets  # this will be the end of the sub-packets
@@ -177,7 +190,12 @@ def parse_message(binary_string: str) -> Tuple[int, int, int]:
     return version_sum, ID_TO_OPERATION[type_id](numbers), pointer
 
 
+def part1(binary_string: str) -> int:
+    """Returns the sum of the version numbers of all packets."""
+    version_sum, _, _ = parse_message(binary_string=binary_string)
+    return version_sum
+
+
 if __name__ == "__main__":
-    transmission: str = Path("inputs.txt").read_text()
-    part1, part2, _ = parse_message(binary_string=hexadecimal_to_binary(transmission))
-    print(part1)
+    binary_string = parse(Path("inputs.txt"))
+    print(part1(binary_string))
@@ -29,10 +29,14 @@ For example:
 What do you get if you evaluate the expression represented by your hexadecimal-encoded BITS transmission?
 """
 # Committing this code after unifying the approach for part 1 and 2
+import sys
 from math import prod
 from pathlib import Path
 from typing import Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.tracing import traced  # noqa: E402
+
 ID_TO_OPERATION = {
     0: sum,
     1: prod,
@@ -52,6 +56,12 @@ def hexadecimal_to_binary(string: str) -> str:
     return "".join(f"{int(x, 16):04b}" for x in string)  # each character is a 4-lengthed binary
 
 
+def parse(inputfile: Path) -> str:
+    """Returns the transmission from the input file, converted to its binary representation."""
+    transmission: str = inputfile.read_text()
+    return hexadecimal_to_binary(transmission)
+
+
 def parse_numbers(binary_string: str) -> Tuple[int, int]:
     """Given the binary version of the transmission, parses the numbers."""
     pointer, numbers = 0, []
@@ -63,6 +73,7 @@ def parse_numbers(binary_string: str) -> Tuple[int, int]:
     return 5 * len(numbers), int("".join(numbers), base=2)
 
 
+@traced
 def parse_message(binary_string: str) -> Tuple[int, int, int]:
     """Given the binary version of the transmission string, parse subpackets and return the solutions."""
     version = int(binary_string[:3], base=2)  # version is encoded in the first 3 characters
@@ -103,7 +114,18 @@ def parse_message(binary_string: str) -> Tuple[int, int, int]:
     return version_sum, ID_TO_OPERATION[type_id](numbers), pointer
 
 
+def part2(binary_string: str) -> int:
+    """Returns the value of the outermost packet."""
+    _, value, _ = parse_message(binary_string=binary_string)
+    return value
+
+
+def both_parts(binary_string: str) -> Tuple[int, int]:
+    """Returns the sum of the version numbers and the value of the outermost packet, parsed a single time."""
+    version_sum, value, _ = parse_message(binary_string=binary_string)
+    return version_sum, value
+
+
 if __name__ == "__main__":
-    transmission: str = Path("inputs.txt").read_text()
-    part1, part2, _ = parse_message(binary_string=hexadecimal_to_binary(transmission))
-    print(part2)
+    binary_string = parse(Path("inputs.txt"))
+    print(part2(binary_string))
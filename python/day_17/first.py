@@ -122,10 +122,17 @@ In the above example, using an initial velocity of 6,9 is the best you can do, c
 Find the initial velocity that causes the probe to reach the highest y position and still eventually be within the target area after any step. 
 What is the highest y position it reaches on this trajectory?
 """
+import sys
 from math import sqrt
 from pathlib import Path
 from typing import List, Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # to import the shared aoc package when run as a script
+from aoc.backends import kernel  # noqa: E402
+from aoc.limits import progress  # noqa: E402
+
+SWEEP_SLICE = 16  # initial x velocities swept per call of the kernel
+
 
 def parse_target_area(inputfile: Path) -> Tuple[Tuple[int, int], Tuple[int, int]]:
     """Parses the input data for the coordinates of the target area."""
@@ -141,6 +148,11 @@ def parse_target_area(inputfile: Path) -> Tuple[Tuple[int, int], Tuple[int, int]
     return (x0, x1), (y0, y1)
 
 
+def parse(inputfile: Path) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Returns the x and y ranges of the target area from the input file."""
+    return parse_target_area(inputfile)
+
+
 def determine_extrema_starting_velocities(
     target_xs: Tuple[int, int], target_ys: Tuple[int, int]
 ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
@@ -164,10 +176,12 @@ def determine_extrema_starting_velocities(
     return (min_velocity_x_0, max_velocity_x_0), (min_velocity_y_0, max_velocity_y_0)
 
 
-if __name__ == "__main__":
-    target_xs, target_ys = parse_target_area(Path("inputs.txt"))
-    (min_vx0, max_vx0), (min_vy0, max_vy0) = determine_extrema_starting_velocities(target_xs, target_ys)
-    all_time_high = 0
+@kernel  # compiled with the numba backend
+def sweep_trajectories(
+    min_vx0: int, max_vx0: int, min_vy0: int, max_vy0: int, x_min: int, x_max: int, y_min: int, y_max: int
+) -> List[int]:
+    """Returns the highest y position of each trajectory from the velocity ranges landing in the target area."""
+    valid_trajectories_heights = []
 
     # Now we go over the trajectories we get from starting in this range of values that would all land in the target area
     for vx_0 in range(min_vx0, max_vx0 + 1):
@@ -175,7 +189,7 @@ if __name__ == "__main__":
             x = y = trajectory_max_y = 0  # we initialize starting positions and max y of this trajectory
             vx = vx_0  # start with this initial x velocity
             vy = vy_0  # start with this initial y velocity
-            while x <= target_xs[1] and y >= target_ys[0]:  # as long as we're not out of the target range
+            while x <= x_max and y >= y_min:  # as long as we're not out of the target range
                 x += vx  # 'the probe's x position increases by its x velocity'
                 y += vy  # 'the probe's y position increases by its y velocity'
                 vx = vx - 1 if vx > 0 else 0  # 'due to drag, the probe's x velocity changes by 1 toward the value 0'
@@ -183,8 +197,32 @@ if __name__ == "__main__":
                 trajectory_max_y = max(trajectory_max_y, y)
 
                 # Check if we're in the target area, if so we can stop
-                if target_xs[0] <= x <= target_xs[1] and target_ys[0] <= y <= target_ys[1]:
-                    all_time_high = max(all_time_high, trajectory_max_y)  # update all time high
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    valid_trajectories_heights.append(trajectory_max_y)  # keep this valid trajectory
                     break
+    return valid_trajectories_heights
 
-    print(all_time_high)
+
+def find_valid_trajectories(target_area: Tuple[Tuple[int, int], Tuple[int, int]]) -> List[int]:
+    """
+    Returns the highest y position of each trajectory landing in the target area. The velocities are
+    swept by slices of initial x velocities, reporting the progress in between (see aoc.limits).
+    """
+    target_xs, target_ys = target_area
+    (min_vx0, max_vx0), (min_vy0, max_vy0) = determine_extrema_starting_velocities(target_xs, target_ys)
+    heights = []
+    for start in range(min_vx0, max_vx0 + 1, SWEEP_SLICE):
+        stop = min(start + SWEEP_SLICE, max_vx0 + 1)
+        heights.extend(sweep_trajectories(start, stop - 1, min_vy0, max_vy0, *target_xs, *target_ys))
+        progress(velocities_tried=(stop - min_vx0) * (max_vy0 - min_vy0 + 1), valid=len(heights))
+    return heights
+
+
+def part1(target_area: Tuple[Tuple[int, int], Tuple[int, int]]) -> int:
+    """Returns the highest y position reached by any trajectory landing in the target area."""
+    return max(find_valid_trajectories(target_area), default=0)  # the all time high, from 0 at the start
+
+
+if __name__ == "__main__":
+    target_area = parse(Path("inputs.txt"))
+    print(part1(target_area))
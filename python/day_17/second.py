@@ -26,30 +26,22 @@ How many distinct initial velocity values cause the probe to be within the targe
 """
 # This is essentially the same as the first part, but we count all the valid trajectories
 from pathlib import Path
+from typing import Tuple
+
+from first import find_valid_trajectories, parse
+
+
+def part2(target_area: Tuple[Tuple[int, int], Tuple[int, int]]) -> int:
+    """Returns the number of distinct initial velocities landing in the target area."""
+    return len(find_valid_trajectories(target_area))
+
+
+def both_parts(target_area: Tuple[Tuple[int, int], Tuple[int, int]]) -> Tuple[int, int]:
+    """Returns the highest y position reached and the number of valid trajectories, from a single sweep."""
+    heights = find_valid_trajectories(target_area)
+    return max(heights, default=0), len(heights)  # part 1 starts from a high of 0
 
-from first import determine_extrema_starting_velocities, parse_target_area
 
 if __name__ == "__main__":
-    target_xs, target_ys = parse_target_area(Path("inputs.txt"))
-    (min_vx0, max_vx0), (min_vy0, max_vy0) = determine_extrema_starting_velocities(target_xs, target_ys)
-    valid_trajectories = 0
-
-    # Now we go over the trajectories we get from starting in this range of values that would all land in the target area
-    for vx_0 in range(min_vx0, max_vx0 + 1):
-        for vy_0 in range(min_vy0, max_vy0 + 1):
-            x = y = trajectory_max_y = 0  # we initialize starting positions and max y of this trajectory
-            vx = vx_0  # start with this initial x velocity
-            vy = vy_0  # start with this initial y velocity
-            while x <= target_xs[1] and y >= target_ys[0]:  # as long as we're not out of the target range
-                x += vx  # 'the probe's x position increases by its x velocity'
-                y += vy  # 'the probe's y position increases by its y velocity'
-                vx = vx - 1 if vx > 0 else 0  # 'due to drag, the probe's x velocity changes by 1 toward the value 0'
-                vy -= 1  # 'due to gravity, the probe's y velocity decreases by 1'
-                trajectory_max_y = max(trajectory_max_y, y)
-
-                # Check if we're in the target area, if so we can stop
-                if target_xs[0] <= x <= target_xs[1] and target_ys[0] <= y <= target_ys[1]:
-                    valid_trajectories += 1  # count this valid trajectory
-                    break
-
-    print(valid_trajectories)
+    target_area = parse(Path("inputs.txt"))
+    print(part2(target_area))